@@ -0,0 +1,38 @@
+"""
+Authentication classes for accounts app.
+"""
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+from . import tokens
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication with expiring tokens and a shared lookup cache.
+    
+    Same "Authorization: Token <key>" header as DRF's TokenAuthentication,
+    but cache hits skip the token/user query (see apps.accounts.tokens).
+    """
+    
+    def authenticate_credentials(self, key):
+        cached = tokens.get_cached_token(key)
+        if cached is not None:
+            user, created = cached
+        else:
+            try:
+                token = Token.objects.select_related('user').get(key=key)
+            except Token.DoesNotExist:
+                raise exceptions.AuthenticationFailed(_('Invalid token.'))
+            user, created = token.user, token.created
+            if user.is_active and not tokens.is_expired(created):
+                tokens.cache_token(token)
+        
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        if tokens.is_expired(created):
+            raise exceptions.AuthenticationFailed(_('Token has expired.'))
+        
+        # Unsaved stand-in for the row, enough for request.auth.key/.delete()
+        return user, Token(key=key, user=user, created=created)
@@ -0,0 +1,325 @@
+"""
+Bulk import of users from CSV or NDJSON.
+
+Onboarding a precinct through register + assign_role costs several queries
+and a password hash per officer, one request at a time. import_users()
+instead streams rows from a file, validates them in memory and then, per
+batch of USER_IMPORT_BATCH_SIZE rows:
+
+- hashes the passwords (in a process pool for the import_users command),
+- checks the batch's identifiers against existing users in one query,
+- inserts the users with a single bulk_create,
+- inserts their role assignments with a single bulk_create, announced as
+  m2m_changed on User.roles (see apps.accounts.bulk_roles) so cached
+  statistics counting staff by role are invalidated.
+
+Rows are columns of User (username, email, phone_number, national_id,
+first_name, last_name, password) plus an optional "roles" column of role
+names separated by ";" (a list in NDJSON). Rows without roles get the
+Basic User role, as on registration. Invalid rows are reported with their
+line number and do not stop the import. Bytes that are not UTF-8 stop
+the import at that line, keeping the rows imported before it.
+
+The admin API runs inside a web request, so it hashes in-process and
+refuses files with more than USER_IMPORT_API_MAX_ROWS rows before
+importing anything; larger files go through the command.
+"""
+import csv
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from apps.accounts.bulk_roles import send_roles_changed
+from apps.accounts.identifiers import IDENTIFIER_FIELDS
+from apps.accounts.models import User, Role, RoleAssignment
+
+FORMATS = ('csv', 'ndjson')
+
+REQUIRED_FIELDS = [
+    'username', 'email', 'phone_number', 'national_id',
+    'first_name', 'last_name', 'password'
+]
+
+PASSWORD_MIN_LENGTH = 8
+
+BASIC_ROLE = 'Basic User'
+
+DECODE_ERROR = 'Not valid UTF-8; the rest of the file was not imported.'
+
+
+def detect_format(filename):
+    """Guess the import format from a file name, defaulting to CSV."""
+    if (filename or '').lower().endswith(('.ndjson', '.jsonl', '.json')):
+        return 'ndjson'
+    return 'csv'
+
+
+def read_rows(lines, fmt):
+    """
+    Parse rows lazily from an iterable of text lines.
+
+    Args:
+        lines: Iterable of str (an open text file, a decoded upload)
+        fmt: 'csv' (with a header line) or 'ndjson'
+
+    Yields:
+        tuple: (line number, row dict, or None if the line cannot be parsed)
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def _parse_roles(value):
+    if isinstance(value, (list, tuple)):
+        names = value
+    else:
+        names = (value or '').split(';')
+    return list(dict.fromkeys(str(name).strip() for name in names if str(name).strip()))
+
+
+def validate_row(row, roles, seen):
+    """
+    Validate and normalize one import row without touching the database.
+
+    Args:
+        row: Parsed row, or None for an unparsable line
+        roles: Active roles by name
+        seen: Identifier field -> values already taken earlier in the file
+
+    Returns:
+        tuple: (entry dict, None) for a valid row, (None, errors) otherwise
+    """
+    if row is None:
+        return None, {'non_field_errors': ['Row could not be parsed.']}
+
+    errors = {}
+    entry = {}
+    for field in REQUIRED_FIELDS:
+        value = row.get(field)
+        value = '' if value is None else str(value)
+        if field != 'password':
+            value = value.strip()
+        if not value:
+            errors[field] = ['This field is required.']
+            continue
+        max_length = User._meta.get_field(field).max_length
+        if max_length and len(value) > max_length:
+            errors[field] = [f'Ensure this field has no more than {max_length} characters.']
+            continue
+        entry[field] = value
+
+    for field, normalize in IDENTIFIER_FIELDS:
+        if field in entry:
+            entry[field] = normalize(entry[field])
+
+    if 'email' in entry:
+        try:
+            validate_email(entry['email'])
+        except ValidationError as exc:
+            errors['email'] = list(exc.messages)
+    if 'username' in entry:
+        try:
+            User.username_validator(entry['username'])
+        except ValidationError as exc:
+            errors['username'] = list(exc.messages)
+    if 'password' in entry and len(entry['password']) < PASSWORD_MIN_LENGTH:
+        errors['password'] = [f'Ensure this field has at least {PASSWORD_MIN_LENGTH} characters.']
+
+    role_names = _parse_roles(row.get('roles'))
+    unknown = [name for name in role_names if name not in roles]
+    if unknown:
+        errors['roles'] = [f'Unknown role: {name}' for name in unknown]
+
+    for field, _ in IDENTIFIER_FIELDS:
+        if field not in errors and entry.get(field) in seen[field]:
+            errors[field] = ['Duplicate value in this file.']
+
+    if errors:
+        return None, errors
+
+    for field, _ in IDENTIFIER_FIELDS:
+        seen[field].add(entry[field])
+    if any(name != BASIC_ROLE for name in role_names):
+        # Like User.assign_role, holding any other role replaces Basic User
+        role_names = [name for name in role_names if name != BASIC_ROLE]
+    elif not role_names and BASIC_ROLE in roles:
+        role_names = [BASIC_ROLE]
+    entry['roles'] = role_names
+    return entry, None
+
+
+@contextmanager
+def password_hasher(workers):
+    """
+    Provide a function hashing a list of passwords.
+
+    With more than one worker the hashes are computed in a pool of spawned
+    processes (spawned rather than forked, so no process shares the
+    parent's database connections). Workers only import what unpickling
+    make_password needs, then set Django up before hashing.
+
+    Args:
+        workers: Number of processes; 0 uses one per CPU, 1 hashes in-process
+    """
+    if workers == 1:
+        yield lambda passwords: [make_password(password) for password in passwords]
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=django.setup
+    ) as pool:
+        yield lambda passwords: list(pool.map(
+            make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))
+        ))
+
+
+def _taken_identifiers(entries):
+    """Find which identifiers of a batch already belong to users, in one query."""
+    lookup = Q()
+    for field, _ in IDENTIFIER_FIELDS:
+        lookup |= Q(**{f'{field}__in': [entry[field] for entry in entries]})
+    taken = {field: set() for field, _ in IDENTIFIER_FIELDS}
+    fields = [field for field, _ in IDENTIFIER_FIELDS]
+    for values in User.objects.filter(lookup).values_list(*fields):
+        for field, value in zip(fields, values):
+            taken[field].add(value)
+    return taken
+
+
+def _build_user(entry, encoded_password):
+    return User(
+        **{field: entry[field] for field in REQUIRED_FIELDS if field != 'password'},
+        password=encoded_password
+    )
+
+
+def _assign_roles(users_with_roles, roles, assigned_by):
+    assignments = [
+        (user, roles[name])
+        for user, role_names in users_with_roles
+        for name in role_names
+    ]
+    RoleAssignment.objects.bulk_create(
+        [RoleAssignment(user=user, role=role, assigned_by=assigned_by) for user, role in assignments],
+        ignore_conflicts=True
+    )
+    # bulk_create sends no signals; role counts feed e.g. the case statistics
+    send_roles_changed('post_add', [(user.pk, role) for user, role in assignments])
+
+
+def _insert_batch(batch, roles, assigned_by, hash_passwords, report):
+    """Insert one batch of validated rows, recording rows that conflict."""
+    taken = _taken_identifiers([entry for _, entry in batch])
+    pending = []
+    for line_number, entry in batch:
+        errors = {
+            field: [f'user with this {field.replace("_", " ")} already exists.']
+            for field, _ in IDENTIFIER_FIELDS
+            if entry[field] in taken[field]
+        }
+        if errors:
+            report['errors'].append({'row': line_number, 'errors': errors})
+        else:
+            pending.append((line_number, entry))
+    if not pending:
+        return
+
+    encoded = hash_passwords([entry['password'] for _, entry in pending])
+    users = [_build_user(entry, password) for (_, entry), password in zip(pending, encoded)]
+    try:
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            _assign_roles(
+                [(user, entry['roles']) for user, (_, entry) in zip(users, pending)], roles, assigned_by
+            )
+        report['created'] += len(users)
+        return
+    except IntegrityError:
+        pass
+
+    # An identifier was taken concurrently after the check: insert row by
+    # row so only the conflicting rows fail
+    for (line_number, entry), password in zip(pending, encoded):
+        user = _build_user(entry, password)
+        try:
+            with transaction.atomic():
+                user.save()
+                _assign_roles([(user, entry['roles'])], roles, assigned_by)
+        except IntegrityError:
+            report['errors'].append({
+                'row': line_number,
+                'errors': {'non_field_errors': ['A user with these identifiers already exists.']}
+            })
+        else:
+            report['created'] += 1
+
+
+def import_users(rows, assigned_by=None, batch_size=None, workers=None):
+    """
+    Create users from parsed rows (see read_rows()).
+
+    Args:
+        rows: Iterable of (line number, row) pairs
+        assigned_by: User recorded as assigning the imported roles
+        batch_size: Users inserted per batch (default USER_IMPORT_BATCH_SIZE)
+        workers: Hashing processes (default USER_IMPORT_HASH_WORKERS);
+            pass 1 inside web requests
+
+    Returns:
+        dict: 'created' count and 'errors' as a list of {'row', 'errors'}
+    """
+    batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+    if workers is None:
+        workers = settings.USER_IMPORT_HASH_WORKERS
+
+    roles = {role.name: role for role in Role.objects.filter(is_active=True)}
+    seen = {field: set() for field, _ in IDENTIFIER_FIELDS}
+    report = {'created': 0, 'errors': []}
+    batch = []
+    line_number = 0
+    with password_hasher(workers) as hash_passwords:
+        try:
+            for line_number, row in rows:
+                entry, errors = validate_row(row, roles, seen)
+                if errors:
+                    report['errors'].append({'row': line_number, 'errors': errors})
+                    continue
+                batch.append((line_number, entry))
+                if len(batch) >= batch_size:
+                    _insert_batch(batch, roles, assigned_by, hash_passwords, report)
+                    batch = []
+        except UnicodeDecodeError:
+            report['errors'].append({
+                'row': line_number + 1,
+                'errors': {'non_field_errors': [DECODE_ERROR]}
+            })
+        if batch:
+            _insert_batch(batch, roles, assigned_by, hash_passwords, report)
+
+    report['errors'].sort(key=lambda error: error['row'])
+    return report
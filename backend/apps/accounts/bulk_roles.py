@@ -0,0 +1,117 @@
+"""
+Set-based role assignment and revocation for many users at once.
+
+User.assign_role and remove_role handle one (user, role) pair in up to
+four queries. assign_roles() applies any number of pairs with a single
+upsert on role_assignments plus one UPDATE demoting Basic User, and
+remove_roles() with a single UPDATE.
+
+Bulk writes send no RoleAssignment signals, so both announce the change
+as an m2m_changed on User.roles (one per role, with the affected users as
+pk_set): role caches, case statistics and dossiers are then invalidated by
+the receivers that already handle direct User.roles edits.
+"""
+from collections import defaultdict
+
+from django.db import router, transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed
+
+from apps.accounts.models import User, RoleAssignment
+
+BASIC_ROLE = 'Basic User'
+
+
+def _group_by_role(assignments):
+    users_by_role = defaultdict(set)
+    roles = {}
+    for user_id, role in assignments:
+        users_by_role[role.pk].add(user_id)
+        roles[role.pk] = role
+    return roles, users_by_role
+
+
+def send_roles_changed(action, assignments):
+    """
+    Announce role changes written in bulk as m2m_changed on User.roles.
+
+    Args:
+        action: 'post_add' or 'post_remove'
+        assignments: Iterable of (user id, Role) pairs
+    """
+    roles, users_by_role = _group_by_role(assignments)
+    for role_id, user_ids in users_by_role.items():
+        m2m_changed.send(
+            sender=User.roles.through, instance=roles[role_id], action=action,
+            reverse=True, model=User, pk_set=set(user_ids),
+            using=router.db_for_write(RoleAssignment)
+        )
+
+
+def assign_roles(assignments, assigned_by=None):
+    """
+    Assign roles to users, (re)activating existing assignments.
+
+    As with User.assign_role, users given any role other than Basic User
+    lose their active Basic User assignment.
+
+    Args:
+        assignments: Iterable of (user id, Role) pairs
+        assigned_by: User making the assignments
+
+    Returns:
+        int: Number of distinct pairs applied
+    """
+    assignments = list(assignments)
+    roles, users_by_role = _group_by_role(assignments)
+    if not users_by_role:
+        return 0
+
+    demoted = {
+        user_id
+        for role_id, user_ids in users_by_role.items() if roles[role_id].name != BASIC_ROLE
+        for user_id in user_ids
+    }
+    with transaction.atomic():
+        RoleAssignment.objects.bulk_create(
+            [
+                RoleAssignment(user_id=user_id, role_id=role_id, assigned_by=assigned_by, is_active=True)
+                for role_id, user_ids in users_by_role.items()
+                for user_id in user_ids
+            ],
+            update_conflicts=True,
+            unique_fields=['user', 'role'],
+            update_fields=['is_active', 'assigned_by']
+        )
+        if demoted:
+            RoleAssignment.objects.filter(
+                user_id__in=demoted, role__name=BASIC_ROLE, is_active=True
+            ).update(is_active=False)
+
+    send_roles_changed('post_add', assignments)
+    return sum(len(user_ids) for user_ids in users_by_role.values())
+
+
+def remove_roles(assignments):
+    """
+    Deactivate role assignments of users.
+
+    Args:
+        assignments: Iterable of (user id, Role) pairs
+
+    Returns:
+        int: Number of assignments deactivated
+    """
+    assignments = list(assignments)
+    roles, users_by_role = _group_by_role(assignments)
+    if not users_by_role:
+        return 0
+
+    removed = RoleAssignment.objects.filter(
+        Q(*[Q(role_id=role_id, user_id__in=user_ids) for role_id, user_ids in users_by_role.items()],
+          _connector=Q.OR),
+        is_active=True
+    ).update(is_active=False)
+
+    send_roles_changed('post_remove', assignments)
+    return removed
@@ -0,0 +1,65 @@
+"""
+Password hashing for logins.
+
+TunedArgon2PasswordHasher takes its cost parameters from settings
+(ARGON2_TIME_COST, ARGON2_MEMORY_COST, ARGON2_PARALLELISM), so they can be
+tuned per deployment without a code change.
+
+check_login_password() verifies a password like User.check_password(), but
+when the stored hash uses an outdated hasher or parameters it upgrades it
+after the response is sent (core.deferred), so the client does not wait for
+the second hash. The server still pays for it: the upgrade runs on the same
+worker, which cannot take its next request until the new hash is computed.
+It cannot be handed to the outbox worker, as that would mean storing the
+raw password. Upgrades happen once per user, so this cost fades as hashes
+move to the preferred hasher.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher, check_password, make_password
+from core.deferred import after_response
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """Argon2 hasher with cost parameters read from settings."""
+    
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+    
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+    
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+def check_login_password(user, raw_password):
+    """
+    Check a login password, upgrading an outdated hash after the response.
+    
+    Args:
+        user: User logging in
+        raw_password: Password typed by the user
+        
+    Returns:
+        bool: True if the password is correct
+    """
+    outdated = []
+    is_correct = check_password(raw_password, user.password, setter=outdated.append)
+    if is_correct and outdated:
+        after_response(lambda: rehash_password(user.pk, user.password, raw_password))
+    return is_correct
+
+
+def rehash_password(user_id, old_encoded, raw_password):
+    """
+    Store a password with the preferred hasher, unless it changed meanwhile.
+    
+    Written with a conditional UPDATE rather than User.save(), which would
+    treat it as a password change and revoke the user's tokens.
+    """
+    from apps.accounts.models import User
+    
+    User.objects.filter(pk=user_id, password=old_encoded).update(password=make_password(raw_password))
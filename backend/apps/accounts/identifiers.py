@@ -0,0 +1,102 @@
+"""
+Normalization and resolution of the identifiers users log in with.
+
+Usernames and emails are stored lowercased, phone numbers without
+formatting characters and national IDs without whitespace, so a login can
+match them with plain equality on the unique (btree) indexes of the users
+table. Comparing with iexact instead wraps the column in UPPER() and forces
+a sequential scan on every login.
+
+resolve_login_user() classifies the identifier, compares only against the
+columns it could belong to and resolves the user in one indexed query.
+"""
+import re
+
+from django.db.models import Q
+
+PHONE_FORMATTING = re.compile(r'[\s().-]')
+PHONE_SHAPE = re.compile(r'^\+?\d{5,}$')
+
+
+def normalize_username(username):
+    """Lowercase a username (see module docstring)."""
+    return (username or '').strip().lower()
+
+
+def normalize_email(email):
+    """Lowercase an email address (see module docstring)."""
+    return (email or '').strip().lower()
+
+
+def normalize_phone_number(phone_number):
+    """Drop spaces, dashes, dots and parentheses, keeping a leading '+'."""
+    return PHONE_FORMATTING.sub('', phone_number or '')
+
+
+def normalize_national_id(national_id):
+    """Drop whitespace from a national ID."""
+    return re.sub(r'\s', '', national_id or '')
+
+
+# Identifier columns in the order matches are preferred, with their normalizer
+IDENTIFIER_FIELDS = [
+    ('email', normalize_email),
+    ('phone_number', normalize_phone_number),
+    ('national_id', normalize_national_id),
+    ('username', normalize_username),
+]
+
+
+def classify_identifier(identifier):
+    """
+    Work out which identifier columns a login identifier could match.
+    
+    Args:
+        identifier: Raw identifier typed by the user
+        
+    Returns:
+        dict: Column name -> normalized value to compare it with
+    """
+    identifier = identifier.strip()
+    candidates = {'username': normalize_username(identifier)}
+    if '@' in identifier:
+        candidates['email'] = normalize_email(identifier)
+    phone_number = normalize_phone_number(identifier)
+    if PHONE_SHAPE.match(phone_number):
+        candidates['phone_number'] = phone_number
+        if phone_number.isdigit():
+            candidates['national_id'] = phone_number
+    elif identifier and not re.search(r'\s', identifier):
+        # National IDs are not always numeric
+        candidates['national_id'] = normalize_national_id(identifier)
+    return candidates
+
+
+def resolve_login_user(identifier):
+    """
+    Find the user a login identifier refers to.
+    
+    Every candidate column is compared by equality with its normalized
+    value, so each branch is answered by that column's unique index.
+    
+    Args:
+        identifier: Username, email, phone number or national ID
+        
+    Returns:
+        User or None: The matching user, preferring email, then phone
+        number, national ID and username when several users match
+    """
+    from apps.accounts.models import User
+    
+    candidates = classify_identifier(identifier)
+    if not any(candidates.values()):
+        return None
+    
+    users = list(User.objects.filter(
+        Q(*[Q(**{field: value}) for field, value in candidates.items() if value], _connector=Q.OR)
+    ))
+    for field, _ in IDENTIFIER_FIELDS:
+        for user in users:
+            if field in candidates and getattr(user, field) == candidates[field]:
+                return user
+    return None
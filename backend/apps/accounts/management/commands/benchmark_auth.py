@@ -0,0 +1,94 @@
+"""
+Management command benchmarking the login and registration endpoints.
+
+Creates temporary users (usernames prefixed with "bench_"), fires requests
+at /api/auth/users/login/ and /api/auth/users/register/ from concurrent
+threads through the full Django stack, reports throughput and latency
+percentiles, then deletes the users again. Run it against a database and
+PASSWORD_HASHERS configured like production, e.g.:
+
+    python manage.py benchmark_auth --requests 200 --concurrency 8
+"""
+import json
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.test import Client
+from apps.accounts.models import User
+
+PASSWORD = 'bench-password-123'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark login and registration throughput under concurrency'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100, help='Requests per endpoint')
+        parser.add_argument('--concurrency', type=int, default=4, help='Concurrent client threads')
+        parser.add_argument('--users', type=int, default=20, help='Existing users logins are spread over')
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        prefix = f'bench_{run_id}_'
+        encoded = make_password(PASSWORD)
+        users = User.objects.bulk_create([
+            User(
+                username=f'{prefix}{i}',
+                email=f'{prefix}{i}@bench.local',
+                phone_number=f'{run_id}{i}',
+                national_id=f'{run_id}{i}',
+                first_name='Bench',
+                last_name=str(i),
+                password=encoded
+            )
+            for i in range(options['users'])
+        ])
+        try:
+            self._report('login', self._run(options, lambda i: (
+                '/api/auth/users/login/',
+                {'identifier': users[i % len(users)].username, 'password': PASSWORD}
+            )))
+            self._report('register', self._run(options, lambda i: (
+                '/api/auth/users/register/',
+                {
+                    'username': f'{prefix}new{i}', 'email': f'{prefix}new{i}@bench.local',
+                    'phone_number': f'{run_id}9{i}', 'national_id': f'{run_id}9{i}',
+                    'first_name': 'Bench', 'last_name': str(i),
+                    'password': PASSWORD, 'password_confirm': PASSWORD
+                }
+            )))
+        finally:
+            User.objects.filter(username__startswith=prefix).delete()
+
+    def _run(self, options, make_request):
+        host = next((h for h in settings.ALLOWED_HOSTS if '*' not in h and not h.startswith('.')), 'localhost')
+
+        def send(i):
+            url, payload = make_request(i)
+            client = Client(HTTP_HOST=host)
+            started = time.perf_counter()
+            response = client.post(url, json.dumps(payload), content_type='application/json')
+            elapsed = time.perf_counter() - started
+            close_old_connections()
+            return elapsed, response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            results = list(pool.map(send, range(options['requests'])))
+        return time.perf_counter() - started, results
+
+    def _report(self, name, run):
+        wall, results = run
+        latencies = sorted(elapsed * 1000 for elapsed, _ in results)
+        failures = sum(1 for _, status_code in results if status_code >= 400)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self.stdout.write(
+            f'{name}: {len(results) / wall:.1f} req/s, '
+            f'p50 {statistics.median(latencies):.0f}ms, p95 {p95:.0f}ms, '
+            f'max {latencies[-1]:.0f}ms, {failures} failed'
+        )
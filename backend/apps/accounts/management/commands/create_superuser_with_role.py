@@ -3,6 +3,7 @@ Management command to create superuser with System Administrator role.
 """
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from apps.accounts.identifiers import normalize_username
 from apps.accounts.models import Role
 
 User = get_user_model()
@@ -29,8 +30,8 @@ class Command(BaseCommand):
         first_name = options['first_name']
         last_name = options['last_name']
         
-        # Check if user exists
-        if User.objects.filter(username=username).exists():
+        # Check if user exists (usernames are stored normalized)
+        if User.objects.filter(username=normalize_username(username)).exists():
             self.stdout.write(
                 self.style.ERROR(f'User with username "{username}" already exists')
             )
@@ -0,0 +1,59 @@
+"""
+Management command importing users from a CSV or NDJSON file.
+
+See apps.accounts.bulk_import for the row format. Invalid rows are listed
+with their line number and skipped; valid rows are imported regardless.
+
+    python manage.py import_users officers.csv --assigned-by admin
+"""
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from apps.accounts.bulk_import import FORMATS, detect_format, import_users, read_rows
+from apps.accounts.models import User
+
+
+class Command(BaseCommand):
+    help = 'Import users (with roles) from a CSV or NDJSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for standard input")
+        parser.add_argument('--format', choices=FORMATS, help='Defaults to the file extension, else csv')
+        parser.add_argument('--batch-size', type=int, help='Users inserted per batch')
+        parser.add_argument('--workers', type=int, help='Password hashing processes (1 hashes in-process)')
+        parser.add_argument('--assigned-by', help='Username recorded as assigning the imported roles')
+
+    def handle(self, *args, **options):
+        assigned_by = None
+        if options['assigned_by']:
+            try:
+                assigned_by = User.objects.get(username=options['assigned_by'].strip().lower())
+            except User.DoesNotExist:
+                raise CommandError(f"User {options['assigned_by']} not found")
+
+        path = options['path']
+        fmt = options['format'] or detect_format(path)
+        if path == '-':
+            report = self._import(sys.stdin, fmt, assigned_by, options)
+        else:
+            try:
+                with open(path, encoding='utf-8-sig', newline='') as lines:
+                    report = self._import(lines, fmt, assigned_by, options)
+            except OSError as exc:
+                raise CommandError(str(exc))
+
+        for error in report['errors']:
+            messages = '; '.join(
+                f'{field}: {" ".join(field_errors)}' for field, field_errors in error['errors'].items()
+            )
+            self.stderr.write(f"Row {error['row']}: {messages}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report['created']} users, {len(report['errors'])} rows rejected"
+        ))
+
+    def _import(self, lines, fmt, assigned_by, options):
+        return import_users(
+            read_rows(lines, fmt),
+            assigned_by=assigned_by,
+            batch_size=options['batch_size'],
+            workers=options['workers']
+        )
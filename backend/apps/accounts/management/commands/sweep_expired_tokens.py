@@ -0,0 +1,34 @@
+"""
+Management command deleting API tokens older than AUTH_TOKEN_TTL.
+
+Expired tokens already fail authentication; this keeps the authtoken table
+small. Safe to run repeatedly (e.g. hourly from cron).
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+
+class Command(BaseCommand):
+    help = 'Delete API tokens that have expired'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report expired tokens without deleting them')
+
+    def handle(self, *args, **options):
+        if not settings.AUTH_TOKEN_TTL:
+            self.stdout.write('AUTH_TOKEN_TTL is 0; tokens never expire')
+            return
+
+        cutoff = timezone.now() - timedelta(seconds=settings.AUTH_TOKEN_TTL)
+        expired = Token.objects.filter(created__lt=cutoff)
+
+        if options['dry_run']:
+            self.stdout.write(f'{expired.count()} expired tokens would be deleted')
+            return
+
+        # Deleting through the queryset still sends post_delete, which evicts cached entries
+        deleted, _ = expired.delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} expired tokens'))
@@ -0,0 +1,58 @@
+"""
+Normalize the login identifiers of existing users (see
+apps.accounts.identifiers).
+
+If several users' identifiers normalize to the same value, the migration
+fails and lists them: leaving one un-normalized would make that user
+unreachable by the normalized login lookup. Resolve the duplicates (e.g.
+rename one of the accounts) and run migrate again.
+"""
+import re
+
+from django.db import migrations
+
+NORMALIZERS = {
+    'username': lambda value: value.strip().lower(),
+    'email': lambda value: value.strip().lower(),
+    'phone_number': lambda value: re.sub(r'[\s().-]', '', value),
+    'national_id': lambda value: re.sub(r'\s', '', value),
+}
+
+
+def normalize_identifiers(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    rows = list(User.objects.values_list('pk', *NORMALIZERS))
+    
+    collisions = []
+    for index, (field, normalize) in enumerate(NORMALIZERS.items()):
+        owners = {}
+        for row in rows:
+            owners.setdefault(normalize(row[index + 1]), []).append(row[0])
+        collisions.extend(
+            f'{field} {value!r}: users {sorted(pks)}' for value, pks in owners.items() if len(pks) > 1
+        )
+    if collisions:
+        raise RuntimeError(
+            'Cannot normalize login identifiers; these users would share one:\n  '
+            + '\n  '.join(collisions)
+        )
+    
+    for row in rows:
+        changes = {}
+        for index, (field, normalize) in enumerate(NORMALIZERS.items()):
+            value = row[index + 1]
+            if normalize(value) != value:
+                changes[field] = normalize(value)
+        if changes:
+            User.objects.filter(pk=row[0]).update(**changes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_identifiers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-17 04:33
+
+import apps.accounts.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0002_normalize_user_identifiers"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", apps.accounts.models.UserManager()),
+            ],
+        ),
+    ]
@@ -1,8 +1,9 @@
 """
 User and Role models for dynamic RBAC system.
 """
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as BaseUserManager
 from django.db import models
+from django.db.models import Prefetch
 from django.utils import timezone
 
 
@@ -53,6 +54,18 @@ class RoleAssignment(models.Model):
         return f'{self.user.username} - {self.role.name}'
 
 
+class UserManager(BaseUserManager):
+    """User manager matching usernames the way they are stored."""
+    
+    def get_by_natural_key(self, username):
+        """
+        Resolve a username typed in any case, as ModelBackend (Django admin
+        login) and createsuperuser do, against the lowercased column.
+        """
+        from apps.accounts.identifiers import normalize_username
+        return super().get_by_natural_key(normalize_username(username))
+
+
 class User(AbstractUser):
     """
     Custom user model with additional fields for police system.
@@ -73,6 +86,13 @@ class User(AbstractUser):
         related_name='users'
     )
     
+    objects = UserManager()
+    
+    # Bumped by apps.accounts.signals whenever a Role or a bulk M2M change
+    # could affect users other than the instance being edited; memoized
+    # role names from an older generation are discarded.
+    role_generation = 0
+    
     class Meta:
         db_table = 'users'
         ordering = ['-date_joined']
@@ -82,6 +102,17 @@ class User(AbstractUser):
     def __str__(self):
         return f'{self.username} ({self.get_full_name()})'
     
+    def normalize_identifiers(self):
+        """Store login identifiers in their normalized form (see apps.accounts.identifiers)."""
+        from apps.accounts.identifiers import IDENTIFIER_FIELDS
+        for field, normalize in IDENTIFIER_FIELDS:
+            setattr(self, field, normalize(getattr(self, field)))
+    
+    def save(self, *args, **kwargs):
+        """Save the user with normalized login identifiers."""
+        self.normalize_identifiers()
+        super().save(*args, **kwargs)
+    
     def get_full_name(self):
         """Return the full name of the user."""
         return f'{self.first_name} {self.last_name}'.strip()
@@ -90,6 +121,38 @@ class User(AbstractUser):
         """Return the short name of the user."""
         return self.first_name
     
+    def get_role_names(self):
+        """
+        Get the names of all active roles for the user.
+        
+        The result is memoized on the user instance for the duration of a
+        request and shared between workers through the versioned role
+        cache, so most permission checks never reach the database.
+        
+        Returns:
+            frozenset: Names of the user's active roles
+        """
+        cached = self.__dict__.get('_role_names_cache')
+        if cached is not None and cached[0] == User.role_generation:
+            return cached[1]
+        
+        from apps.accounts import role_cache
+        role_names = role_cache.get_role_names(
+            self.pk,
+            lambda: self.role_assignments.filter(
+                is_active=True,
+                role__is_active=True
+            ).values_list('role__name', flat=True)
+        )
+        self._role_names_cache = (User.role_generation, role_names)
+        return role_names
+    
+    def invalidate_role_cache(self):
+        """Drop the memoized and shared role names after an assignment change."""
+        from apps.accounts import role_cache
+        self.__dict__.pop('_role_names_cache', None)
+        role_cache.bump_user_versions([self.pk])
+    
     def has_role(self, role_name):
         """
         Check if user has a specific role (active assignment).
@@ -100,11 +163,7 @@ class User(AbstractUser):
         Returns:
             bool: True if user has the role, False otherwise
         """
-        return self.role_assignments.filter(
-            role__name=role_name,
-            is_active=True,
-            role__is_active=True
-        ).exists()
+        return role_name in self.get_role_names()
     
     def has_any_role(self, role_names):
         """
@@ -116,19 +175,22 @@ class User(AbstractUser):
         Returns:
             bool: True if user has any of the roles, False otherwise
         """
-        return self.role_assignments.filter(
-            role__name__in=role_names,
-            is_active=True,
-            role__is_active=True
-        ).exists()
+        return not self.get_role_names().isdisjoint(role_names)
     
     def get_active_roles(self):
         """
         Get all active roles for the user.
         
+        Uses assignments loaded by active_roles_prefetch() when present,
+        avoiding a query per user when serializing lists.
+        
         Returns:
-            QuerySet: Active roles
+            QuerySet or list: Active roles, ordered by name
         """
+        prefetched = getattr(self, 'active_role_assignments', None)
+        if prefetched is not None:
+            return sorted((assignment.role for assignment in prefetched), key=lambda role: role.name)
+        
         return Role.objects.filter(
             assignments__user=self,
             assignments__is_active=True,
@@ -169,7 +231,8 @@ class User(AbstractUser):
                 RoleAssignment.objects.filter(user=self, role=basic_role).update(is_active=False)
             except Role.DoesNotExist:
                 pass
-                
+        
+        self.invalidate_role_cache()
         return assignment
     
     def remove_role(self, role):
@@ -186,4 +249,28 @@ class User(AbstractUser):
             user=self,
             role=role
         ).update(is_active=False)
+        self.invalidate_role_cache()
+
+
 
+def active_roles_prefetch(prefix=''):
+    """
+    Build a Prefetch loading active role assignments (with their roles) for
+    the users reached through prefix, e.g. 'created_by__'.
+    
+    Users loaded this way answer get_active_roles() from memory.
+    
+    Args:
+        prefix: Lookup path to the users, ending in '__' (empty for users)
+        
+    Returns:
+        Prefetch: Prefetch object for prefetch_related()
+    """
+    return Prefetch(
+        f'{prefix}role_assignments',
+        queryset=RoleAssignment.objects.filter(
+            is_active=True,
+            role__is_active=True
+        ).select_related('role'),
+        to_attr='active_role_assignments'
+    )
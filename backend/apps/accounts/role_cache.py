@@ -0,0 +1,135 @@
+"""
+Shared, versioned cache of active role names per user.
+
+Role sets are stored under a key that embeds two version counters: a
+per-user version bumped whenever that user's assignments change, and a
+global version bumped whenever a Role itself changes. Bumping a version
+makes every previously cached entry unreachable, so revocations take
+effect on the next request in every worker without deleting anything.
+
+Versions are bumped once the surrounding transaction commits. Bumping
+earlier would let a concurrent request read the new version and cache the
+old, still committed role set under it. Until the commit, the writing
+connection itself does not cache the users it changed, so a rollback
+leaves no uncommitted role set behind either.
+"""
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+GLOBAL_VERSION_KEY = 'accounts:roles:version'
+
+
+def _user_version_key(user_id):
+    return f'accounts:roles:version:{user_id}'
+
+
+def _roles_key(user_id, global_version, user_version):
+    return f'accounts:roles:{user_id}:{global_version}:{user_version}'
+
+
+def _new_version():
+    # Seeded from the clock so a counter lost to eviction never restarts
+    # at a value whose cached role set could still be around.
+    return time.time_ns()
+
+
+# Users whose role changes in this thread's open transaction are not yet
+# committed; 'all' is set by an uncommitted global bump.
+_uncommitted = threading.local()
+
+
+def _uncommitted_state():
+    if not transaction.get_connection().in_atomic_block:
+        # No transaction open: whatever was pending committed or rolled back
+        _uncommitted.user_ids = set()
+        _uncommitted.all = False
+    elif not hasattr(_uncommitted, 'user_ids'):
+        _uncommitted.user_ids = set()
+        _uncommitted.all = False
+    return _uncommitted
+
+
+def _has_uncommitted_changes(user_id):
+    state = _uncommitted_state()
+    return state.all or user_id in state.user_ids
+
+
+def _get_versions(user_id):
+    """Return (global_version, user_version), initializing missing counters."""
+    user_key = _user_version_key(user_id)
+    versions = cache.get_many([GLOBAL_VERSION_KEY, user_key])
+    missing = {
+        key: _new_version()
+        for key in (GLOBAL_VERSION_KEY, user_key)
+        if key not in versions
+    }
+    for key, value in missing.items():
+        cache.add(key, value, timeout=None)
+    if missing:
+        versions = cache.get_many([GLOBAL_VERSION_KEY, user_key])
+    return versions.get(GLOBAL_VERSION_KEY), versions.get(user_key)
+
+
+def get_role_names(user_id, loader):
+    """
+    Get a user's active role names, loading them on a cache miss.
+
+    Args:
+        user_id: Primary key of the user
+        loader: Callable returning the role names from the database
+
+    Returns:
+        frozenset: Active role names
+    """
+    if _has_uncommitted_changes(user_id):
+        return frozenset(loader())
+
+    global_version, user_version = _get_versions(user_id)
+    if global_version is None or user_version is None:
+        # Cache backend is not storing anything (e.g. DummyCache)
+        return frozenset(loader())
+
+    key = _roles_key(user_id, global_version, user_version)
+    role_names = cache.get(key)
+    if role_names is None:
+        role_names = list(loader())
+        cache.set(key, role_names, timeout=settings.ROLE_CACHE_TIMEOUT)
+    return frozenset(role_names)
+
+
+def _set_user_versions(user_ids):
+    # Replaced in one cache call rather than incremented one by one: an
+    # entry is only reachable under the exact version it was stored with,
+    # so any value never used before retires it. A random value is used
+    # since clock readings can repeat between quick bumps.
+    version = random.getrandbits(63)
+    cache.set_many({_user_version_key(user_id): version for user_id in user_ids}, timeout=None)
+    _uncommitted_state().user_ids.difference_update(user_ids)
+
+
+def _incr_global_version():
+    try:
+        cache.incr(GLOBAL_VERSION_KEY)
+    except ValueError:
+        cache.set(GLOBAL_VERSION_KEY, _new_version(), timeout=None)
+    _uncommitted_state().all = False
+
+
+def bump_user_versions(user_ids):
+    """Invalidate the cached role sets of the given users once the transaction commits."""
+    user_ids = {user_id for user_id in user_ids if user_id is not None}
+    if not user_ids:
+        return
+    _uncommitted_state().user_ids.update(user_ids)
+    transaction.on_commit(lambda: _set_user_versions(user_ids))
+
+
+def bump_global_version():
+    """Invalidate the cached role sets of every user once the transaction commits."""
+    _uncommitted_state().all = True
+    transaction.on_commit(_incr_global_version)
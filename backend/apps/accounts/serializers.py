@@ -4,9 +4,26 @@ Serializers for accounts app (User, Role, Authentication).
 from rest_framework import serializers
 from django.contrib.auth import authenticate
 from rest_framework.authtoken.models import Token
+from .hashers import check_login_password
+from .identifiers import IDENTIFIER_FIELDS, resolve_login_user
 from .models import User, Role, RoleAssignment
 
 
+class NormalizedIdentifiersMixin:
+    """
+    Normalize login identifiers before validation, so uniqueness is checked
+    against the values actually stored (see apps.accounts.identifiers).
+    """
+    
+    def to_internal_value(self, data):
+        if hasattr(data, 'copy'):
+            data = data.copy()
+            for field, normalize in IDENTIFIER_FIELDS:
+                if isinstance(data.get(field), str):
+                    data[field] = normalize(data[field])
+        return super().to_internal_value(data)
+
+
 class RoleSerializer(serializers.ModelSerializer):
     """Serializer for Role model."""
     
@@ -33,7 +50,48 @@ class RoleAssignmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'assigned_at']
 
 
-class UserSerializer(serializers.ModelSerializer):
+class RolePairSerializer(serializers.Serializer):
+    """One (user, role) pair of a bulk role change."""
+    user_id = serializers.IntegerField()
+    role_id = serializers.IntegerField()
+
+
+class BulkRoleAssignmentSerializer(serializers.Serializer):
+    """
+    Validate many (user, role) pairs with one query per model.
+    
+    validated_data['assignments'] is a list of (user id, Role) pairs.
+    """
+    assignments = RolePairSerializer(many=True, allow_empty=False)
+    active_roles_only = True
+    
+    def validate_assignments(self, value):
+        user_ids = {pair['user_id'] for pair in value}
+        roles = Role.objects.all()
+        if self.active_roles_only:
+            roles = roles.filter(is_active=True)
+        roles = roles.in_bulk({pair['role_id'] for pair in value})
+        
+        errors = {}
+        missing_users = user_ids - set(
+            User.objects.filter(pk__in=user_ids).order_by().values_list('pk', flat=True)
+        )
+        if missing_users:
+            errors['user_id'] = [f'Users not found: {sorted(missing_users)}']
+        missing_roles = {pair['role_id'] for pair in value} - set(roles)
+        if missing_roles:
+            errors['role_id'] = [f'Roles not found: {sorted(missing_roles)}']
+        if errors:
+            raise serializers.ValidationError(errors)
+        return [(pair['user_id'], roles[pair['role_id']]) for pair in value]
+
+
+class BulkRoleRemovalSerializer(BulkRoleAssignmentSerializer):
+    """Like BulkRoleAssignmentSerializer, but inactive roles may be removed."""
+    active_roles_only = False
+
+
+class UserSerializer(NormalizedIdentifiersMixin, serializers.ModelSerializer):
     """Serializer for User model."""
     roles = serializers.SerializerMethodField()
     role_ids = serializers.PrimaryKeyRelatedField(
@@ -62,7 +120,7 @@ class UserSerializer(serializers.ModelSerializer):
         return RoleSerializer(obj.get_active_roles(), many=True).data
 
 
-class UserRegistrationSerializer(serializers.ModelSerializer):
+class UserRegistrationSerializer(NormalizedIdentifiersMixin, serializers.ModelSerializer):
     """Serializer for user registration."""
     password = serializers.CharField(write_only=True, min_length=8)
     password_confirm = serializers.CharField(write_only=True, min_length=8)
@@ -81,10 +139,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
     
     def create(self, validated_data):
         validated_data.pop('password_confirm')
-        password = validated_data.pop('password')
+        # create_user hashes the password and inserts the user in one write
         user = User.objects.create_user(**validated_data)
-        user.set_password(password)
-        user.save()
         
         # Assign default role: Basic User
         try:
@@ -108,17 +164,9 @@ class UserLoginSerializer(serializers.Serializer):
         if not identifier or not password:
             raise serializers.ValidationError("Both identifier and password are required.")
             
-        identifier = identifier.strip()
-        
-        from django.db.models import Q
-        user = User.objects.filter(
-            Q(username__iexact=identifier) |
-            Q(email__iexact=identifier) |
-            Q(phone_number=identifier) |
-            Q(national_id=identifier)
-        ).first()
+        user = resolve_login_user(identifier)
         
-        if user and user.check_password(password):
+        if user and check_login_password(user, password):
             attrs['user'] = user
             return attrs
         else:
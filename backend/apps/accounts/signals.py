@@ -0,0 +1,68 @@
+"""
+Signals keeping memoized and shared role caches and cached API tokens
+consistent.
+"""
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from apps.accounts import role_cache, tokens
+from apps.accounts.models import User, Role, RoleAssignment
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+def invalidate_roles_on_role_change(sender, instance, **kwargs):
+    """
+    A renamed, (de)activated or deleted role affects every holder, so
+    discard all memoized and cached role names.
+    """
+    User.role_generation += 1
+    role_cache.bump_global_version()
+
+
+@receiver(post_save, sender=RoleAssignment)
+@receiver(post_delete, sender=RoleAssignment)
+def invalidate_roles_on_assignment_change(sender, instance, **kwargs):
+    """
+    Assignments edited outside User.assign_role (admin, other instances of
+    the same user) must not leave a stale memo or cache entry behind.
+    """
+    User.role_generation += 1
+    role_cache.bump_user_versions([instance.user_id])
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_roles_on_m2m_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Direct edits through User.roles / Role.users bypass assign_role and
+    remove_role, so invalidate role names here as well.
+    """
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    
+    User.role_generation += 1
+    if not reverse:
+        role_cache.bump_user_versions([instance.pk])
+    elif pk_set:
+        role_cache.bump_user_versions(pk_set)
+    else:
+        role_cache.bump_global_version()
+
+
+@receiver(post_save, sender=User)
+def evict_token_on_user_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Cached tokens carry a copy of the user, so drop it when the user
+    changes; deactivation and password changes also revoke the token.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    tokens.evict_user_token(instance.pk)
+    if not instance.is_active or instance._password is not None:
+        tokens.revoke_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def evict_token_on_delete(sender, instance, **kwargs):
+    """Revoked, rotated and swept tokens stop authenticating at once."""
+    tokens.evict_token(instance.key)
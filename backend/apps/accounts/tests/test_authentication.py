@@ -0,0 +1,115 @@
+"""
+Tests for cached, expiring token authentication.
+"""
+from datetime import timedelta
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+from apps.accounts.models import User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CachedTokenAuthenticationTest(TestCase):
+    """Tests for token caching, expiry, rotation and revocation."""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            phone_number='1234567890',
+            national_id='123456789'
+        )
+        self.client = APIClient()
+    
+    def login(self):
+        self.client.credentials()
+        response = self.client.post('/api/auth/users/login/', {
+            'identifier': 'testuser', 'password': 'testpass123'
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {response.data["token"]}')
+        return response.data['token']
+    
+    def me(self):
+        return self.client.get('/api/auth/users/me/')
+    
+    def test_cached_token_skips_the_token_query(self):
+        """Test only the first request looks the token up."""
+        self.login()
+        self.assertEqual(self.me().status_code, status.HTTP_200_OK)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.me().status_code, status.HTTP_200_OK)
+        self.assertFalse(any('authtoken_token' in query['sql'] for query in queries.captured_queries))
+    
+    def test_expired_tokens_are_rejected_and_rotated_on_login(self):
+        """Test tokens stop working after AUTH_TOKEN_TTL and login replaces them."""
+        key = self.login()
+        self.me()
+        Token.objects.filter(key=key).update(created=timezone.now() - timedelta(days=30))
+        cache.clear()
+        self.assertEqual(self.me().status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        self.assertNotEqual(self.login(), key)
+        self.assertEqual(self.me().status_code, status.HTTP_200_OK)
+    
+    def test_logout_revokes_cached_token(self):
+        """Test a cached token stops working as soon as it is revoked."""
+        self.login()
+        self.me()
+        response = self.client.post('/api/auth/users/logout/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Token.objects.exists())
+        self.assertEqual(self.me().status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_rotate_token(self):
+        """Test rotation issues a new token and revokes the old one."""
+        old_key = self.login()
+        self.me()
+        new_key = self.client.post('/api/auth/users/rotate_token/').data['token']
+        self.assertNotEqual(new_key, old_key)
+        self.assertEqual(self.me().status_code, status.HTTP_401_UNAUTHORIZED)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {new_key}')
+        self.assertEqual(self.me().status_code, status.HTTP_200_OK)
+    
+    def test_deactivation_and_password_change_revoke_tokens(self):
+        """Test cached tokens do not outlive a deactivation or password change."""
+        self.login()
+        self.me()
+        self.user.set_password('newpass12345')
+        self.user.save()
+        self.assertEqual(self.me().status_code, status.HTTP_401_UNAUTHORIZED)
+        
+        self.client.credentials()
+        response = self.client.post('/api/auth/users/login/', {
+            'identifier': 'testuser', 'password': 'newpass12345'
+        }, format='json')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {response.data["token"]}')
+        self.me()
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(self.me().status_code, status.HTTP_401_UNAUTHORIZED)
+    
+    def test_sweeper_deletes_expired_tokens(self):
+        """Test the sweeper removes only expired tokens."""
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='testpass123',
+            phone_number='2222222222', national_id='222222222'
+        )
+        Token.objects.create(user=self.user)
+        Token.objects.filter(user=self.user).update(created=timezone.now() - timedelta(days=30))
+        Token.objects.create(user=other)
+        
+        out = StringIO()
+        call_command('sweep_expired_tokens', stdout=out)
+        self.assertIn('Deleted 1 expired tokens', out.getvalue())
+        self.assertEqual(list(Token.objects.values_list('user', flat=True)), [other.pk])
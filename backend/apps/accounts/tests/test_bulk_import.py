@@ -0,0 +1,200 @@
+"""
+Tests for bulk user import (command and API).
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.accounts.bulk_import import import_users, read_rows
+from apps.accounts.models import User, Role, RoleAssignment
+from apps.cases.stats import get_case_stats
+
+CSV_HEADER = 'username,email,phone_number,national_id,first_name,last_name,password,roles\n'
+
+
+def csv_row(i, roles=''):
+    return f'Officer{i},officer{i}@example.com,0912 000 {i:04d},5000{i:04d},Officer,{i},password{i:03d},{roles}\n'
+
+
+class BulkImportTest(TestCase):
+    """Tests for import_users()."""
+
+    def setUp(self):
+        self.basic = Role.objects.create(name='Basic User')
+        self.officer = Role.objects.create(name='Police Officer')
+        self.detective = Role.objects.create(name='Detective')
+
+    def run_import(self, text, fmt='csv', **kwargs):
+        return import_users(read_rows(StringIO(text), fmt), **kwargs)
+
+    def test_import_creates_users_with_roles(self):
+        """Test imported users are normalized, can log in and hold their roles."""
+        text = CSV_HEADER + csv_row(1, 'Police Officer;Detective') + csv_row(2)
+        report = self.run_import(text)
+        self.assertEqual(report, {'created': 2, 'errors': []})
+
+        officer = User.objects.get(username='officer1')
+        self.assertEqual(officer.phone_number, '09120000001')
+        self.assertTrue(officer.check_password('password001'))
+        self.assertEqual(officer.get_role_names(), {'Police Officer', 'Detective'})
+        self.assertEqual(User.objects.get(username='officer2').get_role_names(), {'Basic User'})
+
+    def test_import_reports_invalid_rows(self):
+        """Test invalid, duplicate and already registered rows are reported by line."""
+        User.objects.create_user(
+            username='existing', email='officer3@example.com', password='testpass123',
+            phone_number='1000000000', national_id='1000000000'
+        )
+        text = (
+            CSV_HEADER
+            + csv_row(1)
+            + csv_row(1)
+            + 'officer2,not-an-email,1,2,A,B,short,\n'
+            + csv_row(3)
+            + csv_row(4, 'Janitor')
+        )
+        report = self.run_import(text)
+        self.assertEqual(report['created'], 1)
+        errors = {error['row']: error['errors'] for error in report['errors']}
+        self.assertEqual(sorted(errors), [3, 4, 5, 6])
+        self.assertIn('username', errors[3])
+        self.assertEqual(sorted(errors[4]), ['email', 'password'])
+        self.assertIn('email', errors[5])
+        self.assertEqual(errors[6], {'roles': ['Unknown role: Janitor']})
+
+    def test_import_ndjson(self):
+        """Test NDJSON rows with role lists and unparsable lines."""
+        row = {
+            'username': 'officer1', 'email': 'officer1@example.com', 'phone_number': '111111',
+            'national_id': '111111', 'first_name': 'A', 'last_name': 'B',
+            'password': 'password1', 'roles': ['Detective']
+        }
+        report = self.run_import(json.dumps(row) + '\n{not json\n', fmt='ndjson')
+        self.assertEqual(report['created'], 1)
+        self.assertEqual(report['errors'], [{'row': 2, 'errors': {'non_field_errors': ['Row could not be parsed.']}}])
+        self.assertEqual(User.objects.get().get_role_names(), {'Detective'})
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_import_invalidates_cached_staff_count(self):
+        """Test imported role assignments are reflected in the cached case statistics."""
+        cache.clear()
+        self.assertEqual(get_case_stats()['total_police_staff'], 0)
+        self.run_import(CSV_HEADER + csv_row(1, 'Police Officer') + csv_row(2))
+        self.assertEqual(get_case_stats()['total_police_staff'], 1)
+
+    def test_import_writes_in_batches(self):
+        """Test the number of queries depends on the number of batches, not of users."""
+        text = CSV_HEADER + ''.join(csv_row(i, 'Police Officer') for i in range(40))
+        with CaptureQueriesContext(connection) as queries:
+            report = self.run_import(text, batch_size=20)
+        self.assertEqual(report['created'], 40)
+        self.assertEqual(RoleAssignment.objects.filter(role=self.officer).count(), 40)
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), 4)
+        self.assertLessEqual(len(queries), 12)
+
+    def test_import_command(self):
+        """Test the import_users command reads a file and reports rejected rows."""
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as file:
+            file.write(CSV_HEADER + csv_row(1) + 'bad,,,,,,,\n')
+        self.addCleanup(os.remove, file.name)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_users', file.name, stdout=out, stderr=err)
+        self.assertIn('Created 1 users, 1 rows rejected', out.getvalue())
+        self.assertIn('Row 3:', err.getvalue())
+
+    def test_import_stops_at_invalid_utf8(self):
+        """Test bytes that are not UTF-8 are reported and earlier rows are kept."""
+        # Enough rows that the file is decoded in several chunks
+        valid = CSV_HEADER + ''.join(csv_row(i) for i in range(200))
+        with tempfile.NamedTemporaryFile('wb', suffix='.csv', delete=False) as file:
+            file.write(valid.encode() + b'caf\xe9,x,y,z,A,B,password1,\n' + csv_row(999).encode())
+        self.addCleanup(os.remove, file.name)
+
+        out, err = StringIO(), StringIO()
+        call_command('import_users', file.name, stdout=out, stderr=err)
+        self.assertIn('1 rows rejected', out.getvalue())
+        self.assertIn('Not valid UTF-8', err.getvalue())
+        self.assertTrue(User.objects.filter(username='officer0').exists())
+        self.assertFalse(User.objects.filter(username='officer999').exists())
+
+
+class BulkImportAPITest(TestCase):
+    """Tests for the admin user import endpoint."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123',
+            phone_number='1000000000', national_id='1000000000'
+        )
+        self.admin.assign_role(Role.objects.create(name='System Administrator'))
+        Role.objects.create(name='Detective')
+
+    def upload(self, name='officers.csv', content=CSV_HEADER + csv_row(1, 'Detective')):
+        return SimpleUploadedFile(name, content.encode())
+
+    def test_admin_imports_users(self):
+        """Test an administrator can import a file and gets the report back."""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post('/api/auth/users/import/', {'file': self.upload()}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'created': 1, 'errors': []})
+        assignment = RoleAssignment.objects.get(user__username='officer1')
+        self.assertEqual(assignment.assigned_by, self.admin)
+
+    def test_import_requires_administrator(self):
+        """Test other users cannot import."""
+        user = User.objects.create_user(
+            username='other', email='other@example.com', password='testpass123',
+            phone_number='2000000000', national_id='2000000000'
+        )
+        self.client.force_authenticate(user=user)
+        response = self.client.post('/api/auth/users/import/', {'file': self.upload()}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(User.objects.filter(username='officer1').exists())
+
+    def test_import_requires_file(self):
+        """Test a request without a file is rejected."""
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post('/api/auth/users/import/', {}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(USER_IMPORT_HASH_WORKERS=0)
+    def test_import_hashes_in_process(self):
+        """Test the API never starts a hashing process pool inside the request."""
+        self.client.force_authenticate(user=self.admin)
+        with mock.patch('apps.accounts.bulk_import.ProcessPoolExecutor') as pool:
+            response = self.client.post('/api/auth/users/import/', {'file': self.upload()}, format='multipart')
+        self.assertEqual(response.data['created'], 1)
+        pool.assert_not_called()
+
+    @override_settings(USER_IMPORT_API_MAX_ROWS=2)
+    def test_import_rejects_large_files(self):
+        """Test files over the API row limit are rejected before importing anything."""
+        self.client.force_authenticate(user=self.admin)
+        content = CSV_HEADER + ''.join(csv_row(i) for i in range(3))
+        response = self.client.post(
+            '/api/auth/users/import/', {'file': self.upload(content=content)}, format='multipart'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('import_users command', response.data['error'])
+        self.assertFalse(User.objects.filter(username__startswith='officer').exists())
+
+    def test_import_rejects_non_utf8_file(self):
+        """Test an upload that is not UTF-8 is a 400, with nothing imported."""
+        self.client.force_authenticate(user=self.admin)
+        upload = SimpleUploadedFile('officers.csv', (CSV_HEADER + csv_row(1)).encode() + b'\xff\xfe\n')
+        response = self.client.post('/api/auth/users/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User.objects.filter(username='officer1').exists())
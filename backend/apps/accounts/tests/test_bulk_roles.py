@@ -0,0 +1,114 @@
+"""
+Tests for bulk role assignment and revocation.
+"""
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.accounts.models import User, Role, RoleAssignment
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BulkRoleAssignmentTest(TestCase):
+    """Tests for the bulk_assign_roles and bulk_remove_roles endpoints."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123',
+            phone_number='1000000000', national_id='1000000000'
+        )
+        self.client.force_authenticate(user=self.admin)
+        # Role cache versions are bumped on commit (see apps.accounts.role_cache)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.basic = Role.objects.create(name='Basic User')
+            self.detective = Role.objects.create(name='Detective')
+            self.sergeant = Role.objects.create(name='Sergeant')
+            self.admin.assign_role(Role.objects.create(name='System Administrator'))
+        self.users = []
+    
+    def _create_users(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(len(self.users), len(self.users) + count):
+                user = User.objects.create_user(
+                    username=f'user{i}', email=f'user{i}@example.com', password='testpass123',
+                    phone_number=f'20000000{i:02d}', national_id=f'20000000{i:02d}'
+                )
+                user.assign_role(self.basic)
+                self.users.append(user)
+        return self.users[-count:]
+    
+    def _pairs(self, users, *roles):
+        return {'assignments': [{'user_id': user.pk, 'role_id': role.pk} for user in users for role in roles]}
+    
+    def test_bulk_assign_roles(self):
+        """Test roles are assigned, Basic User is demoted and inactive assignments reactivate."""
+        users = self._create_users(3)
+        RoleAssignment.objects.create(user=users[0], role=self.sergeant, is_active=False)
+        
+        response = self.client.post(
+            '/api/auth/users/bulk_assign_roles/', self._pairs(users, self.detective, self.sergeant), format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'assigned': 6})
+        for user in users:
+            self.assertEqual(User.objects.get(pk=user.pk).get_role_names(), {'Detective', 'Sergeant'})
+        self.assertEqual(RoleAssignment.objects.filter(user=users[0], role=self.sergeant).count(), 1)
+        self.assertEqual(RoleAssignment.objects.get(user=users[1], role=self.detective).assigned_by, self.admin)
+    
+    def test_bulk_assign_invalidates_cached_roles(self):
+        """Test role names cached before a bulk change are not served afterwards."""
+        users = self._create_users(2)
+        self.assertEqual(users[0].get_role_names(), {'Basic User'})
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/auth/users/bulk_assign_roles/', self._pairs(users, self.detective), format='json')
+        self.assertEqual(User.objects.get(pk=users[0].pk).get_role_names(), {'Detective'})
+        self.assertEqual(users[0].get_role_names(), {'Detective'})
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/api/auth/users/bulk_remove_roles/', self._pairs(users, self.detective), format='json')
+        self.assertEqual(User.objects.get(pk=users[1].pk).get_role_names(), frozenset())
+    
+    def test_bulk_assign_query_count_is_constant(self):
+        """Test assigning roles to 2 or 20 users runs the same queries."""
+        small = self._create_users(2)
+        self.admin.get_role_names()
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.post('/api/auth/users/bulk_assign_roles/', self._pairs(small, self.detective), format='json')
+        large = self._create_users(20)
+        with CaptureQueriesContext(connection) as large_queries:
+            self.client.post('/api/auth/users/bulk_assign_roles/', self._pairs(large, self.detective), format='json')
+        self.assertEqual(len(large_queries), len(small_queries))
+        self.assertEqual(RoleAssignment.objects.filter(role=self.detective).count(), 22)
+    
+    def test_bulk_remove_roles(self):
+        """Test assignments are deactivated with a single update and counted."""
+        users = self._create_users(3)
+        response = self.client.post(
+            '/api/auth/users/bulk_remove_roles/', self._pairs(users + [self.admin], self.basic), format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'removed': 3})
+        self.assertFalse(RoleAssignment.objects.filter(role=self.basic, is_active=True).exists())
+    
+    def test_bulk_assign_rejects_unknown_ids(self):
+        """Test nothing is assigned when a user or role does not exist."""
+        users = self._create_users(1)
+        data = self._pairs(users, self.detective)
+        data['assignments'].append({'user_id': 9999, 'role_id': 8888})
+        response = self.client.post('/api/auth/users/bulk_assign_roles/', data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('user_id', response.data['assignments'])
+        self.assertIn('role_id', response.data['assignments'])
+        self.assertFalse(RoleAssignment.objects.filter(role=self.detective).exists())
+    
+    def test_bulk_assign_requires_administrator(self):
+        """Test other users cannot change roles in bulk."""
+        users = self._create_users(1)
+        self.client.force_authenticate(user=users[0])
+        response = self.client.post('/api/auth/users/bulk_assign_roles/', self._pairs(users, self.detective), format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,8 +1,12 @@
 """
 Tests for accounts models (User, Role, RoleAssignment).
 """
-from django.test import TestCase
+import threading
+from django.core.cache import cache
+from django.db import transaction
+from django.test import TestCase, override_settings
 from django.core.exceptions import ValidationError
+from apps.accounts import role_cache
 from apps.accounts.models import User, Role, RoleAssignment
 
 
@@ -103,3 +107,108 @@ class RoleAssignmentModelTest(TestCase):
         self.assertEqual(assignment.role, self.role)
         self.assertTrue(assignment.is_active)
 
+
+
+class UserRoleCacheTest(TestCase):
+    """Tests for memoized role resolution on User."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            phone_number='1234567890',
+            national_id='123456789'
+        )
+        self.detective = Role.objects.create(name='Detective')
+        self.sergeant = Role.objects.create(name='Sergeant')
+        self.user.assign_role(self.detective)
+    
+    def test_repeated_checks_share_one_query(self):
+        """Test that role checks after the first are served from memory."""
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(user.has_role('Detective'))
+            self.assertFalse(user.has_role('Sergeant'))
+            self.assertTrue(user.has_any_role(['Sergeant', 'Detective']))
+            self.assertFalse(user.has_any_role(['Judge']))
+    
+    def test_role_deactivation_invalidates_memo(self):
+        """Test that deactivating a role is visible to an already-checked user."""
+        self.assertTrue(self.user.has_role('Detective'))
+        self.detective.is_active = False
+        self.detective.save()
+        self.assertFalse(self.user.has_role('Detective'))
+    
+    def test_direct_m2m_add_invalidates_memo(self):
+        """Test that roles added through the M2M manager are picked up."""
+        self.assertFalse(self.user.has_role('Sergeant'))
+        self.user.roles.add(self.sergeant)
+        self.assertTrue(self.user.has_role('Sergeant'))
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class SharedRoleCacheTest(TestCase):
+    """Tests for the cross-process versioned role cache."""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            phone_number='1234567890',
+            national_id='123456789'
+        )
+        # Versions are bumped on commit (see apps.accounts.role_cache)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.detective = Role.objects.create(name='Detective')
+            self.user.assign_role(self.detective)
+    
+    def test_fresh_instance_uses_shared_cache(self):
+        """Test that a second worker's user instance needs no role query."""
+        self.assertTrue(User.objects.get(pk=self.user.pk).has_role('Detective'))
+        user = User.objects.get(pk=self.user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(user.has_role('Detective'))
+    
+    def test_revocation_is_immediate(self):
+        """Test that removing a role is visible to other instances."""
+        self.assertTrue(User.objects.get(pk=self.user.pk).has_role('Detective'))
+        User.objects.get(pk=self.user.pk).remove_role(self.detective)
+        self.assertFalse(User.objects.get(pk=self.user.pk).has_role('Detective'))
+    
+    def test_role_deactivation_is_immediate(self):
+        """Test that deactivating a role is visible to every holder."""
+        self.assertTrue(User.objects.get(pk=self.user.pk).has_role('Detective'))
+        self.detective.is_active = False
+        self.detective.save()
+        self.assertFalse(User.objects.get(pk=self.user.pk).has_role('Detective'))
+    
+    def test_read_before_commit_does_not_outlive_revocation(self):
+        """Test a role set cached by a concurrent read before commit is retired on commit."""
+        def concurrent_read():
+            # Another request, not seeing the uncommitted revocation yet
+            role_cache.get_role_names(self.user.pk, lambda: ['Detective'])
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                User.objects.get(pk=self.user.pk).remove_role(self.detective)
+                reader = threading.Thread(target=concurrent_read)
+                reader.start()
+                reader.join()
+        self.assertFalse(User.objects.get(pk=self.user.pk).has_role('Detective'))
+    
+    def test_rolled_back_change_is_not_cached(self):
+        """Test roles read inside a rolled-back transaction do not reach the cache."""
+        try:
+            with transaction.atomic():
+                user = User.objects.get(pk=self.user.pk)
+                user.remove_role(self.detective)
+                self.assertFalse(user.has_role('Detective'))
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertTrue(User.objects.get(pk=self.user.pk).has_role('Detective'))
@@ -1,7 +1,15 @@
 """
 Tests for accounts views (Authentication, User management).
 """
-from django.test import TestCase
+from importlib import import_module
+from io import StringIO
+from django.apps import apps
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -33,6 +41,28 @@ class UserRegistrationTest(TestCase):
         self.assertIn('token', response.data)
         self.assertIn('user', response.data)
     
+    def test_user_registration_writes_user_once(self):
+        """Test registration inserts the user with its password in a single write."""
+        data = {
+            'username': 'newuser',
+            'email': 'newuser@example.com',
+            'phone_number': '1234567890',
+            'national_id': '123456789',
+            'first_name': 'New',
+            'last_name': 'User',
+            'password': 'testpass123',
+            'password_confirm': 'testpass123'
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.register_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user_writes = [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT INTO "users"', 'UPDATE "users"'))
+        ]
+        self.assertEqual(len(user_writes), 1)
+        self.assertTrue(User.objects.get().check_password('testpass123'))
+    
     def test_user_registration_password_mismatch(self):
         """Test user registration with password mismatch."""
         data = {
@@ -47,6 +77,32 @@ class UserRegistrationTest(TestCase):
         }
         response = self.client.post(self.register_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def test_user_registration_normalizes_identifiers(self):
+        """Test identifiers are stored normalized and checked for uniqueness as such."""
+        data = {
+            'username': 'NewUser',
+            'email': 'NewUser@Example.com',
+            'phone_number': '0912 345-6789',
+            'national_id': '123 456 789',
+            'first_name': 'New',
+            'last_name': 'User',
+            'password': 'testpass123',
+            'password_confirm': 'testpass123'
+        }
+        response = self.client.post(self.register_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get()
+        self.assertEqual(
+            (user.username, user.email, user.phone_number, user.national_id),
+            ('newuser', 'newuser@example.com', '09123456789', '123456789')
+        )
+        
+        data.update(username='NEWUSER', phone_number='1', national_id='2')
+        response = self.client.post(self.register_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('username', response.data)
+        self.assertIn('email', response.data)
 
 
 class UserLoginTest(TestCase):
@@ -91,6 +147,29 @@ class UserLoginTest(TestCase):
         response = self.client.post(self.login_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
     
+    def test_login_with_formatted_identifiers(self):
+        """Test identifiers match whatever their case or formatting."""
+        for identifier in ['TestUser', ' Test@Example.COM ', '123-456-7890', '(123) 456 7890']:
+            data = {
+                'identifier': identifier,
+                'password': 'testpass123'
+            }
+            response = self.client.post(self.login_url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_200_OK, identifier)
+    
+    def test_login_lookup_compares_without_functions(self):
+        """Test the user lookup compares stored columns directly, keeping indexes usable."""
+        data = {
+            'identifier': 'Test@Example.com',
+            'password': 'testpass123'
+        }
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(self.login_url, data, format='json')
+        lookup = queries.captured_queries[0]['sql']
+        self.assertIn('"users"."email" = \'test@example.com\'', lookup)
+        self.assertNotIn('UPPER(', lookup)
+        self.assertNotIn('LIKE', lookup)
+    
     def test_login_invalid_credentials(self):
         """Test login with invalid credentials."""
         data = {
@@ -99,6 +178,95 @@ class UserLoginTest(TestCase):
         }
         response = self.client.post(self.login_url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    @override_settings(PASSWORD_HASHERS=[
+        'django.contrib.auth.hashers.MD5PasswordHasher',
+        'django.contrib.auth.hashers.UnsaltedMD5PasswordHasher',
+    ])
+    def test_login_upgrades_outdated_hash_after_response(self):
+        """Test an outdated password hash is replaced once the response is sent."""
+        User.objects.filter(pk=self.user.pk).update(
+            password=make_password('testpass123', hasher='unsalted_md5')
+        )
+        data = {
+            'identifier': 'testuser',
+            'password': 'testpass123'
+        }
+        response = self.client.post(self.login_url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        self.user.refresh_from_db()
+        self.assertEqual(identify_hasher(self.user.password).algorithm, 'md5')
+        self.assertTrue(self.user.check_password('testpass123'))
+        # The upgrade is not a password change: the issued token stays valid
+        self.assertTrue(Token.objects.filter(key=response.data['token']).exists())
+
+
+class NaturalKeyLoginTest(TestCase):
+    """Tests for logins resolved through ModelBackend (admin, createsuperuser)."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='Admin',
+            email='admin@example.com',
+            password='testpass123',
+            phone_number='1234567890',
+            national_id='123456789'
+        )
+    
+    def test_authenticate_ignores_username_case(self):
+        """Test the username is matched however it is typed."""
+        for username in ['admin', 'Admin', 'ADMIN ']:
+            self.assertEqual(authenticate(username=username, password='testpass123'), self.user, username)
+        self.assertIsNone(authenticate(username='admin', password='wrong'))
+
+
+class CreateSuperuserWithRoleCommandTest(TestCase):
+    """Tests for the create_superuser_with_role command."""
+    
+    def test_existing_username_in_another_case_is_reported(self):
+        """Test a username typed in another case is recognized as taken."""
+        User.objects.create_user(
+            username='admin', email='admin@example.com', password='testpass123',
+            phone_number='1234567890', national_id='123456789'
+        )
+        out = StringIO()
+        call_command(
+            'create_superuser_with_role', '--username', 'Admin', '--email', 'other@example.com',
+            '--password', 'testpass123', '--phone', '0987654321', '--national-id', '987654321',
+            stdout=out
+        )
+        self.assertIn('already exists', out.getvalue())
+        self.assertEqual(User.objects.count(), 1)
+
+
+class NormalizeIdentifiersMigrationTest(TestCase):
+    """Tests for the data migration normalizing stored identifiers."""
+    
+    def setUp(self):
+        self.migration = import_module('apps.accounts.migrations.0002_normalize_user_identifiers')
+        self.first = User.objects.create_user(
+            username='first', email='first@example.com', password='testpass123',
+            phone_number='1000000000', national_id='1000000000'
+        )
+        self.second = User.objects.create_user(
+            username='second', email='second@example.com', password='testpass123',
+            phone_number='2000000000', national_id='2000000000'
+        )
+    
+    def test_normalizes_stored_identifiers(self):
+        """Test legacy identifiers are rewritten in their normalized form."""
+        User.objects.filter(pk=self.first.pk).update(username='First', phone_number='100-000-0000')
+        self.migration.normalize_identifiers(apps, None)
+        self.first.refresh_from_db()
+        self.assertEqual((self.first.username, self.first.phone_number), ('first', '1000000000'))
+    
+    def test_collisions_fail_the_migration(self):
+        """Test users whose identifiers would collide are listed instead of skipped."""
+        User.objects.filter(pk=self.second.pk).update(username='FIRST')
+        with self.assertRaisesMessage(RuntimeError, f"username 'first': users [{self.first.pk}, {self.second.pk}]"):
+            self.migration.normalize_identifiers(apps, None)
+        self.assertEqual(User.objects.get(pk=self.second.pk).username, 'FIRST')
 
 
 class UserViewSetTest(TestCase):
@@ -122,3 +290,46 @@ class UserViewSetTest(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['username'], 'testuser')
 
+
+
+class UserListQueriesTest(TestCase):
+    """Tests that listing users does not query roles per user."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = User.objects.create_user(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123',
+            phone_number='1000000000',
+            national_id='1000000000'
+        )
+        self.admin.assign_role(Role.objects.create(name='System Administrator'))
+        self.client.force_authenticate(user=self.admin)
+        self.detective = Role.objects.create(name='Detective')
+    
+    def _create_users(self, start, count):
+        for i in range(start, start + count):
+            user = User.objects.create_user(
+                username=f'user{i}',
+                email=f'user{i}@example.com',
+                password='testpass123',
+                phone_number=f'20000000{i:02d}',
+                national_id=f'20000000{i:02d}'
+            )
+            user.assign_role(self.detective)
+    
+    def test_user_list_query_count_is_constant(self):
+        """Test the admin user list runs the same queries for 2 or 12 users."""
+        self._create_users(0, 2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/api/auth/users/')
+        self._create_users(2, 10)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/auth/users/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 13)
+        self.assertEqual(len(large), len(small))
+        roles = {user['username']: [role['name'] for role in user['roles']] for user in response.data['results']}
+        self.assertEqual(roles['user5'], ['Detective'])
+        self.assertEqual(roles['admin'], ['System Administrator'])
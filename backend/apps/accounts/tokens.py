@@ -0,0 +1,113 @@
+"""
+API token lifecycle: issue, expiry, revocation and the shared lookup cache.
+
+Tokens are DRF authtoken rows (one per user) that expire AUTH_TOKEN_TTL
+seconds after they were issued; logging in with an expired token issues a
+new one. CachedTokenAuthentication keeps the resolved user of each token in
+the shared cache for AUTH_TOKEN_CACHE_TIMEOUT seconds, so most requests
+authenticate without the authtoken_token/users join.
+
+Cache entries are keyed by a hash of the token, plus a per-user pointer so
+a user's entry can be evicted without a query. apps.accounts.signals evicts
+it whenever the user or token changes and revokes (deletes) tokens when a
+user is deactivated or changes password.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+
+def _token_key(key):
+    return f'accounts:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _user_token_key(user_id):
+    return f'accounts:token:user:{user_id}'
+
+
+def is_expired(created):
+    """
+    Check whether a token issued at `created` has expired.
+    
+    Returns:
+        bool: True once AUTH_TOKEN_TTL seconds have passed (never if 0)
+    """
+    ttl = settings.AUTH_TOKEN_TTL
+    return bool(ttl) and created < timezone.now() - timedelta(seconds=ttl)
+
+
+def issue_token(user):
+    """
+    Get the user's token, replacing it first if it has expired.
+    
+    Args:
+        user: User logging in or registering
+        
+    Returns:
+        Token: A valid token
+    """
+    token = Token.objects.filter(user=user).first()
+    if token is not None and is_expired(token.created):
+        token.delete()
+        token = None
+    if token is None:
+        token = Token.objects.create(user=user)
+    return token
+
+
+def rotate_token(user):
+    """
+    Revoke the user's token and issue a fresh one.
+    
+    Returns:
+        Token: The new token
+    """
+    revoke_user_tokens(user.pk)
+    return Token.objects.create(user=user)
+
+
+def revoke_user_tokens(user_id):
+    """Delete the user's token; its cache entry is evicted by signal."""
+    for token in Token.objects.filter(user_id=user_id):
+        token.delete()
+
+
+def get_cached_token(key):
+    """
+    Get the cached (user, created) of a token.
+    
+    Returns:
+        tuple or None: (User, issue datetime) on a cache hit
+    """
+    return cache.get(_token_key(key))
+
+
+def cache_token(token):
+    """Cache the resolved user of a token loaded with its user."""
+    timeout = settings.AUTH_TOKEN_CACHE_TIMEOUT
+    if not timeout:
+        return
+    user = token.user
+    # Role names must keep coming from the versioned role cache, which
+    # revocations invalidate, not from a memo frozen into this entry
+    user.__dict__.pop('_role_names_cache', None)
+    cache.set_many({
+        _token_key(token.key): (user, token.created),
+        _user_token_key(user.pk): token.key,
+    }, timeout=timeout)
+
+
+def evict_token(key):
+    """Drop the cache entry of one token."""
+    cache.delete(_token_key(key))
+
+
+def evict_user_token(user_id):
+    """Drop the cache entry of whatever token the user last authenticated with."""
+    key = cache.get(_user_token_key(user_id))
+    if key is not None:
+        cache.delete_many([_token_key(key), _user_token_key(user_id)])
@@ -1,16 +1,21 @@
 """
 Views for accounts app (Authentication, User, Role management).
 """
+import codecs
+from itertools import islice
+from django.conf import settings
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.authtoken.models import Token
 from core.permissions import IsSystemAdministrator
-from .models import User, Role, RoleAssignment
+from .models import User, Role, RoleAssignment, active_roles_prefetch
+from . import bulk_import, bulk_roles, tokens
 from .serializers import (
     UserSerializer, UserRegistrationSerializer, UserLoginSerializer,
-    UserDetailSerializer, RoleSerializer, RoleAssignmentSerializer
+    UserDetailSerializer, RoleSerializer, RoleAssignmentSerializer,
+    BulkRoleAssignmentSerializer, BulkRoleRemovalSerializer
 )
 
 
@@ -27,10 +32,14 @@ class UserViewSet(viewsets.ModelViewSet):
             return UserDetailSerializer
         return UserSerializer
     
+    def get_queryset(self):
+        """Load active roles with the users so listing them stays at a fixed query count."""
+        return User.objects.prefetch_related(active_roles_prefetch())
+    
     def get_permissions(self):
         if self.action in ['register', 'login', 'create']:
             return [AllowAny()]  # Registration and login are public
-        elif self.action in ['me', 'update', 'partial_update']:
+        elif self.action in ['me', 'update', 'partial_update', 'logout', 'rotate_token']:
             return [IsAuthenticated()]  # Users can update themselves
         else:
             return [IsSystemAdministrator()]  # Only admin can list/delete
@@ -53,7 +62,7 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = UserRegistrationSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.save()
-            token, created = Token.objects.get_or_create(user=user)
+            token = tokens.issue_token(user)
             return Response({
                 'user': UserDetailSerializer(user).data,
                 'token': token.key
@@ -66,13 +75,64 @@ class UserViewSet(viewsets.ModelViewSet):
         serializer = UserLoginSerializer(data=request.data)
         if serializer.is_valid():
             user = serializer.validated_data['user']
-            token, created = Token.objects.get_or_create(user=user)
+            token = tokens.issue_token(user)
             return Response({
                 'user': UserDetailSerializer(user).data,
                 'token': token.key
             }, status=status.HTTP_200_OK)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def logout(self, request):
+        """Revoke the token the request was made with."""
+        if request.auth is not None:
+            request.auth.delete()
+        return Response({'message': 'Logged out successfully'}, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    def rotate_token(self, request):
+        """Replace the current token with a fresh one."""
+        token = tokens.rotate_token(request.user)
+        return Response({'token': token.key}, status=status.HTTP_200_OK)
+    
+    @action(
+        detail=False, methods=['post'], url_path='import',
+        permission_classes=[IsSystemAdministrator], parser_classes=[MultiPartParser]
+    )
+    def import_users(self, request):
+        """
+        Import users from an uploaded CSV or NDJSON `file` (see
+        apps.accounts.bulk_import); `format` overrides the file extension.
+        
+        Files over USER_IMPORT_API_MAX_ROWS rows, or not UTF-8 encoded, are
+        rejected before anything is imported.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        fmt = request.data.get('format') or bulk_import.detect_format(upload.name)
+        if fmt not in bulk_import.FORMATS:
+            return Response(
+                {'error': f'format must be one of: {", ".join(bulk_import.FORMATS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        max_rows = settings.USER_IMPORT_API_MAX_ROWS
+        lines = codecs.iterdecode(upload, 'utf-8-sig')
+        try:
+            rows = list(islice(bulk_import.read_rows(lines, fmt), max_rows + 1))
+        except UnicodeDecodeError:
+            return Response({'error': 'file must be UTF-8 encoded'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) > max_rows:
+            return Response(
+                {'error': f'file has more than {max_rows} rows; use the import_users command'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Hashed in this worker: a process pool has no place in a web request
+        report = bulk_import.import_users(rows, assigned_by=request.user, workers=1)
+        return Response(report, status=status.HTTP_200_OK)
+    
     @action(detail=True, methods=['post'], permission_classes=[IsSystemAdministrator])
     def assign_role(self, request, pk=None):
         """Assign a role to a user."""
@@ -102,6 +162,26 @@ class UserViewSet(viewsets.ModelViewSet):
             return Response({'message': 'Role removed successfully'}, status=status.HTTP_200_OK)
         except Role.DoesNotExist:
             return Response({'error': 'Role not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsSystemAdministrator])
+    def bulk_assign_roles(self, request):
+        """Assign many roles at once: {"assignments": [{"user_id", "role_id"}, ...]}."""
+        serializer = BulkRoleAssignmentSerializer(data=request.data)
+        if serializer.is_valid():
+            assigned = bulk_roles.assign_roles(
+                serializer.validated_data['assignments'], assigned_by=request.user
+            )
+            return Response({'assigned': assigned}, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsSystemAdministrator])
+    def bulk_remove_roles(self, request):
+        """Remove many roles at once: {"assignments": [{"user_id", "role_id"}, ...]}."""
+        serializer = BulkRoleRemovalSerializer(data=request.data)
+        if serializer.is_valid():
+            removed = bulk_roles.remove_roles(serializer.validated_data['assignments'])
+            return Response({'removed': removed}, status=status.HTTP_200_OK)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
 class RoleViewSet(viewsets.ModelViewSet):
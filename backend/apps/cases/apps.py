@@ -5,4 +5,6 @@ class CasesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.cases'
     verbose_name = 'Cases'
-
+    
+    def ready(self):
+        import apps.cases.signals
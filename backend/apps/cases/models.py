@@ -86,11 +86,55 @@ class Case(models.Model):
             models.Index(fields=['status', 'severity']),
             models.Index(fields=['created_date']),
             models.Index(fields=['assigned_detective']),
+            # Serves the "every non-pending case" visibility branch of list views
+            models.Index(
+                fields=['-created_date', '-id'],
+                condition=~models.Q(status='Pending'),
+                name='cases_visible_idx'
+            ),
         ]
     
     def __str__(self):
         return f'{self.title} ({self.status})'
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded assignees so saves can tell whether they changed."""
+        instance = super().from_db(db, field_names, values)
+        instance.remember_assignees()
+        return instance
+    
+    def remember_assignees(self):
+        """
+        Snapshot the assigned detective and sergeant (see get_new_assignee_ids).
+        
+        Assignees deferred at load time are left out of the snapshot.
+        """
+        loaded = self.__dict__
+        if 'assigned_detective_id' in loaded and 'assigned_sergeant_id' in loaded:
+            self._loaded_assignees = (loaded['assigned_detective_id'], loaded['assigned_sergeant_id'])
+    
+    def get_new_assignee_ids(self):
+        """
+        Get users assigned since the case was loaded or last saved.
+        
+        Falls back to the stored row when no snapshot was taken (e.g. the
+        instance was built by hand or loaded with deferred assignees).
+        
+        Returns:
+            list: IDs of the newly assigned detective and/or sergeant
+        """
+        previous = self.__dict__.get('_loaded_assignees')
+        if previous is None:
+            if self._state.adding:
+                previous = (None, None)
+            else:
+                previous = Case.objects.filter(pk=self.pk).values_list(
+                    'assigned_detective_id', 'assigned_sergeant_id'
+                ).first() or (None, None)
+        current = (self.assigned_detective_id, self.assigned_sergeant_id)
+        return [user_id for user_id, before in zip(current, previous) if user_id and user_id != before]
+    
     def is_critical(self):
         """Check if case is critical severity."""
         return self.severity == 'Critical'
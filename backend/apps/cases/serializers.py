@@ -110,10 +110,16 @@ class CaseDetailSerializer(CaseSerializer):
         fields = CaseSerializer.Meta.fields + ['evidence_count', 'suspects_count']
     
     def get_evidence_count(self, obj):
-        """Get count of evidence items."""
-        return obj.evidence_items.count()
+        """Get count of evidence items (annotated by CaseViewSet when available)."""
+        count = getattr(obj, 'evidence_count', None)
+        if count is None:
+            count = obj.evidence_items.count()
+        return count
     
     def get_suspects_count(self, obj):
-        """Get count of suspects."""
-        return obj.suspects.count()
+        """Get count of suspects (annotated by CaseViewSet when available)."""
+        count = getattr(obj, 'suspects_count', None)
+        if count is None:
+            count = obj.suspects.count()
+        return count
 
@@ -0,0 +1,24 @@
+"""
+Signals invalidating cached case statistics.
+"""
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from apps.accounts.models import User, RoleAssignment
+from apps.cases.models import Case
+from apps.cases.stats import invalidate_case_stats
+
+
+@receiver(post_save, sender=Case)
+@receiver(post_delete, sender=Case)
+@receiver(post_save, sender=RoleAssignment)
+@receiver(post_delete, sender=RoleAssignment)
+def invalidate_stats_on_change(sender, instance, **kwargs):
+    """Case totals and police staff counts depend on these rows."""
+    invalidate_case_stats()
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_stats_on_role_m2m_change(sender, action, **kwargs):
+    """Roles added through User.roles bypass RoleAssignment signals."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_case_stats()
@@ -0,0 +1,87 @@
+"""
+Home-page case statistics with a short-lived cached snapshot.
+
+The snapshot is rebuilt at most once per CASE_STATS_CACHE_TIMEOUT seconds
+and dropped by apps.cases.signals whenever a case or a role assignment
+changes, so anonymous home-page traffic is served from the cache.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q
+from apps.accounts.models import User, RoleAssignment
+from apps.cases.models import Case
+
+STATS_CACHE_KEY = 'cases:stats'
+
+POLICE_ROLES = [
+    'Police Chief', 'Captain', 'Sergeant', 'Detective',
+    'Police Officer', 'Patrol Officer', 'Intern (Cadet)'
+]
+
+
+def compute_case_stats():
+    """
+    Compute the home-page numbers from the database.
+    
+    Returns:
+        dict: Totals plus per-status and per-severity breakdowns
+    """
+    status_counts = {
+        f'status_{i}': Count('id', filter=Q(status=value))
+        for i, (value, _) in enumerate(Case.STATUS_CHOICES)
+    }
+    severity_counts = {
+        f'severity_{i}': Count('id', filter=Q(severity=value))
+        for i, (value, _) in enumerate(Case.SEVERITY_CHOICES)
+    }
+    totals = Case.objects.aggregate(
+        total_cases=Count('id'),
+        solved_cases=Count('id', filter=Q(status='Resolved')),
+        **status_counts,
+        **severity_counts
+    )
+    
+    total_police_staff = User.objects.filter(
+        Exists(RoleAssignment.objects.filter(user=OuterRef('pk'), role__name__in=POLICE_ROLES))
+    ).count()
+    
+    return {
+        'total_cases': totals['total_cases'],
+        'solved_cases': totals['solved_cases'],
+        'total_police_staff': total_police_staff,
+        'by_status': {
+            value: totals[f'status_{i}'] for i, (value, _) in enumerate(Case.STATUS_CHOICES)
+        },
+        'by_severity': {
+            value: totals[f'severity_{i}'] for i, (value, _) in enumerate(Case.SEVERITY_CHOICES)
+        },
+    }
+
+
+def get_case_stats(breakdown=False):
+    """
+    Get the home-page numbers, served from the cached snapshot when fresh.
+    
+    Args:
+        breakdown: Include per-status and per-severity counts
+        
+    Returns:
+        dict: Case statistics
+    """
+    stats = cache.get(STATS_CACHE_KEY)
+    if stats is None:
+        stats = compute_case_stats()
+        cache.set(STATS_CACHE_KEY, stats, timeout=settings.CASE_STATS_CACHE_TIMEOUT)
+    
+    if breakdown:
+        return stats
+    return {
+        'total_cases': stats['total_cases'],
+        'solved_cases': stats['solved_cases'],
+        'total_police_staff': stats['total_police_staff'],
+    }
+
+
+def invalidate_case_stats():
+    """Drop the cached snapshot so the next request recomputes it."""
+    cache.delete(STATS_CACHE_KEY)
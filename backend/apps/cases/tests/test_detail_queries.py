@@ -0,0 +1,62 @@
+"""
+Tests that case detail responses cost a fixed number of queries.
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.accounts.models import User, Role
+from apps.cases.models import Case, CaseComplainant, CaseWitness
+from apps.evidence.models import Evidence
+
+
+def make_user(username, role):
+    user = User.objects.create_user(
+        username=username, email=f'{username}@test.com', password='password',
+        phone_number=f'09{username:0>8}', national_id=f'{username:0>10}'
+    )
+    user.assign_role(role)
+    return user
+
+
+class CaseDetailQueryTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.role = Role.objects.create(name='Police Chief')
+        self.chief = make_user('chief', self.role)
+        self.client.force_authenticate(user=self.chief)
+        self.case = Case.objects.create(
+            title='Case', description='-', severity='Level 2', status='Open',
+            created_by=self.chief, assigned_detective=self.chief
+        )
+        Evidence.objects.create(
+            title='Note', description='-', evidence_type='other', case=self.case, recorded_by=self.chief
+        )
+        self._add_people(1)
+
+    def _add_people(self, count):
+        start = CaseComplainant.objects.count()
+        for i in range(start, start + count):
+            CaseComplainant.objects.create(case=self.case, complainant=make_user(f'c{i}', self.role))
+            CaseWitness.objects.create(case=self.case, witness=make_user(f'w{i}', self.role))
+
+    def _retrieve(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/cases/{self.case.id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(queries)
+
+    def test_counts_are_annotated(self):
+        response, _ = self._retrieve()
+        self.assertEqual(response.data['evidence_count'], 1)
+        self.assertEqual(response.data['suspects_count'], 0)
+        self.assertEqual(response.data['complainants'][0]['complainant']['roles'][0]['name'], 'Police Chief')
+
+    def test_query_count_is_independent_of_people(self):
+        _, baseline = self._retrieve()
+        self._add_people(4)
+        response, grown = self._retrieve()
+        self.assertEqual(len(response.data['complainants']), 5)
+        self.assertEqual(len(response.data['witnesses']), 5)
+        self.assertEqual(grown, baseline)
@@ -0,0 +1,61 @@
+"""
+Tests for the cached home-page case statistics.
+"""
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.accounts.models import User, Role
+from apps.cases.models import Case
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class CaseStatsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.officer = User.objects.create_user(
+            username='test_officer', email='officer@test.com', password='password',
+            phone_number='1234567890', national_id='1234567890'
+        )
+        Role.objects.create(name='Police Officer')
+        self.officer.assign_role('Police Officer')
+        Case.objects.create(
+            title='Open Case', description='-', severity='Level 2',
+            status='Open', created_by=self.officer
+        )
+        Case.objects.create(
+            title='Solved Case', description='-', severity='Critical',
+            status='Resolved', created_by=self.officer
+        )
+
+    def test_stats_numbers(self):
+        response = self.client.get('/api/cases/stats/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {
+            'total_cases': 2,
+            'solved_cases': 1,
+            'total_police_staff': 1,
+        })
+
+    def test_breakdown(self):
+        response = self.client.get('/api/cases/stats/', {'breakdown': 'true'})
+        self.assertEqual(response.data['by_status']['Resolved'], 1)
+        self.assertEqual(response.data['by_status']['Pending'], 0)
+        self.assertEqual(response.data['by_severity']['Critical'], 1)
+
+    def test_anonymous_requests_are_served_from_cache(self):
+        self.client.get('/api/cases/stats/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/cases/stats/')
+        self.assertEqual(response.data['total_cases'], 2)
+
+    def test_case_write_invalidates_snapshot(self):
+        self.client.get('/api/cases/stats/')
+        Case.objects.create(
+            title='New Case', description='-', severity='Level 3', created_by=self.officer
+        )
+        response = self.client.get('/api/cases/stats/')
+        self.assertEqual(response.data['total_cases'], 3)
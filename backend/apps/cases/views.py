@@ -11,6 +11,8 @@ from core.permissions import (
     IsDetective, IsSergeant, IsCaptain, IsDetectiveOrSergeant,
     IsPoliceOfficerOrPatrolOfficerOrChief
 )
+from core.pagination import OptionalCursorPagination
+from core.visibility import visible_to
 from .models import Case, CaseComplainant, CaseWitness
 from .serializers import (
     CaseSerializer, CaseListSerializer, CaseDetailSerializer,
@@ -24,6 +26,7 @@ class CaseViewSet(viewsets.ModelViewSet):
     """
     queryset = Case.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalCursorPagination
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -35,15 +38,12 @@ class CaseViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter cases based on user role and permissions."""
         user = self.request.user
-
-        # Interns (Cadets) cannot see any cases unless they hold another valid role
-        police_roles = ['Police Officer', 'Patrol Officer', 'Detective', 'Sergeant', 'Captain', 'Police Chief', 'System Administrator']
-        if user.is_authenticated and user.has_role('Intern (Cadet)') and not any(user.has_role(role) for role in police_roles):
-            return Case.objects.none()
-
+        
         queryset = Case.objects.select_related(
             'created_by', 'assigned_detective', 'assigned_sergeant'
-        ).prefetch_related('complainants', 'witnesses')
+        )
+        if self.action == 'retrieve':
+            queryset = self._with_detail_relations(queryset)
         
         # Filter by status
         status_filter = self.request.query_params.get('status', None)
@@ -55,25 +55,57 @@ class CaseViewSet(viewsets.ModelViewSet):
         if severity_filter:
             queryset = queryset.filter(severity=severity_filter)
         
-        # Role-based visibility logic
-        if user.is_authenticated and (user.is_staff or user.has_role('System Administrator') or user.has_role('Police Chief')):
-            pass # Admins and Chiefs can see all cases (including Pending)
-        elif user.is_authenticated:
-            from django.db.models import Q
-            
-            # Base visibility: Everyone can see cases they created AND all non-pending cases
-            visible_q = Q(created_by=user) | ~Q(status='Pending')
-            
-            # Role-specific visibility (in case a pending case is assigned to them but not created by them)
-            if user.has_role('Detective'):
-                visible_q |= Q(assigned_detective=user, status='Pending')
-            if user.has_role('Sergeant'):
-                visible_q |= Q(assigned_sergeant=user, status='Pending')
-                
-            queryset = queryset.filter(visible_q).distinct()
+        # Role-based visibility (see apps.cases.visibility)
+        queryset = visible_to(queryset, user)
         
         return queryset
     
+    def _with_detail_relations(self, queryset):
+        """
+        Load everything CaseDetailSerializer renders up front: evidence and
+        suspect counts as subqueries, plus complainants, witnesses and the
+        active roles of every nested user, in a fixed number of queries.
+        """
+        from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+        from django.db.models.functions import Coalesce
+        from apps.accounts.models import active_roles_prefetch
+        from apps.evidence.models import Evidence
+        from apps.investigations.models import Suspect
+        
+        def count_subquery(model):
+            return Coalesce(
+                Subquery(
+                    model.objects.filter(case=OuterRef('pk'))
+                    .order_by()
+                    .values('case')
+                    .annotate(count=Count('id'))
+                    .values('count'),
+                    output_field=IntegerField()
+                ),
+                0
+            )
+        
+        return queryset.annotate(
+            evidence_count=count_subquery(Evidence),
+            suspects_count=count_subquery(Suspect),
+        ).prefetch_related(
+            Prefetch(
+                'case_complainants',
+                queryset=CaseComplainant.objects.select_related('complainant').prefetch_related(
+                    active_roles_prefetch('complainant__')
+                )
+            ),
+            Prefetch(
+                'case_witnesses',
+                queryset=CaseWitness.objects.select_related('witness').prefetch_related(
+                    active_roles_prefetch('witness__')
+                )
+            ),
+            active_roles_prefetch('created_by__'),
+            active_roles_prefetch('assigned_detective__'),
+            active_roles_prefetch('assigned_sergeant__'),
+        )
+    
     def get_permissions(self):
         """Set permissions based on action."""
         
@@ -255,27 +287,20 @@ class CaseViewSet(viewsets.ModelViewSet):
     from rest_framework.permissions import AllowAny
     @action(detail=False, methods=['get'], permission_classes=[AllowAny])
     def stats(self, request):
-        """Get case statistics for home page."""
-        from apps.accounts.models import User
-        from django.db.models import Count, Q
-        
-        total_cases = Case.objects.count()
-        solved_cases = Case.objects.filter(status='Resolved').count()
+        """
+        Get case statistics for home page.
         
-        # Count users with police-related roles
-        police_roles = [
-            'Police Chief', 'Captain', 'Sergeant', 'Detective',
-            'Police Officer', 'Patrol Officer', 'Intern (Cadet)'
-        ]
-        total_police_staff = User.objects.filter(
-            roles__name__in=police_roles
-        ).distinct().count()
+        Served from a short-lived cached snapshot; pass `breakdown=true` to
+        include counts per status and severity.
+        """
+        from django.conf import settings
+        from django.utils.cache import patch_cache_control
+        from .stats import get_case_stats
         
-        return Response({
-            'total_cases': total_cases,
-            'solved_cases': solved_cases,
-            'total_police_staff': total_police_staff,
-        })
+        breakdown = request.query_params.get('breakdown', '').lower() == 'true'
+        response = Response(get_case_stats(breakdown=breakdown))
+        patch_cache_control(response, public=True, max_age=settings.CASE_STATS_CACHE_TIMEOUT)
+        return response
     
     @action(detail=True, methods=['post'], permission_classes=[IsDetectiveOrSergeant])
     def update_status(self, request, pk=None):
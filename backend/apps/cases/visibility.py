@@ -0,0 +1,36 @@
+"""
+Visibility policy for cases.
+"""
+from django.db.models import Q
+from core import visibility
+from .models import Case
+
+# Roles that let an Intern (Cadet) see cases after all
+POLICE_ROLES = [
+    'Police Officer', 'Patrol Officer', 'Detective', 'Sergeant',
+    'Captain', 'Police Chief', 'System Administrator'
+]
+
+
+@visibility.register(Case)
+class CaseVisibility(visibility.VisibilityPolicy):
+    """Cases are public, except Pending ones awaiting the Chief's approval."""
+    # Case lists and details are open to anonymous visitors
+    anonymous_sees_all = True
+    # Admins and Chiefs can see all cases (including Pending)
+    staff_sees_all = True
+    unrestricted_roles = ['System Administrator', 'Police Chief']
+    # Everyone can see cases they created and all non-pending cases
+    base_rules = [
+        lambda user: Q(created_by=user),
+        ~Q(status='Pending'),
+    ]
+    # A pending case may also be assigned to them without being created by them
+    role_rules = {
+        'Detective': [lambda user: Q(assigned_detective=user, status='Pending')],
+        'Sergeant': [lambda user: Q(assigned_sergeant=user, status='Pending')],
+    }
+    
+    def denies(self, user, role_names):
+        # Interns (Cadets) cannot see any cases unless they hold another valid role
+        return 'Intern (Cadet)' in role_names and role_names.isdisjoint(POLICE_ROLES)
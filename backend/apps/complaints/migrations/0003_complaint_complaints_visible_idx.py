@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-17 04:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0005_case_cases_visible_idx'),
+        ('complaints', '0002_alter_complaint_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='complaint',
+            index=models.Index(condition=models.Q(('status', 'Pending'), _negated=True), fields=['-created_date', '-id'], name='complaints_visible_idx'),
+        ),
+    ]
@@ -69,6 +69,12 @@ class Complaint(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['submitted_by']),
             models.Index(fields=['created_date']),
+            # Serves the "every non-pending complaint" visibility branch of list views
+            models.Index(
+                fields=['-created_date', '-id'],
+                condition=~models.Q(status='Pending'),
+                name='complaints_visible_idx'
+            ),
         ]
     
     def __str__(self):
@@ -6,14 +6,18 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
+from django.db.models import Prefetch
 from core.permissions import IsIntern, IsPoliceOfficer
 from core.exceptions import WorkflowError
+from core.pagination import OptionalCursorPagination
+from core.visibility import visible_to
 from .models import Complaint, ComplaintReview
 from .serializers import (
     ComplaintSerializer, ComplaintCreateSerializer,
     ComplaintListSerializer, ComplaintReviewSerializer
 )
 from apps.cases.models import Case
+from apps.accounts.models import active_roles_prefetch
 
 
 class ComplaintViewSet(viewsets.ModelViewSet):
@@ -22,6 +26,7 @@ class ComplaintViewSet(viewsets.ModelViewSet):
     """
     queryset = Complaint.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalCursorPagination
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -34,23 +39,20 @@ class ComplaintViewSet(viewsets.ModelViewSet):
         """Filter complaints based on user role."""
         queryset = Complaint.objects.select_related(
             'submitted_by', 'reviewed_by_intern', 'reviewed_by_officer', 'case'
-        ).prefetch_related('reviews')
+        )
+        if self.action != 'list':
+            queryset = queryset.prefetch_related(
+                Prefetch('reviews', queryset=ComplaintReview.objects.select_related('reviewer')),
+                active_roles_prefetch('submitted_by__'),
+                active_roles_prefetch('reviewed_by_intern__'),
+                active_roles_prefetch('reviewed_by_officer__'),
+                active_roles_prefetch('reviews__reviewer__')
+            )
         
         user = self.request.user
         
-        # Role-based filtering
-        from django.db.models import Q
-        visible_q = Q(submitted_by=user) # Everyone can see their own complaints
-        if user.is_authenticated:
-            if user.has_role('Intern (Cadet)') or user.is_staff:
-                # Interns and staff can see all complaints
-                visible_q = Q() # No filter, select all
-            elif user.has_role('Police Officer'):
-                # Police Officers see their own + all EXCEPT 'Pending'
-                visible_q |= ~Q(status='Pending')
-        
-        if visible_q:
-            queryset = queryset.filter(visible_q).distinct()
+        # Role-based visibility (see apps.complaints.visibility)
+        queryset = visible_to(queryset, user)
         
         # Apply status filter from query params if present
         status_param = self.request.query_params.get('status')
@@ -0,0 +1,20 @@
+"""
+Visibility policy for complaints.
+"""
+from django.db.models import Q
+from core import visibility
+from .models import Complaint
+
+
+@visibility.register(Complaint)
+class ComplaintVisibility(visibility.VisibilityPolicy):
+    """Complaints are private to their submitter until an intern forwards them."""
+    # Interns and staff can see all complaints
+    staff_sees_all = True
+    unrestricted_roles = ['Intern (Cadet)']
+    # Everyone can see their own complaints
+    base_rules = [lambda user: Q(submitted_by=user)]
+    # Police Officers also see every complaint past 'Pending'
+    role_rules = {
+        'Police Officer': [~Q(status='Pending')],
+    }
@@ -6,12 +6,14 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from core.permissions import IsDetective, IsSergeant
+from core.visibility import visible_to
 from .models import DetectiveBoard, BoardEvidenceConnection
 from .serializers import (
     DetectiveBoardSerializer, DetectiveBoardDetailSerializer,
     BoardEvidenceConnectionSerializer
 )
 from apps.cases.models import Case
+from apps.accounts.models import active_roles_prefetch
 
 
 class DetectiveBoardViewSet(viewsets.ModelViewSet):
@@ -28,11 +30,15 @@ class DetectiveBoardViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter boards by detective."""
-        queryset = DetectiveBoard.objects.select_related('case', 'detective', 'last_modified_by')
+        queryset = DetectiveBoard.objects.select_related(
+            'case', 'detective', 'last_modified_by'
+        ).prefetch_related(
+            active_roles_prefetch('detective__'),
+            active_roles_prefetch('last_modified_by__')
+        )
         
-        # Detectives can only see their own boards
-        if self.request.user.has_role('Detective'):
-            queryset = queryset.filter(detective=self.request.user)
+        # Role-based visibility (see apps.detective_board.visibility)
+        queryset = visible_to(queryset, self.request.user)
         
         # Filter by case
         case_id = self.request.query_params.get('case', None)
@@ -0,0 +1,17 @@
+"""
+Visibility policy for detective boards.
+"""
+from django.db.models import Q
+from core import visibility
+from .models import DetectiveBoard
+
+
+@visibility.register(DetectiveBoard)
+class DetectiveBoardVisibility(visibility.VisibilityPolicy):
+    """Boards are private to their detective; supervisors review all of them."""
+    staff_sees_all = True
+    unrestricted_roles = ['System Administrator', 'Police Chief', 'Captain', 'Sergeant']
+    # Detectives can only see their own boards
+    role_rules = {
+        'Detective': [lambda user: Q(detective=user)],
+    }
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-17 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0004_casewitness_witness_name'),
+        ('evidence', '0002_evidence_is_valid'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evidence',
+            index=models.Index(fields=['created_date'], name='evidence_created_62104d_idx'),
+        ),
+    ]
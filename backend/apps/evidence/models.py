@@ -99,6 +99,7 @@ class Evidence(models.Model):
         indexes = [
             models.Index(fields=['evidence_type']),
             models.Index(fields=['case', 'evidence_type']),
+            models.Index(fields=['created_date']),
         ]
     
     def __str__(self):
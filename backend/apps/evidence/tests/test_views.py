@@ -0,0 +1,122 @@
+"""
+Tests for evidence API endpoints.
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.evidence.models import Evidence
+from apps.accounts.models import User
+from apps.cases.models import Case
+
+
+class EvidenceByTypeTest(TestCase):
+    """Tests for GET /api/evidence/by_type/."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            phone_number='1234567890',
+            national_id='123456789'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.case = Case.objects.create(
+            title='Test Case', description='-', severity='Level 2', created_by=self.user
+        )
+        self.other_case = Case.objects.create(
+            title='Other Case', description='-', severity='Level 2', created_by=self.user
+        )
+        for case in (self.case, self.other_case):
+            Evidence.objects.create(
+                title='Statement', description='-', evidence_type='witness_statement',
+                case=case, recorded_by=self.user, transcript='...'
+            )
+        Evidence.objects.create(
+            title='Blood', description='-', evidence_type='biological', case=self.case,
+            recorded_by=self.user, image1='evidence/biological/images/a.png',
+            verified_by_forensic_doctor=self.user, verification_date=timezone.now()
+        )
+        Evidence.objects.create(
+            title='Hair', description='-', evidence_type='biological', case=self.case,
+            recorded_by=self.user, image1='evidence/biological/images/b.png'
+        )
+        # Examined but not dated yet: not verified, as in Evidence.is_verified()
+        Evidence.objects.create(
+            title='Saliva', description='-', evidence_type='biological', case=self.case,
+            recorded_by=self.user, image1='evidence/biological/images/c.png',
+            verified_by_forensic_doctor=self.user
+        )
+    
+    def test_counts_per_type_and_verification_state(self):
+        """Test counts come back per type with verification breakdown."""
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/evidence/by_type/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['witness_statement']['count'], 2)
+        self.assertEqual(response.data['vehicle']['count'], 0)
+        self.assertEqual(response.data['biological']['display_name'], 'Biological/Medical')
+        self.assertEqual(
+            response.data['biological']['verification'],
+            {'verified': 1, 'pending': 2, 'not_applicable': 0}
+        )
+    
+    def test_case_filter_and_per_case_breakdown(self):
+        """Test ?case= filtering and the optional per-case breakdown."""
+        response = self.client.get('/api/evidence/by_type/', {'case': self.other_case.id})
+        self.assertEqual(response.data['witness_statement']['count'], 1)
+        self.assertEqual(response.data['biological']['count'], 0)
+        
+        response = self.client.get('/api/evidence/by_type/', {'by_case': 'true'})
+        self.assertEqual(
+            response.data['witness_statement']['cases'],
+            {str(self.case.id): 1, str(self.other_case.id): 1}
+        )
+
+
+class EvidenceDetailedListTest(TestCase):
+    """Tests for GET /api/evidence/?detailed=true."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.viewer = User.objects.create_user(
+            username='viewer',
+            email='viewer@example.com',
+            password='testpass123',
+            phone_number='1234567890',
+            national_id='123456789'
+        )
+        self.client.force_authenticate(user=self.viewer)
+        self.case = Case.objects.create(
+            title='Test Case', description='-', severity='Level 2', created_by=self.viewer
+        )
+    
+    def _record_evidence(self, start, count):
+        for i in range(start, start + count):
+            officer = User.objects.create_user(
+                username=f'officer{i}',
+                email=f'officer{i}@example.com',
+                password='testpass123',
+                phone_number=f'30000000{i:02d}',
+                national_id=f'30000000{i:02d}'
+            )
+            Evidence.objects.create(
+                title=f'Item {i}', description='-', evidence_type='other',
+                case=self.case, recorded_by=officer
+            )
+    
+    def test_nested_user_roles_are_prefetched(self):
+        """Test recorded_by roles do not cost a query per evidence item."""
+        self._record_evidence(0, 2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get('/api/evidence/', {'detailed': 'true'})
+        self._record_evidence(2, 8)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get('/api/evidence/', {'detailed': 'true'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 10)
+        self.assertEqual(len(large), len(small))
@@ -7,10 +7,13 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from core.permissions import IsForensicDoctor
+from core.pagination import OptionalCursorPagination
+from core.outbox import enqueue
 from .models import Evidence
 from .serializers import (
     EvidenceSerializer, EvidenceListSerializer, EvidenceVerificationSerializer
 )
+from apps.accounts.models import active_roles_prefetch
 
 
 class EvidenceViewSet(viewsets.ModelViewSet):
@@ -19,6 +22,7 @@ class EvidenceViewSet(viewsets.ModelViewSet):
     """
     queryset = Evidence.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalCursorPagination
     
     def get_serializer_class(self):
         if self.action == 'list':
@@ -32,8 +36,14 @@ class EvidenceViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter evidence based on case and type."""
         queryset = Evidence.objects.select_related(
-            'case', 'recorded_by', 'verified_by_forensic_doctor'
+            'case__created_by', 'case__assigned_detective',
+            'recorded_by', 'verified_by_forensic_doctor'
         )
+        if self.action != 'by_type' and self.get_serializer_class() is not EvidenceListSerializer:
+            queryset = queryset.prefetch_related(
+                active_roles_prefetch('recorded_by__'),
+                active_roles_prefetch('verified_by_forensic_doctor__')
+            )
         
         # Filter by case
         case_id = self.request.query_params.get('case', None)
@@ -87,6 +97,7 @@ class EvidenceViewSet(viewsets.ModelViewSet):
             from rest_framework.exceptions import ValidationError
             raise ValidationError({'case_id': f'Invalid case ID: {case_id}'})
         
+        # Saving queues the detective's new_evidence notification (core.signals)
         evidence = serializer.save(
             recorded_by=self.request.user,
             case=case,
@@ -96,6 +107,7 @@ class EvidenceViewSet(viewsets.ModelViewSet):
         if evidence.evidence_type == 'witness_statement':
             from apps.cases.models import CaseWitness
             from apps.accounts.models import User
+            from apps.accounts.identifiers import normalize_national_id
             
             w_name = evidence.witness_name
             w_national_id = evidence.witness_national_id
@@ -104,7 +116,7 @@ class EvidenceViewSet(viewsets.ModelViewSet):
             # 1. Try to find a matching system user by national ID
             witness_user = None
             if w_national_id:
-                witness_user = User.objects.filter(national_id=w_national_id).first()
+                witness_user = User.objects.filter(national_id=normalize_national_id(w_national_id)).first()
             
             # 2. Logic for CaseWitness creation
             if witness_user:
@@ -135,20 +147,6 @@ class EvidenceViewSet(viewsets.ModelViewSet):
                         'notes': f"Added via Witness Statement: {evidence.title}"
                     }
                 )
-            
-        # Send Notification to Detective
-        if case.assigned_detective:
-            from core.models import Notification
-            
-            # Avoid sending notification if the detective themself is the one uploading It
-            if case.assigned_detective != self.request.user:
-                Notification.objects.create(
-                    user=case.assigned_detective,
-                    type='new_evidence',
-                    title='New Evidence Added',
-                    message=f'New "{evidence.get_evidence_type_display()}" evidence ({evidence.title}) was just added to Case #{case.id}.',
-                    related_case=case
-                )
     
     @action(detail=True, methods=['post'], permission_classes=[IsForensicDoctor])
     def verify(self, request, pk=None):
@@ -173,32 +171,63 @@ class EvidenceViewSet(viewsets.ModelViewSet):
         serializer.is_valid(raise_exception=True)
         serializer.save()
         
-        # Create notification for detective if case has one
-        if evidence.case.assigned_detective:
-            from core.models import Notification
-            status_str = "VALID" if evidence.is_valid else "INVALID"
-            Notification.objects.create(
-                user=evidence.case.assigned_detective,
-                type='new_evidence',
-                title='Evidence Verified',
-                message=f'Biological evidence "{evidence.title}" has been verified as {status_str} by the Forensic Doctor.',
-                related_case=evidence.case
-            )
+        # Notify the case's detective (see core.notifications)
+        enqueue('evidence_verified', evidence_id=evidence.pk, is_valid=evidence.is_valid)
         
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def by_type(self, request):
-        """Get evidence grouped by type."""
-        evidence_types = Evidence.EVIDENCE_TYPE_CHOICES
-        result = {}
+        """
+        Get evidence counts grouped by type and verification state.
         
-        for evidence_type, display_name in evidence_types:
-            count = self.get_queryset().filter(evidence_type=evidence_type).count()
+        Honors the list filters (e.g. `?case=`); pass `by_case=true` to also
+        break each type down per case. Computed with a single grouped query.
+        """
+        from django.db.models import Case, CharField, Count, Value, When
+        
+        by_case = request.query_params.get('by_case', '').lower() == 'true'
+        group_fields = ['evidence_type', 'verification_state']
+        if by_case:
+            group_fields.append('case_id')
+        
+        rows = (
+            self.get_queryset()
+            .order_by()
+            .annotate(verification_state=Case(
+                # Same conditions as Evidence.is_verified()
+                When(
+                    evidence_type='biological',
+                    verified_by_forensic_doctor__isnull=False,
+                    verification_date__isnull=False,
+                    then=Value('verified')
+                ),
+                When(evidence_type='biological', then=Value('pending')),
+                default=Value('not_applicable'),
+                output_field=CharField(),
+            ))
+            .values(*group_fields)
+            .annotate(count=Count('id'))
+        )
+        
+        result = {}
+        for evidence_type, display_name in Evidence.EVIDENCE_TYPE_CHOICES:
             result[evidence_type] = {
                 'display_name': display_name,
-                'count': count
+                'count': 0,
+                'verification': {'verified': 0, 'pending': 0, 'not_applicable': 0},
             }
+            if by_case:
+                result[evidence_type]['cases'] = {}
+        
+        for row in rows:
+            entry = result.get(row['evidence_type'])
+            if entry is None:
+                continue
+            entry['count'] += row['count']
+            entry['verification'][row['verification_state']] += row['count']
+            if by_case:
+                case_key = str(row['case_id'])
+                entry['cases'][case_key] = entry['cases'].get(case_key, 0) + row['count']
         
         return Response(result)
-
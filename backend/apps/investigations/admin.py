@@ -2,7 +2,7 @@
 Admin configuration for investigations app.
 """
 from django.contrib import admin
-from .models import Suspect, Interrogation, GuiltScore, CaptainDecision
+from .models import Suspect, MostWantedEntry, Interrogation, GuiltScore, CaptainDecision
 
 
 @admin.register(Suspect)
@@ -16,6 +16,12 @@ class SuspectAdmin(admin.ModelAdmin):
     get_name.short_description = 'Name'
 
 
+@admin.register(MostWantedEntry)
+class MostWantedEntryAdmin(admin.ModelAdmin):
+    list_display = ['suspect', 'person_key', 'max_severity', 'max_days', 'ranking', 'reward_amount']
+    readonly_fields = ['updated_at']
+
+
 @admin.register(Interrogation)
 class InterrogationAdmin(admin.ModelAdmin):
     list_display = ['suspect', 'interrogator', 'interrogation_date']
@@ -0,0 +1,32 @@
+"""
+Management command to rebuild the materialized Most Wanted board.
+
+Day counts grow every day without any row changing, so the board must be
+rebuilt at least daily. Run it with --loop as a long-lived worker (the
+docker-compose files do, hourly), or without it from cron after midnight.
+"""
+import time
+from django.core.management.base import BaseCommand
+from apps.investigations.ranking import refresh_leaderboard
+
+
+class Command(BaseCommand):
+    help = 'Recompute Most Wanted rankings and advance day counts'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep rebuilding the board periodically')
+        parser.add_argument('--interval', type=float, default=3600.0, help='Seconds between rebuilds with --loop')
+    
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            count = refresh_leaderboard()
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'Refreshed {count} Most Wanted entries in {elapsed:.2f}s'
+                )
+            )
+            if not options['loop']:
+                break
+            time.sleep(max(0.0, options['interval'] - elapsed))
@@ -0,0 +1,85 @@
+"""
+Management command to promote long-running suspects to severe surveillance.
+
+The Suspect pre_save signal only promotes suspects that happen to be saved;
+this sweeps every eligible suspect with batched UPDATEs so the Most Wanted
+filter stays accurate. Safe to run repeatedly (e.g. daily from cron).
+"""
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from apps.investigations.models import Suspect
+from core.models import Notification
+from core.unread import notifications_created
+
+SEVERE_SURVEILLANCE_DAYS = 30
+
+
+class Command(BaseCommand):
+    help = 'Promote suspects under investigation for more than 30 days to Under Severe Surveillance'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report eligible suspects without changing them')
+        parser.add_argument('--batch-size', type=int, default=500, help='Suspects updated and notifications inserted per query')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        now = timezone.now()
+        cutoff = now.date() - timedelta(days=SEVERE_SURVEILLANCE_DAYS)
+        eligible = Suspect.objects.filter(
+            status='Under Investigation',
+            surveillance_start_date__lt=cutoff
+        )
+
+        if options['dry_run']:
+            self.stdout.write(f'{eligible.count()} suspects would be promoted')
+            return
+
+        with transaction.atomic():
+            rows = list(
+                eligible.select_for_update(of=('self',)).values(
+                    'id', 'name', 'user__first_name', 'user__last_name',
+                    'case_id', 'case__title', 'case__assigned_detective_id'
+                )
+            )
+            # Update only the locked rows: rows committed since may match the
+            # filter too, but they were neither locked nor are they notified
+            promoted = 0
+            ids = [row['id'] for row in rows]
+            for start in range(0, len(ids), options['batch_size']):
+                promoted += Suspect.objects.filter(id__in=ids[start:start + options['batch_size']]).update(
+                    status='Under Severe Surveillance', updated_date=now
+                )
+
+            notifications = [
+                Notification(
+                    user_id=row['case__assigned_detective_id'],
+                    type='case_update',
+                    title='Suspect Under Severe Surveillance',
+                    message=(
+                        f'Suspect "{self._suspect_name(row)}" in case "{row["case__title"]}" '
+                        f'has been under investigation for more than {SEVERE_SURVEILLANCE_DAYS} days '
+                        f'and is now Under Severe Surveillance.'
+                    ),
+                    related_case_id=row['case_id']
+                )
+                for row in rows
+                if row['case__assigned_detective_id']
+            ]
+            Notification.objects.bulk_create(notifications, batch_size=options['batch_size'])
+            notifications_created(notifications)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Promoted {promoted} suspects and sent {len(notifications)} notifications '
+                f'in {elapsed:.2f}s'
+            )
+        )
+
+    @staticmethod
+    def _suspect_name(row):
+        full_name = f'{row["user__first_name"] or ""} {row["user__last_name"] or ""}'.strip()
+        return full_name or row['name'] or f'#{row["id"]}'
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.1 on 2026-10-17 03:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('investigations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MostWantedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('person_key', models.CharField(db_index=True, max_length=80)),
+                ('max_severity', models.PositiveSmallIntegerField(default=0)),
+                ('max_days', models.PositiveIntegerField(default=0)),
+                ('earliest_open_start', models.DateField(blank=True, null=True)),
+                ('ranking', models.BigIntegerField(default=0)),
+                ('reward_amount', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('suspect', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='most_wanted_entry', to='investigations.suspect')),
+            ],
+            options={
+                'verbose_name': 'Most Wanted Entry',
+                'verbose_name_plural': 'Most Wanted Entries',
+                'db_table': 'most_wanted_entries',
+                'ordering': ['-ranking', '-suspect'],
+                'indexes': [models.Index(fields=['-ranking', '-suspect'], name='most_wanted_ranking_459a49_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.0.1 on 2026-10-17 04:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cases', '0004_casewitness_witness_name'),
+        ('investigations', '0002_mostwantedentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='suspect',
+            index=models.Index(fields=['created_date'], name='suspects_created_c2b1a6_idx'),
+        ),
+    ]
@@ -54,12 +54,49 @@ class Suspect(models.Model):
             models.Index(fields=['case', 'status']),
             models.Index(fields=['status']),
             models.Index(fields=['surveillance_start_date']),
+            models.Index(fields=['created_date']),
         ]
     
     def __str__(self):
         suspect_name = self.user.get_full_name() if self.user else self.name
         return f'{suspect_name} - {self.case.title}'
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded person fields so saves can tell whether they changed."""
+        instance = super().from_db(db, field_names, values)
+        instance.remember_person()
+        return instance
+    
+    def remember_person(self):
+        """
+        Snapshot the user and national ID identifying the person behind this
+        suspect (see get_previous_person). Fields deferred at load time are
+        left out of the snapshot.
+        """
+        loaded = self.__dict__
+        if 'user_id' in loaded and 'national_id' in loaded:
+            self._loaded_person = (loaded['user_id'], loaded['national_id'])
+    
+    def get_previous_person(self):
+        """
+        Get the person this suspect belonged to before its pending changes.
+        
+        Falls back to the stored row when no snapshot was taken.
+        
+        Returns:
+            Suspect or None: Unsaved stand-in carrying the previous user and
+            national ID, or None if the person did not change
+        """
+        if self._state.adding:
+            return None
+        previous = self.__dict__.get('_loaded_person')
+        if previous is None:
+            previous = Suspect.objects.filter(pk=self.pk).values_list('user_id', 'national_id').first()
+        if previous is None or previous == (self.user_id, self.national_id):
+            return None
+        return Suspect(pk=self.pk, user_id=previous[0], national_id=previous[1])
+    
     def get_days_under_investigation(self):
         """Calculate days under investigation."""
         if not self.surveillance_start_date:
@@ -80,42 +117,10 @@ class Suspect(models.Model):
     
     def get_max_days_and_severity(self):
         """Helper to get max days (Lj) in open cases and max severity (Di) over all cases."""
-        from django.utils import timezone
+        from apps.investigations.ranking import compute_person_rankings, person_key, EMPTY_RANKING
         
-        # Find all suspect records for this person across the system
-        suspects = []
-        if self.user:
-            suspects = Suspect.objects.filter(user=self.user)
-        elif self.national_id:
-            suspects = Suspect.objects.filter(national_id=self.national_id)
-        else:
-            suspects = Suspect.objects.filter(id=self.id)
-            
-        severity_map = {
-            'Level 3': 1,
-            'Level 2': 2,
-            'Level 1': 3,
-            'Critical': 4,
-        }
-        
-        max_days = 0
-        max_severity = 0
-        today = timezone.now().date()
-        closed_statuses = ['Resolved', 'Closed']
-        
-        for s in suspects:
-            # Check highest crime degree they have EVER done
-            sev = severity_map.get(s.case.severity, 1)
-            if sev > max_severity:
-                max_severity = sev
-                
-            # Check highest days wanted for a crime in an OPEN case
-            if s.case.status not in closed_statuses and s.surveillance_start_date:
-                delta = (today - s.surveillance_start_date).days
-                if delta > max_days:
-                    max_days = delta
-                    
-        return max(0, max_days), max_severity
+        ranking = compute_person_rankings([self]).get(person_key(self), EMPTY_RANKING)
+        return ranking.max_days, ranking.max_severity
 
     def get_most_wanted_ranking(self):
         """
@@ -132,6 +137,38 @@ class Suspect(models.Model):
         return self.get_most_wanted_ranking() * 20000000
 
 
+class MostWantedEntry(models.Model):
+    """
+    Materialized Most Wanted board: one row per open suspect carrying the
+    ranking of the person behind it. Maintained by apps.investigations.signals
+    and the refresh_most_wanted command (see apps.investigations.ranking).
+    """
+    suspect = models.OneToOneField(
+        Suspect,
+        on_delete=models.CASCADE,
+        related_name='most_wanted_entry'
+    )
+    person_key = models.CharField(max_length=80, db_index=True)
+    max_severity = models.PositiveSmallIntegerField(default=0)
+    max_days = models.PositiveIntegerField(default=0)
+    earliest_open_start = models.DateField(null=True, blank=True)
+    ranking = models.BigIntegerField(default=0)
+    reward_amount = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'most_wanted_entries'
+        ordering = ['-ranking', '-suspect']
+        verbose_name = 'Most Wanted Entry'
+        verbose_name_plural = 'Most Wanted Entries'
+        indexes = [
+            models.Index(fields=['-ranking', '-suspect']),
+        ]
+    
+    def __str__(self):
+        return f'{self.suspect} - {self.ranking}'
+
+
 class Interrogation(models.Model):
     """
     Records interrogation sessions with suspects.
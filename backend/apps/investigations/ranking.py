@@ -0,0 +1,258 @@
+"""
+Most Wanted ranking engine.
+
+A person's ranking is max(Lj) × max(Di), where Lj is the longest time
+they have been wanted in a case that is still open and Di is the highest
+severity of any case they were ever a suspect in. The suspect rows of a
+person are, as in Suspect.get_max_days_and_severity:
+
+- for a suspect linked to a user, every suspect linked to that user,
+- for an external suspect with a national ID, every suspect with that
+  national ID, including suspects linked to a user,
+- otherwise, the suspect itself.
+
+A user-linked suspect with a national ID thus counts towards two persons.
+
+All persons are ranked with a single aggregated query (one grouped SELECT
+per kind of person, combined with UNION ALL): the highest severity weight
+and the earliest surveillance start date in an open case are computed per
+person in SQL, so the number of queries does not grow with the number of
+suspects.
+"""
+from collections import namedtuple
+
+from django.db import transaction
+from django.db.models import Case, CharField, IntegerField, Max, Min, Q, Value, When
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
+
+SEVERITY_WEIGHTS = {
+    'Level 3': 1,
+    'Level 2': 2,
+    'Level 1': 3,
+    'Critical': 4,
+}
+
+CLOSED_CASE_STATUSES = ['Resolved', 'Closed']
+
+OPEN_SUSPECT_STATUSES = ['Under Investigation', 'Under Severe Surveillance']
+
+REWARD_MULTIPLIER = 20000000
+
+PersonRanking = namedtuple(
+    'PersonRanking',
+    ['max_days', 'max_severity', 'ranking', 'reward_amount', 'earliest_open_start']
+)
+
+EMPTY_RANKING = PersonRanking(
+    max_days=0, max_severity=0, ranking=0, reward_amount=0, earliest_open_start=None
+)
+
+
+def person_key(suspect):
+    """Return the key identifying the person behind a suspect row."""
+    if suspect.user_id:
+        return f'u:{suspect.user_id}'
+    if suspect.national_id:
+        return f'n:{suspect.national_id}'
+    return f's:{suspect.pk}'
+
+
+def person_key_expression():
+    """SQL counterpart of person_key()."""
+    return Case(
+        When(user__isnull=False, then=Concat(Value('u:'), Cast('user_id', CharField()))),
+        When(~Q(national_id=''), then=Concat(Value('n:'), 'national_id')),
+        default=Concat(Value('s:'), Cast('id', CharField())),
+        output_field=CharField(),
+    )
+
+
+def severity_weight_expression(field='case__severity'):
+    """Map a case severity column to its Di weight."""
+    return Case(
+        *[When(**{field: severity}, then=Value(weight)) for severity, weight in SEVERITY_WEIGHTS.items()],
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+
+
+def _make_ranking(max_severity, earliest_open_start, today):
+    max_days = max(0, (today - earliest_open_start).days) if earliest_open_start else 0
+    max_severity = max_severity or 0
+    ranking = max_days * max_severity
+    return PersonRanking(
+        max_days, max_severity, ranking, ranking * REWARD_MULTIPLIER, earliest_open_start
+    )
+
+
+def _affected_person_keys(suspects):
+    """
+    Return the keys of the persons a change to suspects can affect: their
+    own, and the national ID person a user-linked suspect also counts towards.
+    """
+    keys = set()
+    for suspect in suspects:
+        keys.add(person_key(suspect))
+        if suspect.national_id:
+            keys.add(f'n:{suspect.national_id}')
+    return keys
+
+
+def _rank_rows(queryset, key):
+    return (
+        queryset
+        .annotate(person_key=key)
+        .values('person_key')
+        .annotate(
+            max_severity=Max(severity_weight_expression()),
+            earliest_open_start=Min(
+                'surveillance_start_date',
+                filter=~Q(case__status__in=CLOSED_CASE_STATUSES)
+            ),
+        )
+        .order_by()
+    )
+
+
+def _rank_persons(keys=None):
+    """
+    Compute rankings per person key in one aggregated query.
+
+    Args:
+        keys: Optional iterable of person keys (see person_key()); when
+            given, only those persons are ranked.
+
+    Returns:
+        dict: person key -> PersonRanking
+    """
+    from apps.investigations.models import Suspect
+
+    groups = [
+        (Suspect.objects.filter(user__isnull=False), 'u', 'user_id',
+         Concat(Value('u:'), Cast('user_id', CharField()))),
+        (Suspect.objects.exclude(national_id=''), 'n', 'national_id',
+         Concat(Value('n:'), 'national_id')),
+        (Suspect.objects.filter(user__isnull=True, national_id=''), 's', 'id',
+         Concat(Value('s:'), Cast('id', CharField()))),
+    ]
+    values_by_kind = None
+    if keys is not None:
+        values_by_kind = {'u': set(), 'n': set(), 's': set()}
+        for key in keys:
+            kind, _, value = key.partition(':')
+            values_by_kind[kind].add(value)
+
+    parts = []
+    for queryset, kind, field, key in groups:
+        if values_by_kind is not None:
+            if not values_by_kind[kind]:
+                continue
+            queryset = queryset.filter(**{f'{field}__in': values_by_kind[kind]})
+        parts.append(_rank_rows(queryset, key))
+    if not parts:
+        return {}
+
+    rows = parts[0].union(*parts[1:], all=True) if len(parts) > 1 else parts[0]
+    today = timezone.now().date()
+    return {
+        row['person_key']: _make_ranking(row['max_severity'], row['earliest_open_start'], today)
+        for row in rows
+    }
+
+
+def compute_person_rankings(suspects=None):
+    """
+    Compute rankings per person in one aggregated query.
+
+    Args:
+        suspects: Optional iterable of Suspect instances; when given, only
+            the persons behind them are ranked.
+
+    Returns:
+        dict: person key -> PersonRanking
+    """
+    if suspects is None:
+        return _rank_persons()
+    return _rank_persons({person_key(suspect) for suspect in suspects})
+
+
+def rankings_by_suspect(suspects):
+    """
+    Rank the persons behind a batch of suspects with one aggregated query.
+
+    Args:
+        suspects: Iterable of Suspect instances
+
+    Returns:
+        dict: suspect pk -> PersonRanking
+    """
+    suspects = list(suspects)
+    rankings = compute_person_rankings(suspects)
+    return {suspect.pk: rankings.get(person_key(suspect), EMPTY_RANKING) for suspect in suspects}
+
+
+def refresh_leaderboard(suspects=None):
+    """
+    Rebuild the materialized board for the persons behind suspects.
+
+    Args:
+        suspects: Optional iterable of Suspect instances; when omitted the
+            whole board is rebuilt.
+
+    Returns:
+        int: Number of board entries written
+    """
+    from apps.investigations.models import MostWantedEntry, Suspect
+
+    open_suspects = (
+        Suspect.objects
+        .filter(status__in=OPEN_SUSPECT_STATUSES)
+        .annotate(person_key=person_key_expression())
+    )
+    # Entries of suspects that are no longer open
+    stale_entries = MostWantedEntry.objects.exclude(suspect__status__in=OPEN_SUSPECT_STATUSES)
+    wanted_keys = None
+    if suspects is not None:
+        suspects = list(suspects)
+        wanted_keys = _affected_person_keys(suspects)
+        # Suspects matched by a national ID may belong to another person
+        # (a linked user), which is not being refreshed
+        open_suspects = open_suspects.filter(person_key__in=wanted_keys)
+        # A suspect whose user/national ID changed still has an entry
+        # under its previous person key
+        stale_entries = MostWantedEntry.objects.filter(
+            Q(person_key__in=wanted_keys) | Q(suspect_id__in=[s.pk for s in suspects if s.pk])
+        )
+
+    rankings = _rank_persons(wanted_keys)
+    entries = []
+    for suspect_id, key in open_suspects.values_list('id', 'person_key'):
+        person_ranking = rankings.get(key, EMPTY_RANKING)
+        entries.append(MostWantedEntry(
+            suspect_id=suspect_id,
+            person_key=key,
+            max_severity=person_ranking.max_severity,
+            max_days=person_ranking.max_days,
+            earliest_open_start=person_ranking.earliest_open_start,
+            ranking=person_ranking.ranking,
+            reward_amount=person_ranking.reward_amount,
+        ))
+
+    with transaction.atomic():
+        if suspects is not None:
+            stale_entries = stale_entries.exclude(suspect_id__in=[entry.suspect_id for entry in entries])
+        stale_entries.delete()
+        # Upsert: a concurrent refresh (e.g. the periodic full rebuild) may
+        # have written entries for the same suspects since they were read
+        MostWantedEntry.objects.bulk_create(
+            entries,
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['suspect'],
+            update_fields=[
+                'person_key', 'max_severity', 'max_days', 'earliest_open_start',
+                'ranking', 'reward_amount', 'updated_at',
+            ],
+        )
+    return len(entries)
@@ -35,7 +35,16 @@ class SuspectSerializer(serializers.ModelSerializer):
         return obj.get_days_under_investigation()
     
     def get_most_wanted_ranking(self, obj):
-        """Get Most Wanted ranking."""
+        """
+        Get Most Wanted ranking.
+        
+        Views serializing many suspects put a 'suspect_rankings' map
+        (suspect pk -> PersonRanking) in the context, computed for the whole
+        batch in one query; single suspects are ranked on their own.
+        """
+        rankings = self.context.get('suspect_rankings')
+        if rankings is not None and obj.pk in rankings:
+            return rankings[obj.pk].ranking
         return obj.get_most_wanted_ranking()
 
 
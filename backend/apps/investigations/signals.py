@@ -1,6 +1,8 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from apps.investigations.models import CaptainDecision
+from apps.cases.models import Case
+from apps.investigations.models import CaptainDecision, Suspect
+from apps.investigations.ranking import refresh_leaderboard
 from apps.trials.models import Trial
 
 @receiver(post_save, sender=CaptainDecision)
@@ -12,3 +14,36 @@ def create_trial_on_approval(sender, instance, created, **kwargs):
     if instance.is_approved():
         # Check if a trial already exists for this case to avoid duplicates
         Trial.objects.get_or_create(case=instance.case)
+
+
+@receiver(pre_save, sender=Suspect)
+def remember_previous_person(sender, instance, **kwargs):
+    """
+    A suspect whose user or national ID changes leaves its previous person,
+    whose other suspects were ranked with it.
+    """
+    instance._previous_person = instance.get_previous_person()
+
+
+@receiver(post_save, sender=Suspect)
+@receiver(post_delete, sender=Suspect)
+def refresh_most_wanted_for_suspect(sender, instance, **kwargs):
+    """
+    Keep the materialized Most Wanted board current for the suspect's
+    person, and for its previous person when that changed.
+    """
+    previous = instance.__dict__.pop('_previous_person', None)
+    refresh_leaderboard([instance] + ([previous] if previous else []))
+    instance.remember_person()
+
+
+@receiver(post_save, sender=Case)
+def refresh_most_wanted_for_case(sender, instance, created, **kwargs):
+    """
+    Case severity and status feed every ranking of its suspects.
+    """
+    if created:
+        return
+    suspects = list(instance.suspects.only('id', 'user_id', 'national_id'))
+    if suspects:
+        refresh_leaderboard(suspects)
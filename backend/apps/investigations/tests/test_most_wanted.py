@@ -0,0 +1,220 @@
+"""
+Tests for the Most Wanted ranking engine and board endpoint.
+
+Run with:
+    python manage.py test apps.investigations.tests.test_most_wanted
+"""
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.authtoken.models import Token
+from apps.accounts.models import User
+from apps.cases.models import Case
+from apps.investigations.models import MostWantedEntry, Suspect
+from apps.investigations.ranking import compute_person_rankings, person_key, refresh_leaderboard
+
+
+def days_ago(days):
+    return timezone.now().date() - timedelta(days=days)
+
+
+class MostWantedRankingTest(APITestCase):
+    """Tests for GET /investigations/suspects/most_wanted/."""
+
+    def setUp(self):
+        self.viewer = User.objects.create_user(
+            username='viewer',
+            email='viewer@police.ir',
+            password='testpass123',
+            phone_number='09100000000',
+            national_id='0000000001',
+        )
+        token, _ = Token.objects.get_or_create(user=self.viewer)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+
+        self.minor_case = Case.objects.create(
+            title='Petty Theft', description='-', severity='Level 3', status='Open',
+            created_by=self.viewer,
+        )
+        self.murder_case = Case.objects.create(
+            title='Murder', description='-', severity='Level 1', status='Closed',
+            created_by=self.viewer,
+        )
+        # Same external person in two cases: severity from the closed murder
+        # case (3), days from the open theft case (40).
+        self.repeat_offender = Suspect.objects.create(
+            case=self.minor_case, name='Reza', national_id='555',
+            surveillance_start_date=days_ago(40),
+        )
+        Suspect.objects.create(
+            case=self.murder_case, name='Reza', national_id='555',
+            status='Arrested', surveillance_start_date=days_ago(400),
+        )
+        self.newcomer = Suspect.objects.create(
+            case=self.minor_case, name='Sara', national_id='777',
+            surveillance_start_date=days_ago(10),
+        )
+        self.url = reverse('suspect-most-wanted')
+
+    def test_rankings_are_computed_per_person(self):
+        rankings = compute_person_rankings()
+        reza = rankings[person_key(self.repeat_offender)]
+        self.assertEqual((reza.max_days, reza.max_severity), (40, 3))
+        self.assertEqual(reza.ranking, 120)
+        self.assertEqual(reza.reward_amount, 120 * 20000000)
+        self.assertEqual(self.repeat_offender.get_most_wanted_ranking(), 120)
+
+    def test_national_id_person_includes_user_linked_suspects(self):
+        # As in the per-suspect baseline: Reza's national ID also matches a
+        # suspect linked to a user, which counts towards both persons
+        user = User.objects.create_user(
+            username='reza', email='reza@police.ir', password='testpass123',
+            phone_number='09100000001', national_id='555',
+        )
+        linked = Suspect.objects.create(
+            case=self.minor_case, name='Reza', national_id='555', user=user,
+            surveillance_start_date=days_ago(100),
+        )
+        with self.assertNumQueries(1):
+            rankings = compute_person_rankings([self.repeat_offender, linked])
+        self.assertEqual(rankings[person_key(self.repeat_offender)].ranking, 300)
+        self.assertEqual(rankings[person_key(linked)].ranking, 100)
+        self.assertEqual(self.repeat_offender.get_most_wanted_ranking(), 300)
+        self.assertEqual(linked.get_most_wanted_ranking(), 100)
+
+    def test_board_is_sorted_by_ranking(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [entry['suspect']['id'] for entry in resp.data],
+            [self.repeat_offender.id, self.newcomer.id]
+        )
+        self.assertEqual([entry['ranking'] for entry in resp.data], [120, 10])
+        self.assertEqual(resp.data[0]['suspect']['most_wanted_ranking'], 120)
+
+    def test_query_count_does_not_grow_with_suspects(self):
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(self.url)
+        for i in range(10):
+            Suspect.objects.create(
+                case=self.minor_case, name=f'Extra {i}', national_id=f'9{i}',
+                surveillance_start_date=days_ago(i),
+            )
+        with CaptureQueriesContext(connection) as grown:
+            resp = self.client.get(self.url)
+        self.assertEqual(len(resp.data), 12)
+        self.assertEqual(len(grown), len(baseline))
+
+    def test_pagination_is_opt_in(self):
+        resp = self.client.get(self.url, {'page_size': 1})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['count'], 2)
+        self.assertEqual(len(resp.data['results']), 1)
+        self.assertEqual(resp.data['results'][0]['suspect']['id'], self.repeat_offender.id)
+
+    def test_board_follows_case_changes(self):
+        self.minor_case.status = 'Resolved'
+        self.minor_case.save()
+        resp = self.client.get(self.url)
+        # No open case left: Reza keeps severity 3 but has no wanted days
+        self.assertEqual([entry['ranking'] for entry in resp.data], [0, 0])
+
+    def test_board_drops_arrested_suspects(self):
+        self.newcomer.status = 'Arrested'
+        self.newcomer.save()
+        resp = self.client.get(self.url)
+        self.assertEqual([entry['suspect']['id'] for entry in resp.data], [self.repeat_offender.id])
+
+    def test_board_follows_suspect_leaving_a_person(self):
+        # The murder case no longer counts towards Reza once that suspect
+        # turns out to be someone else
+        murder_suspect = Suspect.objects.get(case=self.murder_case)
+        murder_suspect.national_id = '999'
+        murder_suspect.save()
+        entry = MostWantedEntry.objects.get(suspect=self.repeat_offender)
+        self.assertEqual((entry.max_severity, entry.ranking), (1, 40))
+
+    def test_board_keeps_user_linked_suspect_sharing_a_national_id(self):
+        # The user-linked suspect matches the new suspect's national ID but
+        # is its own person, whose entry must survive the refresh unchanged
+        user = User.objects.create_user(
+            username='nima', email='nima@police.ir', password='testpass123',
+            phone_number='09100000002', national_id='A1',
+        )
+        linked = Suspect.objects.create(
+            case=self.minor_case, name='Nima', national_id='A1', user=user,
+            surveillance_start_date=days_ago(20),
+        )
+        external = Suspect.objects.create(
+            case=self.murder_case, name='Nima', national_id='A1',
+            surveillance_start_date=days_ago(5),
+        )
+        linked_entry = MostWantedEntry.objects.get(suspect=linked)
+        self.assertEqual((linked_entry.person_key, linked_entry.ranking), (f'u:{user.pk}', 20))
+        # The external person counts the linked suspect's open case
+        external_entry = MostWantedEntry.objects.get(suspect=external)
+        self.assertEqual((external_entry.person_key, external_entry.ranking), ('n:A1', 60))
+
+    def test_refresh_overwrites_entries_written_concurrently(self):
+        # As left by a full rebuild running at the same time
+        MostWantedEntry.objects.filter(suspect=self.repeat_offender).update(person_key='n:old', ranking=0)
+        refresh_leaderboard([Suspect(national_id='555')])
+        entry = MostWantedEntry.objects.get(suspect=self.repeat_offender)
+        self.assertEqual((entry.person_key, entry.ranking), ('n:555', 120))
+
+    def test_refresh_command_advances_days(self):
+        MostWantedEntry.objects.update(max_days=0, ranking=0, reward_amount=0)
+        call_command('refresh_most_wanted', stdout=StringIO())
+        entry = MostWantedEntry.objects.get(suspect=self.repeat_offender)
+        self.assertEqual((entry.max_days, entry.ranking), (40, 120))
+
+
+class SuspectDetailedListTest(APITestCase):
+    """Tests for GET /investigations/suspects/?detailed=true."""
+
+    def setUp(self):
+        self.viewer = User.objects.create_user(
+            username='viewer',
+            email='viewer@police.ir',
+            password='testpass123',
+            phone_number='09100000000',
+            national_id='0000000001',
+        )
+        self.client.force_authenticate(user=self.viewer)
+        self.case = Case.objects.create(
+            title='Fraud Ring', description='-', severity='Level 2', status='Open',
+            created_by=self.viewer,
+        )
+        self.url = reverse('suspect-list')
+
+    def _add_suspects(self, start, count):
+        for i in range(start, start + count):
+            Suspect.objects.create(
+                case=self.case, name=f'Suspect {i}', national_id=f'7{i:03d}',
+                surveillance_start_date=days_ago(i + 1),
+            )
+
+    def test_rankings_come_from_one_batch(self):
+        self._add_suspects(0, 2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url, {'detailed': 'true'})
+        self._add_suspects(2, 10)
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.get(self.url, {'detailed': 'true', 'case': self.case.id})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(large), len(small))
+        rankings = {row['name']: row['most_wanted_ranking'] for row in resp.data['results']}
+        # Level 2 weighs 2, so each suspect ranks at twice their wanted days
+        self.assertEqual(rankings['Suspect 0'], 2)
+        self.assertEqual(rankings['Suspect 11'], 24)
+
+    def test_plain_list_stays_lightweight(self):
+        self._add_suspects(0, 1)
+        resp = self.client.get(self.url)
+        self.assertNotIn('most_wanted_ranking', resp.data['results'][0])
@@ -0,0 +1,100 @@
+"""
+Tests for the sweep_severe_surveillance management command.
+
+Run with:
+    python manage.py test apps.investigations.tests.test_surveillance_sweep
+"""
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+from apps.accounts.models import User
+from apps.cases.models import Case
+from apps.investigations.models import Suspect
+from core.models import Notification
+
+
+class SevereSurveillanceSweepTest(TestCase):
+    """Tests for bulk promotion to Under Severe Surveillance."""
+
+    def setUp(self):
+        self.detective = User.objects.create_user(
+            username='detective',
+            email='detective@example.com',
+            password='testpass123',
+            phone_number='1111111111',
+            national_id='111111111'
+        )
+        self.case = Case.objects.create(
+            title='Test Case',
+            description='Test description',
+            severity='Level 2',
+            status='Open',
+            created_by=self.detective,
+            assigned_detective=self.detective
+        )
+        today = timezone.now().date()
+        self.stale = Suspect.objects.create(
+            case=self.case, name='Stale', surveillance_start_date=today - timedelta(days=45)
+        )
+        self.recent = Suspect.objects.create(
+            case=self.case, name='Recent', surveillance_start_date=today - timedelta(days=5)
+        )
+        self.arrested = Suspect.objects.create(
+            case=self.case, name='Arrested', status='Arrested',
+            surveillance_start_date=today - timedelta(days=90)
+        )
+        Notification.objects.all().delete()
+
+    def test_promotes_only_eligible_suspects(self):
+        """Test only suspects under investigation for over 30 days are promoted and notified."""
+        call_command('sweep_severe_surveillance', stdout=StringIO())
+        statuses = dict(Suspect.objects.values_list('name', 'status'))
+        self.assertEqual(statuses, {
+            'Stale': 'Under Severe Surveillance',
+            'Recent': 'Under Investigation',
+            'Arrested': 'Arrested',
+        })
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.detective)
+        self.assertIn('Stale', notification.message)
+
+    def test_is_idempotent(self):
+        """Test a second sweep promotes and notifies nobody."""
+        call_command('sweep_severe_surveillance', stdout=StringIO())
+        out = StringIO()
+        call_command('sweep_severe_surveillance', stdout=out)
+        self.assertIn('Promoted 0 suspects', out.getvalue())
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_dry_run_changes_nothing(self):
+        """Test --dry-run only reports the eligible suspects."""
+        out = StringIO()
+        call_command('sweep_severe_surveillance', '--dry-run', stdout=out)
+        self.assertIn('1 suspects would be promoted', out.getvalue())
+        self.assertEqual(Suspect.objects.filter(status='Under Severe Surveillance').count(), 0)
+
+    def test_updates_only_locked_suspects(self):
+        """Test a suspect becoming eligible after the rows are locked is left for the next sweep."""
+        values = QuerySet.values
+        late = []
+
+        def values_then_commit_another(queryset, *fields, **expressions):
+            rows = values(queryset, *fields, **expressions)
+            if queryset.query.select_for_update and not late:
+                rows = list(rows)
+                late.append(Suspect.objects.create(
+                    case=self.case, name='Late',
+                    surveillance_start_date=timezone.now().date() - timedelta(days=60)
+                ))
+            return rows
+
+        out = StringIO()
+        with mock.patch.object(QuerySet, 'values', values_then_commit_another):
+            call_command('sweep_severe_surveillance', stdout=out)
+        self.assertIn('Promoted 1 suspects and sent 1 notifications', out.getvalue())
+        late[0].refresh_from_db()
+        self.assertEqual(late[0].status, 'Under Investigation')
@@ -10,12 +10,15 @@ from django.utils import timezone
 from core.permissions import (
     IsDetective, IsSergeant, IsCaptain, IsPoliceChief, IsDetectiveOrSergeant
 )
-from .models import Suspect, Interrogation, GuiltScore, CaptainDecision
+from core.pagination import OptionalCursorPagination, StandardResultsSetPagination
+from .models import Suspect, MostWantedEntry, Interrogation, GuiltScore, CaptainDecision
+from .ranking import PersonRanking, rankings_by_suspect
 from .serializers import (
     SuspectSerializer, SuspectListSerializer,
     InterrogationSerializer, GuiltScoreSerializer,
     CaptainDecisionSerializer, CaptainDecisionCreateSerializer
 )
+from apps.accounts.models import active_roles_prefetch
 
 
 class SuspectViewSet(viewsets.ModelViewSet):
@@ -24,30 +27,52 @@ class SuspectViewSet(viewsets.ModelViewSet):
     """
     queryset = Suspect.objects.all()
     permission_classes = [IsAuthenticated]
+    pagination_class = OptionalCursorPagination
     
     def get_serializer_class(self):
         if self.action == 'list':
+            if self.request.query_params.get('detailed', '').lower() == 'true':
+                return SuspectSerializer
             return SuspectListSerializer
         return SuspectSerializer
     
+    def get_serializer(self, *args, **kwargs):
+        """
+        Rank every suspect of a SuspectSerializer batch up front, so a page
+        of suspects costs one aggregate query instead of one per suspect.
+        """
+        if args and kwargs.get('many') and self.get_serializer_class() is SuspectSerializer:
+            suspects = list(args[0])
+            args = (suspects,) + args[1:]
+            kwargs.setdefault('context', self.get_serializer_context())
+            kwargs['context']['suspect_rankings'] = rankings_by_suspect(suspects)
+        return super().get_serializer(*args, **kwargs)
+    
     def get_queryset(self):
         """Filter suspects based on case and status."""
         queryset = Suspect.objects.select_related('case', 'user')
-        
+        if self.get_serializer_class() is SuspectSerializer:
+            queryset = queryset.select_related(
+                'case__created_by', 'case__assigned_detective'
+            ).prefetch_related(active_roles_prefetch('user__'))
+        return self._filter_suspects(queryset)
+    
+    def _filter_suspects(self, queryset, prefix=''):
+        """Apply the case/status/most_wanted query filters, optionally through a relation."""
         # Filter by case
         case_id = self.request.query_params.get('case', None)
         if case_id:
-            queryset = queryset.filter(case_id=case_id)
+            queryset = queryset.filter(**{f'{prefix}case_id': case_id})
         
         # Filter by status
         status_filter = self.request.query_params.get('status', None)
         if status_filter:
-            queryset = queryset.filter(status=status_filter)
+            queryset = queryset.filter(**{f'{prefix}status': status_filter})
         
         # Filter for Most Wanted (Under Severe Surveillance)
         most_wanted = self.request.query_params.get('most_wanted', None)
         if most_wanted and most_wanted.lower() == 'true':
-            queryset = queryset.filter(status='Under Severe Surveillance')
+            queryset = queryset.filter(**{f'{prefix}status': 'Under Severe Surveillance'})
         
         return queryset
     
@@ -98,26 +123,53 @@ class SuspectViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'], permission_classes=[IsAuthenticated])
     def most_wanted(self, request):
-        """Get Most Wanted suspects (ranked by formula)."""
-        suspects = self.get_queryset().filter(
-            status__in=['Under Investigation', 'Under Severe Surveillance']
+        """
+        Get Most Wanted suspects (ranked by formula).
+        
+        Pass `page` or `page_size` to receive a paginated response.
+        """
+        # The board is materialized (see apps.investigations.ranking), so
+        # this is a single ORDER BY ranking query over an indexed table
+        entries = self._filter_suspects(
+            MostWantedEntry.objects.select_related(
+                'suspect__user', 'suspect__case__created_by', 'suspect__case__assigned_detective'
+            ).prefetch_related(active_roles_prefetch('suspect__user__')),
+            prefix='suspect__'
         )
         
-        # Calculate ranking for each suspect
-        ranked_suspects = []
-        for suspect in suspects:
-            ranking = suspect.get_most_wanted_ranking()
-            reward_amount = suspect.get_reward_amount()
-            ranked_suspects.append({
-                'suspect': SuspectSerializer(suspect).data,
-                'ranking': ranking,
-                'reward_amount': reward_amount
-            })
+        paginator = None
+        if 'page' in request.query_params or 'page_size' in request.query_params:
+            paginator = StandardResultsSetPagination()
+            entries = paginator.paginate_queryset(entries, request, view=self)
+        else:
+            entries = list(entries)
         
-        # Sort by ranking (descending)
-        ranked_suspects.sort(key=lambda x: x['ranking'], reverse=True)
+        serializer = SuspectSerializer(
+            [entry.suspect for entry in entries],
+            many=True,
+            context={
+                'request': request,
+                'suspect_rankings': {
+                    entry.suspect_id: PersonRanking(
+                        entry.max_days, entry.max_severity, entry.ranking,
+                        entry.reward_amount, entry.earliest_open_start
+                    )
+                    for entry in entries
+                },
+            }
+        )
+        results = [
+            {
+                'suspect': suspect_data,
+                'ranking': entry.ranking,
+                'reward_amount': entry.reward_amount
+            }
+            for suspect_data, entry in zip(serializer.data, entries)
+        ]
         
-        return Response(ranked_suspects)
+        if paginator is not None:
+            return paginator.get_paginated_response(results)
+        return Response(results)
 
 
 class InterrogationViewSet(viewsets.ModelViewSet):
@@ -130,7 +182,9 @@ class InterrogationViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Filter interrogations."""
-        queryset = Interrogation.objects.select_related('suspect', 'case', 'interrogator')
+        queryset = Interrogation.objects.select_related(
+            'suspect', 'case', 'interrogator'
+        ).prefetch_related(active_roles_prefetch('interrogator__'))
         
         # Filter by suspect
         suspect_id = self.request.query_params.get('suspect', None)
@@ -167,7 +221,9 @@ class GuiltScoreViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter guilt scores."""
-        queryset = GuiltScore.objects.select_related('suspect', 'case', 'assigned_by')
+        queryset = GuiltScore.objects.select_related(
+            'suspect', 'case', 'assigned_by'
+        ).prefetch_related(active_roles_prefetch('assigned_by__'))
 
         # Filter by suspect
         suspect_id = self.request.query_params.get('suspect', None)
@@ -202,6 +258,9 @@ class CaptainDecisionViewSet(viewsets.ModelViewSet):
         """Filter decisions."""
         queryset = CaptainDecision.objects.select_related(
             'case', 'suspect', 'decided_by', 'chief_approved_by'
+        ).prefetch_related(
+            active_roles_prefetch('decided_by__'),
+            active_roles_prefetch('chief_approved_by__')
         )
         
         # Filter by case
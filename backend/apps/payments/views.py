@@ -20,6 +20,7 @@ from .serializers import (
     BailFineSerializer, BailFineCreateSerializer,
     PaymentTransactionSerializer
 )
+from apps.accounts.models import active_roles_prefetch
 
 logger = logging.getLogger(__name__)
 
@@ -108,7 +109,9 @@ class BailFineViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter bail/fines by case, suspect, and/or status."""
-        queryset = BailFine.objects.select_related('case', 'suspect', 'set_by')
+        queryset = BailFine.objects.select_related(
+            'case', 'suspect', 'set_by'
+        ).prefetch_related(active_roles_prefetch('set_by__'))
 
         case_id = self.request.query_params.get('case', None)
         if case_id:
@@ -7,11 +7,14 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
 from core.permissions import IsPoliceOfficer, IsDetective
+from core.visibility import visible_to
 from .models import RewardSubmission, Reward
 from .serializers import (
     RewardSubmissionSerializer, RewardSubmissionCreateSerializer,
     RewardSerializer, RewardListSerializer
 )
+from apps.accounts.identifiers import normalize_national_id
+from apps.accounts.models import active_roles_prefetch
 
 
 class RewardSubmissionViewSet(viewsets.ModelViewSet):
@@ -30,19 +33,14 @@ class RewardSubmissionViewSet(viewsets.ModelViewSet):
         """Filter submissions based on user role."""
         queryset = RewardSubmission.objects.select_related(
             'submitted_by', 'case', 'reviewed_by_officer', 'reviewed_by_detective'
+        ).prefetch_related(
+            active_roles_prefetch('submitted_by__'),
+            active_roles_prefetch('reviewed_by_officer__'),
+            active_roles_prefetch('reviewed_by_detective__')
         )
         
-        # Basic users can see their own submissions
-        if self.request.user.has_role('Basic User'):
-            queryset = queryset.filter(submitted_by=self.request.user)
-        
-        # Police Officers can see pending and under review
-        if self.request.user.has_role('Police Officer'):
-            queryset = queryset.filter(status__in=['Pending', 'Under Review'])
-        
-        # Detectives can see approved submissions
-        if self.request.user.has_role('Detective'):
-            queryset = queryset.filter(status__in=['Under Review', 'Approved'])
+        # Role-based visibility (see apps.rewards.visibility)
+        queryset = visible_to(queryset, self.request.user)
         
         return queryset
     
@@ -181,6 +179,8 @@ class RewardViewSet(viewsets.ReadOnlyModelViewSet):
         queryset = Reward.objects.select_related(
             'submission', 'case', 'created_by'
         )
+        if self.action != 'list':
+            queryset = queryset.prefetch_related(active_roles_prefetch('created_by__'))
         
         # Filter by status
         status_filter = self.request.query_params.get('status', None)
@@ -243,7 +243,7 @@ class RewardViewSet(viewsets.ReadOnlyModelViewSet):
             
         # Check if the national ID matches the submitted_by user
         user = reward.submission.submitted_by
-        if user.national_id != national_id:
+        if user.national_id != normalize_national_id(national_id):
             return Response(
                 {'error': 'National ID does not match this reward code'},
                 status=status.HTTP_400_BAD_REQUEST
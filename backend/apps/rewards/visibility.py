@@ -0,0 +1,21 @@
+"""
+Visibility policy for reward submissions.
+"""
+from django.db.models import Q
+from core import visibility
+from .models import RewardSubmission
+
+
+@visibility.register(RewardSubmission)
+class RewardSubmissionVisibility(visibility.VisibilityPolicy):
+    """Submissions are visible to their submitter and to the stage reviewing them."""
+    staff_sees_all = True
+    unrestricted_roles = ['System Administrator', 'Police Chief', 'Captain', 'Sergeant']
+    # Everyone can see their own submissions
+    base_rules = [lambda user: Q(submitted_by=user)]
+    role_rules = {
+        # Police Officers review pending submissions
+        'Police Officer': [Q(status__in=['Pending', 'Under Review'])],
+        # Detectives approve the ones officers forwarded
+        'Detective': [Q(status__in=['Under Review', 'Approved'])],
+    }
@@ -5,4 +5,6 @@ class TrialsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.trials'
     verbose_name = 'Trials'
-
+    
+    def ready(self):
+        import apps.trials.signals
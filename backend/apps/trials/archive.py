@@ -0,0 +1,102 @@
+"""
+Frozen dossier archives for completed trials.
+
+Once a verdict is recorded the trial and its case are effectively final, so
+TrialViewSet.record_verdict writes the full trial document (including the
+case dossier) as gzip-compressed JSON to private storage. Retrieving a
+completed trial then streams that file as-is: clients that accept gzip get
+the stored bytes, and a matching If-None-Match is answered with 304.
+
+ARCHIVE_FORMAT_VERSION is bumped whenever TrialSerializer's output changes
+shape; archives written with an older version are rebuilt on next read.
+"""
+import gzip
+import hashlib
+
+from django.core.files.base import ContentFile
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from rest_framework.renderers import JSONRenderer
+
+ARCHIVE_FORMAT_VERSION = 1
+
+
+def archive_trial(trial, data):
+    """
+    Write (or replace) the archive of a completed trial.
+
+    Args:
+        trial: Trial instance
+        data: Serialized trial (TrialSerializer output)
+
+    Returns:
+        TrialDossierArchive: The stored archive
+    """
+    from apps.trials.models import TrialDossierArchive
+
+    document = JSONRenderer().render(data)
+    # mtime=0 keeps the compressed bytes stable for identical documents
+    compressed = gzip.compress(document, mtime=0)
+    etag = f'"v{ARCHIVE_FORMAT_VERSION}-{hashlib.sha256(document).hexdigest()[:40]}"'
+
+    archive = TrialDossierArchive.objects.filter(trial=trial).first()
+    if archive is None:
+        archive = TrialDossierArchive(trial=trial)
+    elif archive.document:
+        archive.document.delete(save=False)
+
+    archive.format_version = ARCHIVE_FORMAT_VERSION
+    archive.etag = etag
+    archive.size = len(document)
+    archive.document.save(
+        f'trial-{trial.pk}-v{ARCHIVE_FORMAT_VERSION}.json.gz', ContentFile(compressed), save=False
+    )
+    archive.save()
+    return archive
+
+
+def get_current_archive(trial):
+    """
+    Get the archive of a trial if one was written with the current format.
+
+    Returns:
+        TrialDossierArchive or None
+    """
+    from apps.trials.models import TrialDossierArchive
+
+    try:
+        archive = trial.dossier_archive
+    except TrialDossierArchive.DoesNotExist:
+        return None
+    if archive.format_version != ARCHIVE_FORMAT_VERSION or not archive.document.storage.exists(archive.document.name):
+        return None
+    return archive
+
+
+def archive_response(request, archive):
+    """
+    Serve an archive, honoring If-None-Match and Accept-Encoding.
+
+    Args:
+        request: Incoming request
+        archive: TrialDossierArchive to serve
+
+    Returns:
+        HttpResponse: 304, or the JSON document (gzip-encoded when accepted)
+    """
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+    if archive.etag in [tag.strip() for tag in if_none_match.split(',')]:
+        response = HttpResponseNotModified()
+    else:
+        with archive.document.open('rb') as document:
+            compressed = document.read()
+        if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+            response = HttpResponse(compressed, content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(compressed), content_type='application/json')
+
+    response['ETag'] = archive.etag
+    patch_cache_control(response, private=True)
+    patch_vary_headers(response, ['Accept-Encoding'])
+    return response
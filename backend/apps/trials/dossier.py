@@ -0,0 +1,183 @@
+"""
+Case dossier builder for trials.
+
+A dossier gathers everything a judge reviews for a case: suspects, guilt
+scores, captain decisions, evidence, the originating complaint,
+complainants and witnesses, plus the active roles of every user shown.
+build_case_dossier() loads all of it with select_related/Prefetch in a
+fixed number of queries, whatever the size of the case.
+
+Judges reopen the same dossier many times during a hearing, so the
+serialized dossier is also cached per case for TRIAL_DOSSIER_CACHE_TIMEOUT
+seconds (0 disables caching). apps.trials.signals drops a case's entry
+whenever one of its child rows changes, and bumps a global version when
+users or roles change, since any dossier may show them.
+
+As with role sets (see apps.accounts.role_cache), invalidation happens once
+the surrounding transaction commits, so a concurrent request cannot cache
+the old dossier again after it was dropped. Until the commit, the writing
+thread does not cache the dossiers it changed.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+from apps.accounts.models import active_roles_prefetch
+from apps.cases.models import Case, CaseComplainant, CaseWitness
+
+GLOBAL_VERSION_KEY = 'trials:dossier:version'
+
+
+def _dossier_key(case_id, global_version):
+    return f'trials:dossier:{case_id}:{global_version}'
+
+
+# Cases whose dossier changes in this thread's open transaction are not
+# yet committed; 'all' is set by an uncommitted global bump.
+_uncommitted = threading.local()
+
+
+def _uncommitted_state():
+    if not transaction.get_connection().in_atomic_block:
+        # No transaction open: whatever was pending committed or rolled back
+        _uncommitted.case_ids = set()
+        _uncommitted.all = False
+    elif not hasattr(_uncommitted, 'case_ids'):
+        _uncommitted.case_ids = set()
+        _uncommitted.all = False
+    return _uncommitted
+
+
+def _has_uncommitted_changes(case_id):
+    state = _uncommitted_state()
+    return state.all or case_id in state.case_ids
+
+
+def _get_global_version():
+    version = cache.get(GLOBAL_VERSION_KEY)
+    if version is None:
+        # Seeded from the clock so an evicted counter never restarts at a
+        # value whose cached dossiers could still be around
+        cache.add(GLOBAL_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(GLOBAL_VERSION_KEY)
+    return version
+
+
+def dossier_queryset():
+    """
+    Build the Case queryset loading every dossier section up front.
+
+    Returns:
+        QuerySet: Cases with all dossier relations selected or prefetched
+    """
+    from apps.evidence.models import Evidence
+    from apps.investigations.models import Suspect, GuiltScore, CaptainDecision
+
+    return Case.objects.select_related(
+        'created_by', 'assigned_detective', 'assigned_sergeant',
+        'complaint__submitted_by'
+    ).prefetch_related(
+        active_roles_prefetch('created_by__'),
+        active_roles_prefetch('assigned_detective__'),
+        active_roles_prefetch('assigned_sergeant__'),
+        active_roles_prefetch('complaint__submitted_by__'),
+        Prefetch('suspects', queryset=Suspect.objects.select_related('user')),
+        Prefetch(
+            'guilt_scores',
+            queryset=GuiltScore.objects.select_related('assigned_by', 'suspect').prefetch_related(
+                active_roles_prefetch('assigned_by__')
+            )
+        ),
+        Prefetch(
+            'captain_decisions',
+            queryset=CaptainDecision.objects.select_related(
+                'decided_by', 'chief_approved_by', 'suspect'
+            ).prefetch_related(
+                active_roles_prefetch('decided_by__'),
+                active_roles_prefetch('chief_approved_by__')
+            )
+        ),
+        Prefetch(
+            'evidence_items',
+            queryset=Evidence.objects.select_related('recorded_by').prefetch_related(
+                active_roles_prefetch('recorded_by__')
+            )
+        ),
+        Prefetch('case_complainants', queryset=CaseComplainant.objects.select_related('complainant')),
+        Prefetch('case_witnesses', queryset=CaseWitness.objects.select_related('witness')),
+    )
+
+
+def build_case_dossier(case_id):
+    """
+    Serialize a case dossier from the database.
+
+    Args:
+        case_id: Primary key of the case
+
+    Returns:
+        dict: Serialized dossier (CaseDossierSerializer)
+    """
+    from apps.trials.serializers import CaseDossierSerializer
+
+    case = dossier_queryset().get(pk=case_id)
+    return dict(CaseDossierSerializer(case).data)
+
+
+def get_case_dossier(case_id):
+    """
+    Get a case dossier, served from the cache when one is stored.
+
+    Args:
+        case_id: Primary key of the case
+
+    Returns:
+        dict: Serialized dossier
+    """
+    timeout = settings.TRIAL_DOSSIER_CACHE_TIMEOUT
+    if not timeout or _has_uncommitted_changes(case_id):
+        return build_case_dossier(case_id)
+
+    global_version = _get_global_version()
+    if global_version is None:
+        # Cache backend is not storing anything (e.g. DummyCache)
+        return build_case_dossier(case_id)
+
+    key = _dossier_key(case_id, global_version)
+    dossier = cache.get(key)
+    if dossier is None:
+        dossier = build_case_dossier(case_id)
+        cache.set(key, dossier, timeout=timeout)
+    return dossier
+
+
+def _delete_case_dossier(case_id):
+    global_version = cache.get(GLOBAL_VERSION_KEY)
+    if global_version is not None:
+        cache.delete(_dossier_key(case_id, global_version))
+    _uncommitted_state().case_ids.discard(case_id)
+
+
+def _incr_global_version():
+    try:
+        cache.incr(GLOBAL_VERSION_KEY)
+    except ValueError:
+        cache.set(GLOBAL_VERSION_KEY, time.time_ns(), timeout=None)
+    _uncommitted_state().all = False
+
+
+def invalidate_case_dossier(case_id):
+    """Drop the cached dossier of one case once the transaction commits."""
+    if case_id is None:
+        return
+    _uncommitted_state().case_ids.add(case_id)
+    transaction.on_commit(lambda: _delete_case_dossier(case_id))
+
+
+def invalidate_all_dossiers():
+    """Make every cached dossier unreachable once the transaction commits."""
+    _uncommitted_state().all = True
+    transaction.on_commit(_incr_global_version)
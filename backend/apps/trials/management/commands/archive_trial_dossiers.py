@@ -0,0 +1,35 @@
+"""
+Management command to write dossier archives for completed trials.
+
+New verdicts are archived by TrialViewSet.record_verdict; this backfills
+trials decided before archives existed and rewrites archives left behind
+by an older ARCHIVE_FORMAT_VERSION. Safe to run repeatedly.
+"""
+import time
+from django.core.management.base import BaseCommand
+from apps.trials.archive import archive_trial, get_current_archive
+from apps.trials.models import Trial
+from apps.trials.serializers import TrialSerializer
+
+
+class Command(BaseCommand):
+    help = 'Archive the dossiers of completed trials that have no current archive'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true', help='Rewrite every archive, even current ones')
+    
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        trials = Trial.objects.filter(verdict__isnull=False).select_related('case', 'judge', 'dossier_archive')
+        archived = 0
+        for trial in trials.iterator(chunk_size=100):
+            if not trial.is_complete():
+                continue
+            if not options['rebuild'] and get_current_archive(trial) is not None:
+                continue
+            archive_trial(trial, TrialSerializer(trial).data)
+            archived += 1
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(f'Archived {archived} trial dossiers in {elapsed:.2f}s')
+        )
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-17 03:59
+
+import apps.trials.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('trials', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrialDossierArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('format_version', models.PositiveIntegerField(help_text='Document layout version; archives of older layouts are rebuilt')),
+                ('document', models.FileField(storage=apps.trials.models.dossier_archive_storage, upload_to='trials')),
+                ('etag', models.CharField(max_length=80)),
+                ('size', models.PositiveIntegerField(help_text='Uncompressed document size in bytes')),
+                ('archived_date', models.DateTimeField(auto_now=True)),
+                ('trial', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='dossier_archive', to='trials.trial')),
+            ],
+            options={
+                'verbose_name': 'Trial Dossier Archive',
+                'verbose_name_plural': 'Trial Dossier Archives',
+                'db_table': 'trial_dossier_archives',
+            },
+        ),
+    ]
@@ -53,3 +53,37 @@ class Trial(models.Model):
             (self.verdict == 'Not Guilty' or (self.punishment_title and self.punishment_description))
         )
 
+
+
+def dossier_archive_storage():
+    """Private storage for dossier archives (never served under MEDIA_URL)."""
+    from django.conf import settings
+    from django.core.files.storage import FileSystemStorage
+    return FileSystemStorage(location=settings.DOSSIER_ARCHIVE_ROOT)
+
+
+class TrialDossierArchive(models.Model):
+    """
+    Frozen, gzip-compressed trial document written when the verdict is
+    recorded, so completed trials are served without rebuilding the dossier.
+    """
+    trial = models.OneToOneField(
+        Trial,
+        on_delete=models.CASCADE,
+        related_name='dossier_archive'
+    )
+    format_version = models.PositiveIntegerField(
+        help_text='Document layout version; archives of older layouts are rebuilt'
+    )
+    document = models.FileField(storage=dossier_archive_storage, upload_to='trials')
+    etag = models.CharField(max_length=80)
+    size = models.PositiveIntegerField(help_text='Uncompressed document size in bytes')
+    archived_date = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'trial_dossier_archives'
+        verbose_name = 'Trial Dossier Archive'
+        verbose_name_plural = 'Trial Dossier Archives'
+    
+    def __str__(self):
+        return f'Dossier archive v{self.format_version} for {self.trial}'
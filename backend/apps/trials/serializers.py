@@ -68,7 +68,12 @@ class _ComplaintMiniSerializer(serializers.Serializer):
 # ─── Main case dossier serializer ─────────────────────────────────────────────
 
 class CaseDossierSerializer(serializers.ModelSerializer):
-    """Full case dossier for judge — all entities with complete details."""
+    """
+    Full case dossier for judge — all entities with complete details.
+
+    Sections read the case's related managers, so cases loaded through
+    apps.trials.dossier.dossier_queryset() serialize without further queries.
+    """
     created_by = UserDetailSerializer(read_only=True)
     assigned_detective = UserDetailSerializer(read_only=True)
     assigned_sergeant = UserDetailSerializer(read_only=True)
@@ -92,32 +97,26 @@ class CaseDossierSerializer(serializers.ModelSerializer):
         ]
 
     def get_suspects(self, obj):
-        from apps.investigations.models import Suspect
         from apps.investigations.serializers import SuspectListSerializer
-        qs = Suspect.objects.filter(case=obj).select_related('user')
-        return SuspectListSerializer(qs, many=True).data
+        return SuspectListSerializer(obj.suspects.all(), many=True).data
 
     def get_guilt_scores(self, obj):
-        from apps.investigations.models import GuiltScore
-        qs = GuiltScore.objects.filter(case=obj).select_related('assigned_by', 'suspect')
-        return _GuiltScoreMiniSerializer(qs, many=True).data
+        return _GuiltScoreMiniSerializer(obj.guilt_scores.all(), many=True).data
 
     def get_captain_decisions(self, obj):
-        from apps.investigations.models import CaptainDecision
-        qs = CaptainDecision.objects.filter(case=obj).select_related(
-            'decided_by', 'chief_approved_by', 'suspect'
-        )
-        return _CaptainDecisionMiniSerializer(qs, many=True).data
+        return _CaptainDecisionMiniSerializer(obj.captain_decisions.all(), many=True).data
 
     def get_evidence_items(self, obj):
-        from apps.evidence.models import Evidence
-        qs = Evidence.objects.filter(case=obj).select_related('recorded_by')
-        return _EvidenceMiniSerializer(qs, many=True).data
+        return _EvidenceMiniSerializer(obj.evidence_items.all(), many=True).data
 
     def get_complaints(self, obj):
         from apps.complaints.models import Complaint
-        qs = Complaint.objects.filter(case=obj).select_related('submitted_by')
-        return _ComplaintMiniSerializer(qs, many=True).data
+        # Complaint.case is one-to-one, so a case has at most one complaint
+        try:
+            complaint = obj.complaint
+        except Complaint.DoesNotExist:
+            return []
+        return _ComplaintMiniSerializer([complaint], many=True).data
 
     def get_complainants(self, obj):
         return [
@@ -129,7 +128,7 @@ class CaseDossierSerializer(serializers.ModelSerializer):
                 'phone_number': getattr(cc.complainant, 'phone_number', ''),
                 'notes': cc.notes,
             }
-            for cc in obj.case_complainants.select_related('complainant').all()
+            for cc in obj.case_complainants.all()
         ]
 
     def get_witnesses(self, obj):
@@ -141,7 +140,7 @@ class CaseDossierSerializer(serializers.ModelSerializer):
                 'witness_phone': cw.witness_phone or (cw.witness.phone_number if cw.witness else ''),
                 'notes': cw.notes,
             }
-            for cw in obj.case_witnesses.select_related('witness').all()
+            for cw in obj.case_witnesses.all()
         ]
 
 
@@ -149,7 +148,7 @@ class CaseDossierSerializer(serializers.ModelSerializer):
 
 class TrialSerializer(serializers.ModelSerializer):
     """Full trial detail — includes case dossier for judge."""
-    case = CaseDossierSerializer(read_only=True)
+    case = serializers.SerializerMethodField()
     judge = UserDetailSerializer(read_only=True)
     is_complete = serializers.SerializerMethodField()
 
@@ -162,6 +161,11 @@ class TrialSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_date', 'updated_date']
 
+    def get_case(self, obj):
+        """Case dossier (CaseDossierSerializer), cached per case."""
+        from apps.trials.dossier import get_case_dossier
+        return get_case_dossier(obj.case_id)
+
     def get_is_complete(self, obj):
         return obj.is_complete()
 
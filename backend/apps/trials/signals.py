@@ -0,0 +1,68 @@
+"""
+Signals invalidating cached case dossiers and cleaning up dossier archives.
+"""
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from apps.accounts.models import User, Role, RoleAssignment
+from apps.cases.models import Case, CaseComplainant, CaseWitness
+from apps.complaints.models import Complaint
+from apps.evidence.models import Evidence
+from apps.investigations.models import Suspect, GuiltScore, CaptainDecision
+from apps.trials.dossier import invalidate_case_dossier, invalidate_all_dossiers
+from apps.trials.models import TrialDossierArchive
+
+
+@receiver(post_save, sender=Case)
+@receiver(post_delete, sender=Case)
+def invalidate_dossier_on_case_change(sender, instance, **kwargs):
+    invalidate_case_dossier(instance.pk)
+
+
+@receiver(post_save, sender=Suspect)
+@receiver(post_delete, sender=Suspect)
+@receiver(post_save, sender=GuiltScore)
+@receiver(post_delete, sender=GuiltScore)
+@receiver(post_save, sender=CaptainDecision)
+@receiver(post_delete, sender=CaptainDecision)
+@receiver(post_save, sender=Evidence)
+@receiver(post_delete, sender=Evidence)
+@receiver(post_save, sender=Complaint)
+@receiver(post_delete, sender=Complaint)
+@receiver(post_save, sender=CaseComplainant)
+@receiver(post_delete, sender=CaseComplainant)
+@receiver(post_save, sender=CaseWitness)
+@receiver(post_delete, sender=CaseWitness)
+def invalidate_dossier_on_child_change(sender, instance, **kwargs):
+    """Every dossier section is a set of rows pointing at the case."""
+    invalidate_case_dossier(instance.case_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_dossiers_on_user_change(sender, instance, update_fields=None, **kwargs):
+    """Dossiers embed user details; logins only touch last_login."""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_all_dossiers()
+
+
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=RoleAssignment)
+@receiver(post_delete, sender=RoleAssignment)
+def invalidate_dossiers_on_role_change(sender, instance, **kwargs):
+    """Dossiers embed the active roles of every user they show."""
+    invalidate_all_dossiers()
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_dossiers_on_role_m2m_change(sender, action, **kwargs):
+    """Roles added through User.roles bypass RoleAssignment signals."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_all_dossiers()
+
+
+@receiver(post_delete, sender=TrialDossierArchive)
+def delete_archive_file(sender, instance, **kwargs):
+    """Archive files live in private storage; remove them with their row."""
+    if instance.document:
+        instance.document.delete(save=False)
@@ -0,0 +1,81 @@
+"""
+Tests for frozen dossier archives of completed trials.
+
+Run with:
+    python manage.py test apps.trials.tests.test_archive
+"""
+import gzip
+import json
+from io import StringIO
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.cases.models import Case
+from apps.investigations.models import Suspect
+from apps.trials.models import Trial, TrialDossierArchive
+from apps.trials.tests.test_trial_api import make_user
+
+
+class TrialArchiveTest(APITestCase):
+
+    def setUp(self):
+        self.judge = make_user('judge1', 'Judge')
+        self.case = Case.objects.create(
+            title='Fraud Case', description='Corporate fraud.', severity='Level 1',
+            created_by=self.judge,
+        )
+        Suspect.objects.create(case=self.case, name='Ali Ahmadi', national_id='1234567890')
+        self.trial = Trial.objects.create(case=self.case, judge=self.judge)
+        self.url = reverse('trial-detail', kwargs={'pk': self.trial.pk})
+        self.client.force_authenticate(user=self.judge)
+
+    def tearDown(self):
+        # Removes the archive files through the post_delete signal
+        TrialDossierArchive.objects.all().delete()
+
+    def _record_verdict(self):
+        url = reverse('trial-record-verdict', kwargs={'pk': self.trial.pk})
+        return self.client.post(url, {'verdict': 'Not Guilty'}, format='json')
+
+    def test_verdict_writes_archive(self):
+        resp = self._record_verdict()
+        archive = TrialDossierArchive.objects.get(trial=self.trial)
+        with archive.document.open('rb') as document:
+            stored = json.loads(gzip.decompress(document.read()))
+        self.assertEqual(stored['verdict'], 'Not Guilty')
+        self.assertEqual(stored['case']['status'], 'Resolved')
+        self.assertEqual(stored['id'], resp.data['id'])
+
+    def test_completed_trial_is_served_frozen(self):
+        self._record_verdict()
+        Suspect.objects.create(case=self.case, name='Late Suspect', national_id='999')
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp['Content-Type'], 'application/json')
+        body = json.loads(resp.content)
+        self.assertEqual([s['suspect_name'] for s in body['case']['suspects']], ['Ali Ahmadi'])
+
+    def test_etag_and_gzip(self):
+        self._record_verdict()
+        resp = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(resp['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(resp.content))['verdict'], 'Not Guilty')
+
+        resp = self.client.get(self.url, HTTP_IF_NONE_MATCH=resp['ETag'])
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_open_trial_is_served_live(self):
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotIn('ETag', resp)
+        self.assertFalse(TrialDossierArchive.objects.exists())
+
+    def test_command_backfills_historic_trials(self):
+        Trial.objects.filter(pk=self.trial.pk).update(verdict='Not Guilty', verdict_date=timezone.now())
+        out = StringIO()
+        call_command('archive_trial_dossiers', stdout=out)
+        self.assertIn('Archived 1 trial dossiers', out.getvalue())
+        call_command('archive_trial_dossiers', stdout=out)
+        self.assertIn('Archived 0 trial dossiers', out.getvalue())
@@ -0,0 +1,122 @@
+"""
+Tests for the trial dossier builder and its cache.
+
+Run with:
+    python manage.py test apps.trials.tests.test_dossier
+"""
+import threading
+from unittest import mock
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.cases.models import Case
+from apps.evidence.models import Evidence
+from apps.investigations.models import Suspect, GuiltScore
+from apps.trials.dossier import get_case_dossier
+from apps.trials.models import Trial
+from apps.trials.tests.test_trial_api import make_user
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class DossierTestMixin:
+
+    def setUp(self):
+        self.judge = make_user('judge1', 'Judge')
+        self.detective = make_user('detective1', 'Detective')
+        self.case = Case.objects.create(
+            title='Fraud Case', description='Corporate fraud.', severity='Level 1',
+            created_by=self.detective, assigned_detective=self.detective,
+        )
+        self.trial = Trial.objects.create(case=self.case, judge=self.judge)
+        self.url = reverse('trial-detail', kwargs={'pk': self.trial.pk})
+        self.client.force_authenticate(user=self.judge)
+
+    def _grow_case(self, start, count):
+        for i in range(start, start + count):
+            officer = make_user(f'officer{i}', 'Police Officer')
+            suspect = Suspect.objects.create(case=self.case, name=f'Suspect {i}', national_id=f'8{i:03d}')
+            GuiltScore.objects.create(
+                suspect=suspect, case=self.case, assigned_by=officer, score=5, justification='-'
+            )
+            Evidence.objects.create(
+                title=f'Item {i}', description='-', evidence_type='other',
+                case=self.case, recorded_by=officer
+            )
+
+
+class DossierQueryTest(DossierTestMixin, APITestCase):
+
+    def test_dossier_query_count_is_fixed(self):
+        self._grow_case(0, 1)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+        self._grow_case(1, 6)
+        with CaptureQueriesContext(connection) as large:
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(resp.data['case']['suspects']), 7)
+        self.assertEqual(len(large), len(small))
+        score = resp.data['case']['guilt_scores'][0]
+        self.assertEqual(score['assigned_by']['roles'][0]['name'], 'Police Officer')
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DossierCacheTest(DossierTestMixin, APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        # Dossiers are invalidated on commit (see apps.trials.dossier)
+        with self.captureOnCommitCallbacks(execute=True):
+            super().setUp()
+
+    def test_reopening_is_served_from_cache(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._grow_case(0, 3)
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as reopened:
+            resp = self.client.get(self.url)
+        self.assertEqual(len(resp.data['case']['evidence_items']), 3)
+        self.assertFalse(any('evidence' in query['sql'] for query in reopened.captured_queries))
+
+    def test_child_change_refreshes_dossier(self):
+        self.client.get(self.url)
+        Suspect.objects.create(case=self.case, name='Late Suspect', national_id='999')
+        resp = self.client.get(self.url)
+        self.assertEqual([s['suspect_name'] for s in resp.data['case']['suspects']], ['Late Suspect'])
+
+    def test_role_change_refreshes_dossier(self):
+        self.client.get(self.url)
+        self.detective.roles.clear()
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.data['case']['created_by']['roles'], [])
+
+    def test_read_before_commit_does_not_outlive_change(self):
+        def concurrent_read():
+            # Another request, not seeing the uncommitted suspect yet
+            with mock.patch('apps.trials.dossier.build_case_dossier', return_value={'suspects': []}):
+                get_case_dossier(self.case.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                Suspect.objects.create(case=self.case, name='Late Suspect', national_id='999')
+                reader = threading.Thread(target=concurrent_read)
+                reader.start()
+                reader.join()
+        resp = self.client.get(self.url)
+        self.assertEqual([s['suspect_name'] for s in resp.data['case']['suspects']], ['Late Suspect'])
+
+    def test_rolled_back_change_is_not_cached(self):
+        try:
+            with transaction.atomic():
+                Suspect.objects.create(case=self.case, name='Rolled Back', national_id='999')
+                self.client.get(self.url)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        resp = self.client.get(self.url)
+        self.assertEqual(resp.data['case']['suspects'], [])
@@ -10,6 +10,8 @@ from .models import Trial
 from .serializers import (
     TrialSerializer, TrialListSerializer, TrialCreateSerializer, TrialVerdictSerializer
 )
+from .archive import archive_trial, archive_response, get_current_archive
+from apps.accounts.models import active_roles_prefetch
 
 
 class TrialViewSet(viewsets.ModelViewSet):
@@ -33,7 +35,11 @@ class TrialViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """All authenticated users can list trials; Judge owns their own."""
-        queryset = Trial.objects.select_related('case', 'judge')
+        queryset = Trial.objects.select_related(
+            'case', 'judge'
+        ).prefetch_related(active_roles_prefetch('judge__'))
+        if self.action == 'retrieve':
+            queryset = queryset.select_related('dossier_archive')
 
         # Filter by case
         case_id = self.request.query_params.get('case', None)
@@ -55,6 +61,23 @@ class TrialViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(judge=self.request.user)
 
+    def retrieve(self, request, *args, **kwargs):
+        """Serve completed trials from their frozen dossier archive."""
+        trial = self.get_object()
+        if not trial.is_complete():
+            return Response(self.get_serializer(trial).data)
+
+        archive = get_current_archive(trial)
+        if archive is None:
+            archive = archive_trial(trial, self.get_serializer(trial).data)
+        return archive_response(request, archive)
+
+    def perform_update(self, serializer):
+        """Keep the archive of a completed trial in step with edits."""
+        trial = serializer.save()
+        if trial.is_complete():
+            archive_trial(trial, TrialSerializer(trial, context=self.get_serializer_context()).data)
+
     @action(detail=True, methods=['post'], permission_classes=[IsJudge])
     def record_verdict(self, request, pk=None):
         """Judge records verdict and punishment."""
@@ -103,4 +126,8 @@ class TrialViewSet(viewsets.ModelViewSet):
                         set_by=request.user
                     )
 
-        return Response(TrialSerializer(trial, context={'request': request}).data)
+        data = TrialSerializer(trial, context={'request': request}).data
+        if trial.is_complete():
+            # The case is now Resolved and final: freeze the dossier
+            archive_trial(trial, data)
+        return Response(data)
@@ -5,6 +5,7 @@ Base settings shared across all environments.
 from pathlib import Path
 from decouple import config
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -90,6 +91,50 @@ DATABASES = {
     }
 }
 
+# Cache
+# The web workers and the notification worker share counters and role and
+# token caches through it, so deployments must point CACHE_BACKEND and
+# CACHE_LOCATION at a shared cache such as Redis (the docker-compose files
+# do). The file-based default only suits local development; without DEBUG
+# it fails the core.E001 system check.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('CACHE_LOCATION', default=os.path.join(tempfile.gettempdir(), 'karagah_cache')),
+    }
+}
+
+# Seconds a user's resolved role set stays in the shared cache. Revocations
+# bump a per-user version, so this only bounds memory, not staleness.
+ROLE_CACHE_TIMEOUT = config('ROLE_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Seconds an API token stays valid after it is issued (0 = never expires).
+# Expired tokens are replaced on login and deleted by sweep_expired_tokens.
+AUTH_TOKEN_TTL = config('AUTH_TOKEN_TTL', default=7 * 24 * 3600, cast=int)
+
+# Seconds a token's resolved user is cached, sparing the token lookup query
+# (0 disables). Logout, deactivation and password changes evict it at once.
+AUTH_TOKEN_CACHE_TIMEOUT = config('AUTH_TOKEN_CACHE_TIMEOUT', default=300, cast=int)
+
+# Seconds the home-page case statistics snapshot is served from the cache.
+CASE_STATS_CACHE_TIMEOUT = config('CASE_STATS_CACHE_TIMEOUT', default=60, cast=int)
+
+# Seconds a serialized trial dossier stays cached (0 disables). Changes to
+# the case, its child rows, users or roles drop it earlier.
+TRIAL_DOSSIER_CACHE_TIMEOUT = config('TRIAL_DOSSIER_CACHE_TIMEOUT', default=600, cast=int)
+
+# Seconds during which repeated case assignments of the same user to the same
+# case are merged into the notification already sent (0 disables).
+NOTIFICATION_COALESCE_WINDOW = config('NOTIFICATION_COALESCE_WINDOW', default=300, cast=int)
+
+# Seconds a user's cached unread notification count lives before it is
+# recounted; creates and reads adjust it in between.
+NOTIFICATION_UNREAD_CACHE_TIMEOUT = config('NOTIFICATION_UNREAD_CACHE_TIMEOUT', default=3600, cast=int)
+
+# Paginated lists report the PostgreSQL planner's row estimate instead of
+# an exact COUNT(*) once it reaches this many rows (0 always counts exactly).
+PAGINATION_ESTIMATE_THRESHOLD = config('PAGINATION_ESTIMATE_THRESHOLD', default=10000, cast=int)
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -109,6 +154,37 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Password hashers, preferred first. Hashes made by the others still verify
+# and are upgraded after the response of a successful login is sent, on the
+# same worker (see apps.accounts.hashers).
+PASSWORD_HASHERS = config(
+    'PASSWORD_HASHERS',
+    default=(
+        'apps.accounts.hashers.TunedArgon2PasswordHasher,'
+        'django.contrib.auth.hashers.PBKDF2PasswordHasher,'
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher,'
+        'django.contrib.auth.hashers.Argon2PasswordHasher,'
+        'django.contrib.auth.hashers.ScryptPasswordHasher'
+    ),
+    cast=lambda v: [s.strip() for s in v.split(',')]
+)
+
+# Argon2 cost parameters of TunedArgon2PasswordHasher. The defaults are the
+# OWASP minimum (19 MiB, 2 passes, 1 lane), which verifies in a fraction of
+# the time of 720,000 PBKDF2 iterations. Changing them rehashes on login.
+ARGON2_TIME_COST = config('ARGON2_TIME_COST', default=2, cast=int)
+ARGON2_MEMORY_COST = config('ARGON2_MEMORY_COST', default=19456, cast=int)
+ARGON2_PARALLELISM = config('ARGON2_PARALLELISM', default=1, cast=int)
+
+# Bulk user import (apps.accounts.bulk_import): users inserted per batch, and
+# processes the import_users command hashes passwords with (0 uses one per
+# CPU, 1 hashes in-process). The admin API always hashes in-process and
+# accepts at most USER_IMPORT_API_MAX_ROWS rows, keeping a request well
+# within the gunicorn timeout.
+USER_IMPORT_BATCH_SIZE = config('USER_IMPORT_BATCH_SIZE', default=500, cast=int)
+USER_IMPORT_HASH_WORKERS = config('USER_IMPORT_HASH_WORKERS', default=0, cast=int)
+USER_IMPORT_API_MAX_ROWS = config('USER_IMPORT_API_MAX_ROWS', default=500, cast=int)
+
 # Internationalization
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
@@ -123,18 +199,22 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Compressed dossiers of completed trials. Kept outside MEDIA_ROOT because
+# media files are served publicly.
+DOSSIER_ARCHIVE_ROOT = config('DOSSIER_ARCHIVE_ROOT', default=str(BASE_DIR / 'dossier_archives'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'apps.accounts.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
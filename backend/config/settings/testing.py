@@ -21,11 +21,24 @@ class DisableMigrations:
 
 MIGRATION_MODULES = DisableMigrations()
 
+# No shared cache between tests; caching tests opt in with override_settings
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.dummy.DummyCache',
+    }
+}
+
+# Keep archives written by tests out of the project tree
+DOSSIER_ARCHIVE_ROOT = os.path.join(tempfile.gettempdir(), 'karagah_test_dossier_archives')
+
 # Password hashers for faster tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
 ]
 
+# Hash imported passwords in-process instead of spawning a pool
+USER_IMPORT_HASH_WORKERS = 1
+
 # Disable logging during tests
 LOGGING_CONFIG = None
 
@@ -91,6 +91,7 @@ urlpatterns = [
     path('api/trials/', include('apps.trials.urls')),
     path('api/rewards/', include('apps.rewards.urls')),
     path('api/payments/', include('apps.payments.urls')),
+    path('api/notifications/', include('core.urls')),
 ]
 
 from django.urls import re_path
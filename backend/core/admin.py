@@ -2,7 +2,7 @@
 Admin configuration for core app.
 """
 from django.contrib import admin
-from .models import Notification, AuditLog
+from .models import Notification, NotificationEvent, AuditLog
 
 
 @admin.register(Notification)
@@ -12,6 +12,13 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ['title', 'message']
 
 
+@admin.register(NotificationEvent)
+class NotificationEventAdmin(admin.ModelAdmin):
+    list_display = ['event_type', 'attempts', 'created_at']
+    list_filter = ['event_type']
+    readonly_fields = ['created_at']
+
+
 @admin.register(AuditLog)
 class AuditLogAdmin(admin.ModelAdmin):
     list_display = ['action', 'model_name', 'user', 'timestamp']
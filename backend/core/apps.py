@@ -10,6 +10,13 @@ class CoreConfig(AppConfig):
     verbose_name = 'Core'
     
     def ready(self):
-        """Import signals when app is ready."""
+        """Import signals, outbox handlers, checks and visibility policies when app is ready."""
+        from django.utils.module_loading import autodiscover_modules
+        import core.checks  # noqa
         import core.signals  # noqa
+        import core.notifications  # noqa
+        import core.deferred  # noqa
+        
+        # Each app registers its policies in visibility.py (see core.visibility)
+        autodiscover_modules('visibility')
 
@@ -0,0 +1,31 @@
+"""
+System checks for deployment settings the core app relies on.
+"""
+from django.conf import settings
+from django.core.checks import Error, Warning, register
+
+# Backends whose data lives in one process or on one container's disk
+LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.filebased.FileBasedCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(deploy=False)
+def check_shared_cache(app_configs, **kwargs):
+    """
+    Unread notification counters, role sets and tokens are kept in the
+    default cache and adjusted by both the web workers and the notification
+    worker, so they must share one cache with atomic increments. Without
+    DEBUG a local backend is an error, which stops migrate and the worker
+    from starting.
+    """
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    message = f'The default cache ({backend}) is not shared between processes and containers.'
+    hint = 'Set CACHE_BACKEND and CACHE_LOCATION to a shared cache such as Redis.'
+    if settings.DEBUG:
+        return [Warning(message, hint=hint, id='core.W001')]
+    return [Error(message, hint=hint, id='core.E001')]
@@ -0,0 +1,58 @@
+"""
+Work deferred until the current response has been sent.
+
+after_response() queues a callable that runs from the request_finished
+signal, i.e. once the WSGI server has written the response and closes it,
+so the client is not kept waiting on it. The worker process is, though:
+it serves no other request until the callables return, so this moves
+latency off the client, not load off the server. Outside a request
+(management commands, the shell) callables run immediately. A failing
+callable is logged and does not affect the others.
+"""
+import logging
+import threading
+
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+def after_response(callback):
+    """
+    Run a callable once the current response has been sent.
+    
+    Args:
+        callback: Callable taking no arguments
+    """
+    pending = getattr(_local, 'pending', None)
+    if pending is None:
+        callback()
+    else:
+        pending.append(callback)
+
+
+@receiver(request_started)
+def start_collecting(**kwargs):
+    _local.pending = []
+
+
+@receiver(request_finished)
+def run_deferred(**kwargs):
+    pending = getattr(_local, 'pending', None)
+    _local.pending = None
+    if not pending:
+        return
+    for callback in pending:
+        try:
+            callback()
+        except Exception:
+            logger.exception('Deferred callback %r failed', callback)
+    # request_finished closed the request's connections before this ran;
+    # leave alone any connection still inside a transaction (e.g. a test's)
+    for conn in connections.all(initialized_only=True):
+        if not conn.in_atomic_block:
+            conn.close_if_unusable_or_obsolete()
@@ -0,0 +1,41 @@
+"""
+Management command draining the notification outbox (see core.outbox).
+
+Run it with --loop as a long-lived worker next to the web processes; several
+workers may run at once, since each claims its batch with SKIP LOCKED.
+Without --loop it drains the queue once and exits (e.g. from cron).
+"""
+import time
+from django.core.management.base import BaseCommand
+from core.outbox import process_batch
+
+
+class Command(BaseCommand):
+    help = 'Turn queued notification events into notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Events claimed per transaction')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new events')
+        parser.add_argument('--interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        total_events = total_notifications = 0
+        while True:
+            events, notifications = process_batch(options['batch_size'])
+            total_events += events
+            total_notifications += notifications
+            # A full batch means more events are probably waiting
+            if events == options['batch_size']:
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Processed {total_events} events into {total_notifications} notifications '
+                f'in {elapsed:.2f}s'
+            )
+        )
@@ -1,5 +1,5 @@
 """
-Core models: Notifications and Audit Logs.
+Core models: Notifications, the notification outbox and Audit Logs.
 """
 from django.db import models
 from django.contrib.contenttypes.models import ContentType
@@ -50,17 +50,54 @@ class Notification(models.Model):
         indexes = [
             models.Index(fields=['user', 'is_read']),
             models.Index(fields=['type']),
+            # Inbox order (see NotificationViewSet)
+            models.Index(fields=['user', '-created_at', '-id'], name='notifications_inbox_idx'),
         ]
     
     def __str__(self):
         return f'{self.title} - {self.user.username}'
     
     def mark_as_read(self):
-        """Mark notification as read."""
+        """
+        Mark notification as read.
+        
+        The UPDATE only matches an unread row, so concurrent calls move the
+        cached unread counter (core.unread) once.
+        """
         from django.utils import timezone
+        from core.unread import adjust_unread_counts
+        if self.is_read:
+            return
+        now = timezone.now()
+        updated = Notification.objects.filter(pk=self.pk, is_read=False).update(is_read=True, read_at=now)
         self.is_read = True
-        self.read_at = timezone.now()
-        self.save()
+        self.read_at = now
+        if updated:
+            adjust_unread_counts({self.user_id: -1})
+
+
+class NotificationEvent(models.Model):
+    """
+    Outbox entry describing something users should be notified about.
+    
+    Writes enqueue events (see core.outbox); the process_notification_outbox
+    worker turns them into Notification rows in batches and deletes them.
+    Events that keep failing stay in the table with their last error.
+    """
+    event_type = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'notification_events'
+        ordering = ['id']
+        verbose_name = 'Notification Event'
+        verbose_name_plural = 'Notification Events'
+    
+    def __str__(self):
+        return f'{self.event_type} #{self.pk}'
 
 
 class AuditLog(models.Model):
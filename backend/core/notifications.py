@@ -0,0 +1,121 @@
+"""
+Notification outbox handlers (see core.outbox).
+
+Each handler resolves the rows a batch of events refers to with one query
+and returns the Notification rows to insert. Events whose rows have since
+been deleted produce no notification.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from apps.cases.models import Case
+from apps.complaints.models import Complaint
+from apps.evidence.models import Evidence
+from core.models import Notification
+from core.outbox import handles
+
+
+def _by_id(queryset, events, key):
+    return queryset.in_bulk({event.payload[key] for event in events})
+
+
+@handles('evidence_added')
+def evidence_added(events):
+    """Notify the case's detective of new evidence they did not add themselves."""
+    evidence_items = _by_id(Evidence.objects.select_related('case'), events, 'evidence_id')
+    notifications = []
+    for event in events:
+        evidence = evidence_items.get(event.payload['evidence_id'])
+        if evidence is None or evidence.case is None:
+            continue
+        detective_id = evidence.case.assigned_detective_id
+        if detective_id is None or detective_id == evidence.recorded_by_id:
+            continue
+        notifications.append(Notification(
+            user_id=detective_id,
+            type='new_evidence',
+            title='New Evidence Added',
+            message=f'New "{evidence.get_evidence_type_display()}" evidence ({evidence.title}) was just added to Case #{evidence.case.id}.',
+            related_case=evidence.case
+        ))
+    return notifications
+
+
+@handles('evidence_verified')
+def evidence_verified(events):
+    """Notify the case's detective of a forensic verification result."""
+    evidence_items = _by_id(Evidence.objects.select_related('case'), events, 'evidence_id')
+    notifications = []
+    for event in events:
+        evidence = evidence_items.get(event.payload['evidence_id'])
+        if evidence is None or evidence.case is None or evidence.case.assigned_detective_id is None:
+            continue
+        status_str = "VALID" if event.payload['is_valid'] else "INVALID"
+        notifications.append(Notification(
+            user_id=evidence.case.assigned_detective_id,
+            type='new_evidence',
+            title='Evidence Verified',
+            message=f'Biological evidence "{evidence.title}" has been verified as {status_str} by the Forensic Doctor.',
+            related_case=evidence.case
+        ))
+    return notifications
+
+
+@handles('complaint_status')
+def complaint_status(events):
+    """Notify complainants of the outcome of their complaint."""
+    complaints = _by_id(Complaint.objects.all(), events, 'complaint_id')
+    notifications = []
+    for event in events:
+        complaint = complaints.get(event.payload['complaint_id'])
+        if complaint is None or complaint.submitted_by_id is None:
+            continue
+        status = event.payload['status']
+        notifications.append(Notification(
+            user_id=complaint.submitted_by_id,
+            type='complaint_review',
+            title=f'Complaint {status}',
+            message=f'Your complaint "{complaint.title}" has been {status.lower()}.',
+            related_case_id=complaint.case_id
+        ))
+    return notifications
+
+
+@handles('case_assigned')
+def case_assigned(events):
+    """
+    Notify detectives and sergeants assigned to a case.
+    
+    Bursts are coalesced: a user gets one notification per case, whether the
+    assignment was repeated within the batch or already notified less than
+    NOTIFICATION_COALESCE_WINDOW seconds ago.
+    """
+    cases = _by_id(Case.objects.all(), events, 'case_id')
+    wanted = {
+        (user_id, event.payload['case_id'])
+        for event in events
+        if event.payload['case_id'] in cases
+        for user_id in event.payload['user_ids']
+    }
+    
+    window = settings.NOTIFICATION_COALESCE_WINDOW
+    if window and wanted:
+        recent = Notification.objects.filter(
+            type='case_update',
+            title='Case Assigned',
+            user_id__in={user_id for user_id, _ in wanted},
+            related_case_id__in={case_id for _, case_id in wanted},
+            created_at__gte=timezone.now() - timedelta(seconds=window)
+        ).values_list('user_id', 'related_case_id')
+        wanted -= set(recent)
+    
+    return [
+        Notification(
+            user_id=user_id,
+            type='case_update',
+            title='Case Assigned',
+            message=f'You have been assigned to case "{cases[case_id].title}".',
+            related_case=cases[case_id]
+        )
+        for user_id, case_id in sorted(wanted)
+    ]
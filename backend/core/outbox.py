@@ -0,0 +1,104 @@
+"""
+Notification outbox.
+
+Request handlers and signals used to build Notification rows inline, which
+added the lookups needed to address and word them (case, detective, ...)
+plus an INSERT per recipient to every write. Instead they now call
+enqueue(), which records a lightweight NotificationEvent once the current
+transaction commits, so rolled-back writes never notify anyone.
+
+The process_notification_outbox command drains the queue: it claims a batch
+of events with SELECT ... FOR UPDATE SKIP LOCKED (so several workers can
+run side by side), hands each event type to its handler to resolve
+recipients in bulk, inserts the resulting notifications with bulk_create
+and deletes the events, all in one transaction. If a handler fails, its
+events are kept with the error and retried up to MAX_ATTEMPTS times.
+
+Handlers live in core.notifications and are registered with @handles().
+"""
+from django.db import transaction
+
+# Attempts after which a failing event is left for inspection
+MAX_ATTEMPTS = 5
+
+_handlers = {}
+
+
+def handles(event_type):
+    """
+    Decorator registering the handler of an event type.
+    
+    The handler receives a list of NotificationEvent instances and returns
+    unsaved Notification instances for them.
+    """
+    def decorator(handler):
+        _handlers[event_type] = handler
+        return handler
+    return decorator
+
+
+def enqueue(event_type, **payload):
+    """
+    Queue a notification event once the current transaction commits.
+    
+    Args:
+        event_type: Registered event type, e.g. 'evidence_added'
+        **payload: JSON-serializable event data (ids rather than instances)
+    """
+    from core.models import NotificationEvent
+    
+    transaction.on_commit(
+        lambda: NotificationEvent.objects.create(event_type=event_type, payload=payload)
+    )
+
+
+def process_batch(batch_size=500):
+    """
+    Turn one batch of queued events into notifications.
+    
+    Args:
+        batch_size: Maximum number of events claimed
+        
+    Returns:
+        tuple: (events processed, notifications created)
+    """
+    from core.models import Notification, NotificationEvent
+    from core.unread import notifications_created
+    
+    with transaction.atomic():
+        events = list(
+            NotificationEvent.objects.filter(attempts__lt=MAX_ATTEMPTS)
+            .select_for_update(skip_locked=True)
+            .order_by('id')[:batch_size]
+        )
+        if not events:
+            return 0, 0
+        
+        by_type = {}
+        for event in events:
+            by_type.setdefault(event.event_type, []).append(event)
+        
+        notifications = []
+        done = []
+        failed = []
+        for event_type, typed_events in by_type.items():
+            handler = _handlers.get(event_type)
+            try:
+                if handler is None:
+                    raise LookupError(f'No handler registered for {event_type!r} events')
+                with transaction.atomic():
+                    notifications.extend(handler(typed_events))
+            except Exception as error:
+                for event in typed_events:
+                    event.attempts += 1
+                    event.last_error = f'{type(error).__name__}: {error}'
+                failed.extend(typed_events)
+            else:
+                done.extend(typed_events)
+        
+        Notification.objects.bulk_create(notifications, batch_size=batch_size)
+        notifications_created(notifications)
+        NotificationEvent.objects.filter(pk__in=[event.pk for event in done]).delete()
+        NotificationEvent.objects.bulk_update(failed, ['attempts', 'last_error'])
+    
+    return len(events), len(notifications)
@@ -1,7 +1,15 @@
 """
 Custom pagination classes.
 """
-from rest_framework.pagination import PageNumberPagination
+import json
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -15,3 +23,156 @@ class LargeResultsSetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 200
 
+
+def estimate_count(queryset):
+    """
+    Ask the PostgreSQL planner how many rows a queryset returns.
+    
+    Unfiltered querysets use the table's pg_class.reltuples; anything else
+    uses the row estimate of EXPLAIN. Neither reads the table itself.
+    
+    Args:
+        queryset: QuerySet to estimate
+        
+    Returns:
+        int or None: Estimated row count, or None when no estimate is
+        available (other database backends, never-analyzed tables)
+    """
+    if not hasattr(queryset, 'query'):
+        return None
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    
+    with connection.cursor() as cursor:
+        if not queryset.query.has_filters() and not queryset.query.distinct:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = plan[0]['Plan']['Plan Rows']
+    # reltuples is -1 for tables that were never vacuumed or analyzed
+    return int(estimate) if estimate >= 0 else None
+
+
+class EstimatedPage(Page):
+    """Page whose next-page check does not rely on an estimated count."""
+    
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+    
+    def has_next(self):
+        return self._has_next
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that trusts the planner's row estimate for large result sets.
+    
+    Below PAGINATION_ESTIMATE_THRESHOLD rows the count is exact. Above it the
+    estimate is used, so pages past the estimated end stay reachable and
+    has_next() is decided by fetching one extra row.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estimate_threshold = settings.PAGINATION_ESTIMATE_THRESHOLD
+        self.count_is_estimate = False
+    
+    @cached_property
+    def count(self):
+        estimate = estimate_count(self.object_list) if self.estimate_threshold else None
+        if estimate is not None and estimate >= self.estimate_threshold:
+            self.count_is_estimate = True
+            return estimate
+        return Paginator.count.func(self)
+    
+    def validate_number(self, number):
+        if self.count and self.count_is_estimate:
+            try:
+                number = int(number)
+            except (TypeError, ValueError):
+                raise PageNotAnInteger('That page number is not an integer')
+            if number < 1:
+                raise EmptyPage('That page number is less than 1')
+            return number
+        return super().validate_number(number)
+    
+    def page(self, number):
+        number = self.validate_number(number)
+        if not self.count_is_estimate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        return EstimatedPage(rows[:self.per_page], number, self, has_next=len(rows) > self.per_page)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Page-number pagination whose count may be a planner estimate on large
+    tables; responses say so with `count_is_estimate`.
+    """
+    django_paginator_class = EstimatedCountPaginator
+    
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.paginator.count),
+            ('count_is_estimate', self.page.paginator.count_is_estimate),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+    
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_is_estimate'] = {'type': 'boolean', 'example': False}
+        return response_schema
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a fixed (timestamp, id) ordering.
+    
+    Each page is a range scan from the previous page's last timestamp, so it
+    needs neither COUNT(*) nor OFFSET and costs the same at any depth.
+    """
+    ordering = ('-created_date', '-id')
+    
+    def get_ordering(self, request, queryset, view):
+        # Client-chosen orderings (?ordering=) would break cursor stability
+        # and miss the timestamp index, so the pagination ordering always wins
+        return tuple(getattr(view, 'cursor_ordering', self.ordering))
+
+
+class OptionalCursorPagination(EstimatedCountPagination):
+    """
+    Page-number pagination by default; keyset pagination when the request
+    carries a cursor parameter (send `?cursor=` for the first page).
+    
+    Views may set `cursor_ordering` when their timestamp field is not
+    created_date, e.g. ('-timestamp', '-id').
+    """
+    cursor_query_param = 'cursor'
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.cursor_query_param in request.query_params:
+            self.keyset = KeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+    
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
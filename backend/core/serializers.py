@@ -0,0 +1,17 @@
+"""
+Serializers for core app.
+"""
+from rest_framework import serializers
+from core.models import Notification
+
+
+class NotificationSerializer(serializers.ModelSerializer):
+    """Serializer for Notification model."""
+    
+    class Meta:
+        model = Notification
+        fields = [
+            'id', 'type', 'title', 'message', 'related_case',
+            'is_read', 'read_at', 'created_at'
+        ]
+        read_only_fields = fields
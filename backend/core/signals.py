@@ -1,7 +1,10 @@
 """
 Django signals for automatic notifications and status updates.
+
+Notifications are queued on the outbox (core.outbox) rather than created
+inline, so these handlers never look up recipients on the write path.
 """
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
@@ -9,7 +12,9 @@ from apps.evidence.models import Evidence
 from apps.cases.models import Case
 from apps.investigations.models import Suspect
 from apps.complaints.models import Complaint
-from core.models import Notification, AuditLog
+from core.models import Notification
+from core.outbox import enqueue
+from core.unread import adjust_unread_counts, notifications_created
 
 
 @receiver(post_save, sender=Evidence)
@@ -17,14 +22,8 @@ def notify_detective_new_evidence(sender, instance, created, **kwargs):
     """
     Notify detective when new evidence is added to their case.
     """
-    if created and instance.case and instance.case.assigned_detective:
-        Notification.objects.create(
-            user=instance.case.assigned_detective,
-            type='new_evidence',
-            title='New Evidence Added',
-            message=f'New evidence "{instance.title}" has been added to case "{instance.case.title}".',
-            related_case=instance.case
-        )
+    if created and instance.case_id:
+        enqueue('evidence_added', evidence_id=instance.pk)
 
 
 @receiver(pre_save, sender=Suspect)
@@ -44,40 +43,53 @@ def notify_complainant_complaint_status(sender, instance, created, **kwargs):
     """
     Notify complainant when complaint status changes.
     """
-    if not created and instance.submitted_by:
+    if not created and instance.submitted_by_id:
         if instance.status in ['Approved', 'Rejected', 'Permanently Rejected']:
-            Notification.objects.create(
-                user=instance.submitted_by,
-                type='complaint_review',
-                title=f'Complaint {instance.status}',
-                message=f'Your complaint "{instance.title}" has been {instance.status.lower()}.',
-                related_case=instance.case if instance.case else None
-            )
+            enqueue('complaint_status', complaint_id=instance.pk, status=instance.status)
+
+
+@receiver(pre_save, sender=Case)
+def detect_case_assignment(sender, instance, update_fields=None, **kwargs):
+    """
+    Work out who is newly assigned before the save overwrites the row.
+    
+    As before the outbox, assignees of a case being created are not notified.
+    """
+    if instance._state.adding:
+        instance._new_assignee_ids = []
+    elif update_fields is not None and not {'assigned_detective', 'assigned_sergeant'} & set(update_fields):
+        instance._new_assignee_ids = []
+    else:
+        instance._new_assignee_ids = instance.get_new_assignee_ids()
 
 
 @receiver(post_save, sender=Case)
 def notify_on_case_assignment(sender, instance, created, **kwargs):
     """
     Notify detective or sergeant when assigned to a case.
+    
+    Only actual changes to an existing case notify: saves that keep the same
+    assignees (status updates, approvals, verdicts, ...) send nothing.
+    """
+    user_ids = instance.__dict__.pop('_new_assignee_ids', [])
+    instance.remember_assignees()
+    if user_ids:
+        enqueue('case_assigned', case_id=instance.pk, user_ids=user_ids)
+
+
+@receiver(post_save, sender=Notification)
+def count_created_notification(sender, instance, created, **kwargs):
+    """
+    Keep the unread counter in step with notifications created one by one.
     """
-    if not created:
-        # Check if detective was assigned
-        if instance.assigned_detective:
-            Notification.objects.create(
-                user=instance.assigned_detective,
-                type='case_update',
-                title='Case Assigned',
-                message=f'You have been assigned to case "{instance.title}".',
-                related_case=instance
-            )
-        
-        # Check if sergeant was assigned
-        if instance.assigned_sergeant:
-            Notification.objects.create(
-                user=instance.assigned_sergeant,
-                type='case_update',
-                title='Case Assigned',
-                message=f'You have been assigned to case "{instance.title}".',
-                related_case=instance
-            )
+    if created:
+        notifications_created([instance])
 
+
+@receiver(post_delete, sender=Notification)
+def uncount_deleted_notification(sender, instance, **kwargs):
+    """
+    Keep the unread counter in step with deleted unread notifications.
+    """
+    if not instance.is_read:
+        adjust_unread_counts({instance.user_id: -1})
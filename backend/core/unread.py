@@ -0,0 +1,77 @@
+"""
+Cached per-user count of unread notifications.
+
+Every logged-in page polls the notification badge, so the count is kept in
+the cache and adjusted as notifications are created and read, instead of
+being recounted per request. A cold counter is rebuilt with one indexed
+COUNT on (user, is_read) and expires after NOTIFICATION_UNREAD_CACHE_TIMEOUT
+seconds, which also heals any drift from adjustments lost to eviction.
+
+Adjustments are applied once the surrounding transaction commits, so a
+rolled-back write never moves a counter. Most are made by the notification
+worker, so the counters need a cache shared with the web workers and
+atomic increments (see core.checks).
+"""
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+def _unread_key(user_id):
+    return f'core:notifications:unread:{user_id}'
+
+
+def get_unread_count(user_id):
+    """
+    Get the number of unread notifications of a user.
+    
+    Args:
+        user_id: Primary key of the user
+        
+    Returns:
+        int: Unread notifications
+    """
+    from core.models import Notification
+    
+    key = _unread_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(key, count, timeout=settings.NOTIFICATION_UNREAD_CACHE_TIMEOUT)
+    return max(count, 0)
+
+
+def _adjust(deltas):
+    for user_id, delta in deltas.items():
+        if not delta:
+            continue
+        try:
+            cache.incr(_unread_key(user_id), delta)
+        except ValueError:
+            # Counter not cached; the next read rebuilds it
+            pass
+
+
+def adjust_unread_counts(deltas):
+    """
+    Move users' unread counters once the current transaction commits.
+    
+    Args:
+        deltas: Mapping of user ID -> change in unread notifications
+    """
+    deltas = dict(deltas)
+    transaction.on_commit(lambda: _adjust(deltas))
+
+
+def notifications_created(notifications):
+    """
+    Count freshly inserted notifications towards their users' counters.
+    
+    Args:
+        notifications: Iterable of created Notification instances
+    """
+    adjust_unread_counts(Counter(
+        notification.user_id for notification in notifications if not notification.is_read
+    ))
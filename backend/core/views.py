@@ -0,0 +1,58 @@
+"""
+Views for core app: the notification inbox.
+"""
+from django.utils import timezone
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from core.models import Notification
+from core.pagination import OptionalCursorPagination
+from core.serializers import NotificationSerializer
+from core.unread import adjust_unread_counts, get_unread_count
+
+
+class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for the requesting user's notifications.
+    
+    The badge polls unread_count, which is served from a cached counter
+    (core.unread) and never counts the notifications table.
+    """
+    serializer_class = NotificationSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = OptionalCursorPagination
+    cursor_ordering = ('-created_at', '-id')
+    
+    def get_queryset(self):
+        """Limit notifications to the requesting user."""
+        queryset = Notification.objects.filter(user=self.request.user).order_by('-created_at', '-id')
+        
+        # Filter by read state
+        is_read = self.request.query_params.get('is_read', None)
+        if is_read is not None:
+            queryset = queryset.filter(is_read=is_read.lower() == 'true')
+        
+        return queryset
+    
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        """Get the number of unread notifications."""
+        return Response({'unread_count': get_unread_count(request.user.pk)})
+    
+    @action(detail=True, methods=['post'])
+    def mark_read(self, request, pk=None):
+        """Mark one notification as read."""
+        notification = self.get_object()
+        notification.mark_as_read()
+        return Response(NotificationSerializer(notification).data)
+    
+    @action(detail=False, methods=['post'])
+    def mark_all_read(self, request):
+        """Mark every unread notification as read with a single UPDATE."""
+        updated = Notification.objects.filter(user=request.user, is_read=False).update(
+            is_read=True, read_at=timezone.now()
+        )
+        # Not reset to zero: a notification counted concurrently stays unread
+        adjust_unread_counts({request.user.pk: -updated})
+        return Response({'marked_read': updated, 'unread_count': 0})
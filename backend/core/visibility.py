@@ -0,0 +1,132 @@
+"""
+Row-level visibility policies for list endpoints.
+
+Each model whose rows are not visible to everyone registers one
+VisibilityPolicy (in its app's visibility.py, collected by
+CoreConfig.ready()) declaring, once, which rows each role may see. A view
+then calls visible_to(queryset, user), which compiles the policy for that
+user into a single WHERE clause: the branches of every role the user holds,
+OR-ed together. Roles come from User.get_role_names(), which is memoized
+and shared through the role cache, so compiling costs no queries however
+many roles a policy mentions.
+
+Every rule is a predicate on the row itself: a comparison of its own
+columns, or an Exists() over a related table. Since no rule joins a
+multi-valued relation, a row can never come back twice, so the filtered
+queryset needs no DISTINCT, and PostgreSQL can answer each branch from its
+own (partial) index and combine them with a BitmapOr.
+"""
+from django.db.models import Q
+
+_registry = {}
+
+# Compiled predicate of a user who may see no row at all
+NOTHING = Q(pk__in=[])
+
+
+class VisibilityPolicy:
+    """
+    Declares which rows of a model each user may see.
+    
+    Rules are Q objects, or callables taking the user and returning one.
+    
+    Attributes:
+        anonymous_sees_all: Anonymous users see every row (otherwise none)
+        staff_sees_all: Staff users see every row
+        unrestricted_roles: Holders of any of these roles see every row
+        base_rules: Rules granted to every authenticated user
+        role_rules: Role name -> rules granted to holders of that role
+    """
+    anonymous_sees_all = False
+    staff_sees_all = False
+    unrestricted_roles = ()
+    base_rules = ()
+    role_rules = {}
+    
+    def denies(self, user, role_names):
+        """
+        Hook for users who must see nothing whatever rules they match.
+        
+        Args:
+            user: Authenticated user
+            role_names: frozenset of the user's active role names
+            
+        Returns:
+            bool: True to hide every row from the user
+        """
+        return False
+    
+    def compile(self, user):
+        """
+        Compile the policy for one user.
+        
+        Args:
+            user: Requesting user (may be anonymous)
+            
+        Returns:
+            Q or None: Predicate selecting the visible rows (NOTHING when
+            there are none), None when every row is visible
+        """
+        if not user.is_authenticated:
+            return None if self.anonymous_sees_all else NOTHING
+        
+        role_names = user.get_role_names()
+        if self.denies(user, role_names):
+            return NOTHING
+        if (self.staff_sees_all and user.is_staff) or not role_names.isdisjoint(self.unrestricted_roles):
+            return None
+        
+        rules = list(self.base_rules)
+        for role_name, role_rules in self.role_rules.items():
+            if role_name in role_names:
+                rules.extend(role_rules)
+        if not rules:
+            return NOTHING
+        
+        branches = [rule(user) if callable(rule) else rule for rule in rules]
+        return Q(*branches, _connector=Q.OR)
+
+
+def register(model):
+    """
+    Class decorator registering a VisibilityPolicy for a model.
+    
+    Args:
+        model: Model class the policy applies to
+    """
+    def decorator(policy_class):
+        _registry[model] = policy_class()
+        return policy_class
+    return decorator
+
+
+def get_policy(model):
+    """
+    Get the registered policy of a model.
+    
+    Raises:
+        LookupError: If no policy is registered for the model
+    """
+    try:
+        return _registry[model]
+    except KeyError:
+        raise LookupError(f'No visibility policy registered for {model.__name__}')
+
+
+def visible_to(queryset, user):
+    """
+    Restrict a queryset to the rows its model's policy lets a user see.
+    
+    Args:
+        queryset: QuerySet of a model with a registered policy
+        user: Requesting user
+        
+    Returns:
+        QuerySet: Restricted queryset
+    """
+    predicate = get_policy(queryset.model).compile(user)
+    if predicate is None:
+        return queryset
+    if predicate is NOTHING:
+        return queryset.none()
+    return queryset.filter(predicate)
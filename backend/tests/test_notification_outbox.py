@@ -0,0 +1,198 @@
+"""
+Tests for the notification outbox (core.outbox) and its worker command.
+"""
+from io import StringIO
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.accounts.models import User
+from apps.cases.models import Case
+from apps.evidence.models import Evidence
+from core.models import Notification, NotificationEvent
+from core.outbox import MAX_ATTEMPTS, process_batch
+
+
+class NotificationOutboxTest(TestCase):
+    """Tests that writes queue events and the worker materializes them."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.detective = User.objects.create_user(
+            username='detective',
+            email='detective@example.com',
+            password='testpass123',
+            phone_number='1111111111',
+            national_id='111111111'
+        )
+        self.officer = User.objects.create_user(
+            username='officer',
+            email='officer@example.com',
+            password='testpass123',
+            phone_number='2222222222',
+            national_id='222222222'
+        )
+        self.case = Case.objects.create(
+            title='Test Case', description='-', severity='Level 2', status='Open',
+            created_by=self.officer
+        )
+    
+    def add_evidence(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post('/api/evidence/', {
+            'case_id': self.case.id, 'title': 'Knife', 'description': '-', 'evidence_type': 'other'
+        })
+    
+    def test_evidence_upload_only_queues_an_event(self):
+        """Test uploads insert no notification and look up no detective."""
+        Case.objects.filter(pk=self.case.pk).update(assigned_detective=self.detective)
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.add_evidence(self.officer)
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(any('"notifications"' in query['sql'] for query in queries.captured_queries))
+        self.assertEqual(Notification.objects.count(), 0)
+        
+        event = NotificationEvent.objects.get()
+        self.assertEqual(event.event_type, 'evidence_added')
+        
+        out = StringIO()
+        call_command('process_notification_outbox', stdout=out)
+        self.assertIn('Processed 1 events into 1 notifications', out.getvalue())
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.detective)
+        self.assertEqual(notification.related_case, self.case)
+        self.assertIn('(Knife) was just added to Case', notification.message)
+        self.assertFalse(NotificationEvent.objects.exists())
+    
+    def test_detective_is_not_notified_of_own_evidence(self):
+        """Test the detective adding evidence is not notified about it."""
+        Case.objects.filter(pk=self.case.pk).update(assigned_detective=self.detective)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.add_evidence(self.detective)
+        self.assertEqual(process_batch(), (1, 0))
+    
+    def test_rolled_back_writes_queue_nothing(self):
+        """Test events are only recorded once the write commits."""
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    Evidence.objects.create(
+                        case=self.case, title='Lost', description='-', evidence_type='other',
+                        recorded_by=self.officer
+                    )
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertFalse(NotificationEvent.objects.exists())
+    
+    def test_case_assignment_is_batched(self):
+        """Test one batch notifies every assignee with a single insert."""
+        self.case.assigned_detective = self.detective
+        self.case.assigned_sergeant = self.officer
+        with self.captureOnCommitCallbacks(execute=True):
+            self.case.save()
+        
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(process_batch(), (1, 2))
+        inserts = [query for query in queries.captured_queries if query['sql'].startswith('INSERT INTO "notifications"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            set(Notification.objects.values_list('user_id', flat=True)),
+            {self.detective.id, self.officer.id}
+        )
+    
+    def test_failing_events_are_kept_and_retried(self):
+        """Test a failing handler neither blocks other events nor loses its own."""
+        NotificationEvent.objects.create(event_type='unknown', payload={})
+        NotificationEvent.objects.create(event_type='case_assigned', payload={'case_id': self.case.id, 'user_ids': [self.detective.id]})
+        
+        self.assertEqual(process_batch(), (2, 1))
+        event = NotificationEvent.objects.get()
+        self.assertEqual(event.attempts, 1)
+        self.assertIn('LookupError', event.last_error)
+        
+        NotificationEvent.objects.update(attempts=MAX_ATTEMPTS)
+        self.assertEqual(process_batch(), (0, 0))
+        self.assertTrue(NotificationEvent.objects.exists())
+
+
+class CaseAssignmentNotificationTest(TestCase):
+    """Tests that case saves only notify actual, coalesced assignments."""
+    
+    def setUp(self):
+        self.detective = User.objects.create_user(
+            username='detective', email='detective@example.com', password='testpass123',
+            phone_number='1111111111', national_id='111111111'
+        )
+        self.sergeant = User.objects.create_user(
+            username='sergeant', email='sergeant@example.com', password='testpass123',
+            phone_number='2222222222', national_id='222222222'
+        )
+        self.case = Case.objects.create(
+            title='Test Case', description='-', severity='Level 2', status='Open',
+            created_by=self.sergeant, assigned_detective=self.detective, assigned_sergeant=self.sergeant
+        )
+        NotificationEvent.objects.all().delete()
+    
+    def save(self, case, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            case.save(**kwargs)
+    
+    def test_case_created_with_assignees_queues_nothing(self):
+        """Test assignees set when the case is created are not notified."""
+        with self.captureOnCommitCallbacks(execute=True):
+            Case.objects.create(
+                title='New Case', description='-', severity='Level 2', status='Open',
+                created_by=self.sergeant, assigned_detective=self.detective
+            )
+        self.assertFalse(NotificationEvent.objects.exists())
+    
+    def test_saves_without_assignment_changes_queue_nothing(self):
+        """Test status updates of an assigned case notify nobody."""
+        self.case.status = 'Closed'
+        self.save(self.case)
+        case = Case.objects.get(pk=self.case.pk)
+        case.status = 'Open'
+        self.save(case)
+        self.save(Case.objects.only('id', 'status').get(pk=self.case.pk), update_fields=['status'])
+        self.assertFalse(NotificationEvent.objects.exists())
+    
+    def test_only_new_assignees_are_notified(self):
+        """Test replacing the sergeant leaves the detective alone."""
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='testpass123',
+            phone_number='3333333333', national_id='333333333'
+        )
+        case = Case.objects.get(pk=self.case.pk)
+        case.assigned_sergeant = other
+        self.save(case)
+        self.assertEqual(NotificationEvent.objects.get().payload['user_ids'], [other.id])
+    
+    def test_bursts_are_coalesced(self):
+        """Test repeated assignments send one notification per user and case."""
+        for _ in range(3):
+            self.case.assigned_detective = None
+            self.save(self.case)
+            self.case.assigned_detective = self.detective
+            self.save(self.case)
+        self.assertEqual(process_batch(), (3, 1))
+        
+        self.case.assigned_detective = None
+        self.save(self.case)
+        self.case.assigned_detective = self.detective
+        self.save(self.case)
+        self.assertEqual(process_batch(), (1, 0))
+        self.assertEqual(Notification.objects.filter(user=self.detective).count(), 1)
+    
+    @override_settings(NOTIFICATION_COALESCE_WINDOW=0)
+    def test_coalescing_can_be_disabled(self):
+        """Test a zero window notifies every reassignment batch."""
+        for _ in range(2):
+            self.case.assigned_detective = None
+            self.save(self.case)
+            self.case.assigned_detective = self.detective
+            self.save(self.case)
+            process_batch()
+        self.assertEqual(Notification.objects.filter(user=self.detective).count(), 2)
@@ -0,0 +1,118 @@
+"""
+Tests for the notification inbox API and its cached unread counter.
+"""
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.accounts.models import User
+from core.models import Notification
+from core.unread import get_unread_count
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class NotificationApiTest(TestCase):
+    """Tests for listing and reading notifications."""
+    
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser', email='test@example.com', password='testpass123',
+            phone_number='1111111111', national_id='111111111'
+        )
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', password='testpass123',
+            phone_number='2222222222', national_id='222222222'
+        )
+        self.client.force_authenticate(user=self.user)
+        # A cold counter is built with one COUNT; later changes only adjust it
+        self.assertEqual(get_unread_count(self.user.pk), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notifications = [self.notify(self.user, f'Note {i}') for i in range(3)]
+            self.notify(self.other, 'Not mine')
+    
+    def notify(self, user, title):
+        return Notification.objects.create(user=user, type='other', title=title, message='-')
+    
+    def unread_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/notifications/unread_count/')
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+        return response.data['unread_count']
+    
+    def test_lists_only_own_notifications(self):
+        """Test the inbox lists the user's notifications, newest first."""
+        response = self.client.get('/api/notifications/')
+        self.assertEqual(
+            [row['title'] for row in response.data['results']],
+            ['Note 2', 'Note 1', 'Note 0']
+        )
+        response = self.client.get('/api/notifications/', {'cursor': ''})
+        self.assertEqual(len(response.data['results']), 3)
+    
+    def test_counter_follows_creates_and_reads(self):
+        """Test the badge is adjusted rather than recounted."""
+        self.assertEqual(self.unread_count(), 3)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notify(self.user, 'Note 3')
+        self.assertEqual(self.unread_count(), 4)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/notifications/{self.notifications[0].id}/mark_read/')
+        self.assertTrue(response.data['is_read'])
+        self.assertEqual(self.unread_count(), 3)
+        
+        # Reading it again does not move the counter
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/api/notifications/{self.notifications[0].id}/mark_read/')
+        self.assertEqual(self.unread_count(), 3)
+    
+    def test_mark_all_read_is_one_update(self):
+        """Test every unread notification is marked read by one UPDATE."""
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post('/api/notifications/mark_all_read/')
+        self.assertEqual(response.data['marked_read'], 3)
+        updates = [query for query in queries.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(self.unread_count(), 0)
+        self.assertEqual(Notification.objects.filter(user=self.other, is_read=False).count(), 1)
+    
+    def test_mark_all_read_keeps_concurrent_notification(self):
+        """Test a notification counted while marking all read still shows on the badge."""
+        self.assertEqual(self.unread_count(), 3)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post('/api/notifications/mark_all_read/')
+        # Created and counted after the UPDATE, before the counter is moved
+        with self.captureOnCommitCallbacks(execute=True):
+            self.notify(self.user, 'Note 3')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.unread_count(), 1)
+    
+    def test_cannot_read_others_notifications(self):
+        """Test other users' notifications are out of reach."""
+        mine_elsewhere = Notification.objects.get(user=self.other)
+        response = self.client.post(f'/api/notifications/{mine_elsewhere.id}/mark_read/')
+        self.assertEqual(response.status_code, 404)
+
+
+class SharedCacheCheckTest(TestCase):
+    """Tests for the check requiring a cache shared with the notification worker."""
+    
+    def run_check(self, backend, debug):
+        from core.checks import check_shared_cache
+        with override_settings(CACHES={'default': {'BACKEND': backend}}, DEBUG=debug):
+            return [message.id for message in check_shared_cache(None)]
+    
+    def test_local_cache_fails_without_debug(self):
+        """Test a per-process or per-container cache is an error in production."""
+        self.assertEqual(self.run_check('django.core.cache.backends.filebased.FileBasedCache', False), ['core.E001'])
+        self.assertEqual(self.run_check('django.core.cache.backends.locmem.LocMemCache', True), ['core.W001'])
+    
+    def test_shared_cache_passes(self):
+        """Test a shared cache backend raises nothing."""
+        self.assertEqual(self.run_check('django.core.cache.backends.redis.RedisCache', False), [])
@@ -0,0 +1,124 @@
+"""
+Tests for keyset (cursor) pagination and estimated page counts.
+"""
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from apps.accounts.models import User
+from apps.cases.models import Case
+from apps.evidence.models import Evidence
+
+
+class CursorPaginationTest(TestCase):
+    """Tests for ?cursor= on list endpoints."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            phone_number='1234567890',
+            national_id='123456789'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.case = Case.objects.create(
+            title='Test Case', description='-', severity='Level 2', status='Open', created_by=self.user
+        )
+        Evidence.objects.bulk_create([
+            Evidence(title=f'Item {i}', description='-', evidence_type='other', case=self.case, recorded_by=self.user)
+            for i in range(45)
+        ])
+        # Identical timestamps must not make rows repeat or vanish across pages
+        Evidence.objects.filter(title__in=['Item 18', 'Item 19', 'Item 20', 'Item 21']).update(
+            created_date=timezone.now()
+        )
+    
+    def _cursor(self, url):
+        return parse_qs(urlparse(url).query)['cursor'][0]
+    
+    def test_walks_every_row_once_without_counting(self):
+        """Test pages follow (created_date, id) and never run COUNT(*)."""
+        seen = []
+        params = {'cursor': ''}
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/evidence/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next']:
+                break
+            params = {'cursor': self._cursor(response.data['next'])}
+        
+        expected = list(Evidence.objects.order_by('-created_date', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+    
+    def test_page_numbers_remain_the_default(self):
+        """Test requests without a cursor keep the counted page format."""
+        response = self.client.get('/api/evidence/', {'page': 2})
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 20)
+    
+    def test_cases_support_cursor(self):
+        """Test the cursor mode on another viewset."""
+        response = self.client.get('/api/cases/', {'cursor': '', 'ordering': 'title'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([case['id'] for case in response.data['results']], [self.case.id])
+
+
+class EstimatedCountPaginationTest(TestCase):
+    """Tests for planner-estimated counts on large lists."""
+    
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123',
+            phone_number='1234567890',
+            national_id='123456789'
+        )
+        self.client.force_authenticate(user=self.user)
+        case = Case.objects.create(
+            title='Test Case', description='-', severity='Level 2', status='Open', created_by=self.user
+        )
+        Evidence.objects.bulk_create([
+            Evidence(title=f'Item {i}', description='-', evidence_type='other', case=case, recorded_by=self.user)
+            for i in range(45)
+        ])
+    
+    def test_exact_count_below_threshold(self):
+        """Test small results are counted exactly."""
+        with mock.patch('core.pagination.estimate_count', return_value=40):
+            response = self.client.get('/api/evidence/')
+        self.assertEqual(response.data['count'], 45)
+        self.assertFalse(response.data['count_is_estimate'])
+    
+    @override_settings(PAGINATION_ESTIMATE_THRESHOLD=10)
+    def test_estimate_above_threshold(self):
+        """Test large results report the estimate and skip COUNT(*)."""
+        with mock.patch('core.pagination.estimate_count', return_value=30):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/evidence/')
+        self.assertEqual(response.data['count'], 30)
+        self.assertTrue(response.data['count_is_estimate'])
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries.captured_queries))
+    
+    @override_settings(PAGINATION_ESTIMATE_THRESHOLD=10)
+    def test_pages_past_a_low_estimate_stay_reachable(self):
+        """Test next links follow the real rows, not the estimate."""
+        with mock.patch('core.pagination.estimate_count', return_value=30):
+            second = self.client.get('/api/evidence/', {'page': 2})
+            third = self.client.get('/api/evidence/', {'page': 3})
+            fourth = self.client.get('/api/evidence/', {'page': 4})
+        self.assertIsNotNone(second.data['next'])
+        self.assertEqual(len(third.data['results']), 5)
+        self.assertIsNone(third.data['next'])
+        self.assertEqual(fourth.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,303 @@
+"""
+Query-count and latency budgets for the API.
+
+A realistic dataset (hundreds of cases with evidence, suspects, complaints
+and users holding roles) is seeded once, then every hot endpoint is
+requested and must stay within its query budget. Because pages and
+dossiers in this dataset hold many related rows, an N+1 introduced in any
+serializer or queryset pushes the query count far past its budget.
+
+Wall-clock time depends on the machine and its load, so latency budgets
+are only checked on request, as upper bounds for the in-memory test
+database; scale them on slow machines with PERF_LATENCY_SCALE, e.g.:
+    PERF_LATENCY_BUDGETS=1 PERF_LATENCY_SCALE=3 pytest tests/test_query_budgets.py
+"""
+import os
+import time
+from datetime import timedelta
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.authtoken.models import Token
+from apps.accounts.models import User, Role, RoleAssignment
+from apps.cases.models import Case, CaseComplainant, CaseWitness
+from apps.complaints.models import Complaint, ComplaintReview
+from apps.detective_board.models import DetectiveBoard
+from apps.evidence.models import Evidence
+from apps.investigations.models import Suspect, Interrogation, GuiltScore, CaptainDecision
+from apps.investigations.ranking import refresh_leaderboard
+from apps.payments.models import BailFine
+from apps.rewards.models import RewardSubmission, Reward
+from apps.trials.models import Trial
+
+CHECK_LATENCY = os.environ.get('PERF_LATENCY_BUDGETS', '') not in ('', '0')
+LATENCY_SCALE = float(os.environ.get('PERF_LATENCY_SCALE', '1'))
+
+ROLE_NAMES = [
+    'System Administrator', 'Police Chief', 'Captain', 'Sergeant', 'Detective',
+    'Police Officer', 'Patrol Officer', 'Intern (Cadet)', 'Forensic Doctor',
+    'Judge', 'Basic User',
+]
+
+CASE_COUNT = 300
+EVIDENCE_PER_CASE = 3
+USER_COUNT = 60
+DOSSIER_EVIDENCE = 25
+DOSSIER_SUSPECTS = 8
+
+
+def seed_dataset():
+    """
+    Bulk-create the benchmark dataset and return the objects the budgets
+    refer to.
+
+    Returns:
+        dict: Named users and rows used to build endpoint URLs
+    """
+    today = timezone.now().date()
+    roles = {name: Role.objects.create(name=name) for name in ROLE_NAMES}
+    password = make_password('testpass123')
+
+    def make_users(prefix, count, start=0):
+        return User.objects.bulk_create([
+            User(
+                username=f'{prefix}{i}', email=f'{prefix}{i}@police.ir', password=password,
+                phone_number=f'09{prefix[:2]}{i:07d}', national_id=f'{prefix[:2]}{i:08d}',
+                first_name=prefix.title(), last_name=str(i),
+            )
+            for i in range(start, start + count)
+        ])
+
+    admin = make_users('admin', 1)[0]
+    admin.is_staff = True
+    admin.save(update_fields=['is_staff'])
+    detective = make_users('detective', 1)[0]
+    staff = make_users('officer', USER_COUNT)
+    citizens = make_users('citizen', USER_COUNT)
+
+    assignments = [
+        RoleAssignment(user=admin, role=roles[name])
+        for name in ('System Administrator', 'Police Chief', 'Captain', 'Sergeant', 'Judge')
+    ]
+    assignments.append(RoleAssignment(user=detective, role=roles['Detective']))
+    staff_roles = ['Detective', 'Sergeant', 'Police Officer', 'Forensic Doctor', 'Captain']
+    for i, user in enumerate(staff):
+        assignments.append(RoleAssignment(user=user, role=roles[staff_roles[i % len(staff_roles)]]))
+        assignments.append(RoleAssignment(user=user, role=roles['Basic User']))
+    assignments.extend(RoleAssignment(user=user, role=roles['Basic User']) for user in citizens)
+    RoleAssignment.objects.bulk_create(assignments)
+
+    severities = [choice[0] for choice in Case.SEVERITY_CHOICES]
+    statuses = ['Open', 'Under Investigation', 'Pending', 'Resolved', 'Closed']
+    cases = Case.objects.bulk_create([
+        Case(
+            title=f'Case {i}', description='-', severity=severities[i % len(severities)],
+            status=statuses[i % len(statuses)], created_by=staff[i % USER_COUNT],
+            assigned_detective=detective if i % 10 == 0 else staff[(i * 5) % USER_COUNT],
+            assigned_sergeant=staff[(i * 5 + 1) % USER_COUNT],
+        )
+        for i in range(CASE_COUNT)
+    ])
+    CaseComplainant.objects.bulk_create([
+        CaseComplainant(case=case, complainant=citizens[(i + offset) % USER_COUNT])
+        for i, case in enumerate(cases)
+        for offset in range(2)
+    ])
+    CaseWitness.objects.bulk_create([
+        CaseWitness(case=case, witness=citizens[(i + 7) % USER_COUNT])
+        for i, case in enumerate(cases)
+    ])
+
+    # The dossier case carries far more children than the rest, so any
+    # per-row query in its serializers shows up in the budget
+    dossier_case = cases[3]
+    evidence_types = ['witness_statement', 'biological', 'vehicle', 'identification', 'other']
+    Evidence.objects.bulk_create([
+        Evidence(
+            title=f'Evidence {i}-{j}', description='-', evidence_type=evidence_types[j % len(evidence_types)],
+            case=case, recorded_by=staff[(i + j) % USER_COUNT],
+            verified_by_forensic_doctor=staff[3] if j % 2 else None,
+        )
+        for i, case in enumerate(cases)
+        for j in range(DOSSIER_EVIDENCE if case is dossier_case else EVIDENCE_PER_CASE)
+    ])
+
+    suspect_statuses = ['Under Investigation', 'Under Severe Surveillance', 'Arrested']
+    suspects = Suspect.objects.bulk_create([
+        Suspect(
+            case=case, name=f'Suspect {i}-{j}', national_id=f'S{i % 120:05d}',
+            user=citizens[i % USER_COUNT] if i % 4 == 0 else None,
+            status=suspect_statuses[(i + j) % len(suspect_statuses)],
+            surveillance_start_date=today - timedelta(days=(i * 7) % 90),
+        )
+        for i, case in enumerate(cases)
+        for j in range(DOSSIER_SUSPECTS if case is dossier_case else 1)
+    ])
+    Interrogation.objects.bulk_create([
+        Interrogation(suspect=suspect, case_id=suspect.case_id, interrogator=staff[i % USER_COUNT])
+        for i, suspect in enumerate(suspects)
+    ])
+    GuiltScore.objects.bulk_create([
+        GuiltScore(
+            suspect=suspect, case_id=suspect.case_id, assigned_by=staff[i % USER_COUNT],
+            score=(i % 10) + 1, justification='-'
+        )
+        for i, suspect in enumerate(suspects)
+    ])
+    CaptainDecision.objects.bulk_create([
+        CaptainDecision(
+            suspect=suspect, case_id=suspect.case_id, decision='Approve Arrest',
+            decided_by=admin, chief_approved_by=admin if i % 2 else None,
+        )
+        for i, suspect in enumerate(suspects)
+        if i % 3 == 0 or suspect.case_id == dossier_case.pk
+    ])
+
+    complaints = Complaint.objects.bulk_create([
+        Complaint(
+            title=f'Complaint {i}', description='-', submitted_by=citizens[i % USER_COUNT],
+            status='Approved' if i < 100 else 'Pending',
+            reviewed_by_intern=staff[i % USER_COUNT], reviewed_by_officer=staff[(i + 1) % USER_COUNT],
+            case=cases[i] if i < 100 else None,
+        )
+        for i in range(150)
+    ])
+    ComplaintReview.objects.bulk_create([
+        ComplaintReview(complaint=complaint, reviewer=staff[i % USER_COUNT], action='Forwarded', comments='-')
+        for i, complaint in enumerate(complaints)
+    ])
+
+    resolved_cases = [case for case in cases if case.status in ('Resolved', 'Closed')]
+    trials = Trial.objects.bulk_create([
+        Trial(case=case, judge=admin, trial_date=timezone.now())
+        for case in [dossier_case] + [case for case in resolved_cases if case is not dossier_case][:39]
+    ])
+    BailFine.objects.bulk_create([
+        BailFine(case_id=suspect.case_id, suspect=suspect, amount=1000000, type='Bail', set_by=staff[i % USER_COUNT])
+        for i, suspect in enumerate(suspects[:60])
+    ])
+    submissions = RewardSubmission.objects.bulk_create([
+        RewardSubmission(
+            submitted_by=citizens[i % USER_COUNT], case=cases[i], information='-',
+            status='Approved' if i < 30 else 'Pending',
+            reviewed_by_officer=staff[i % USER_COUNT], reviewed_by_detective=staff[(i + 2) % USER_COUNT],
+        )
+        for i in range(80)
+    ])
+    Reward.objects.bulk_create([
+        Reward(
+            submission=submission, case_id=submission.case_id, amount=20000000,
+            reward_code=f'RW{i:06d}', created_by=staff[i % USER_COUNT]
+        )
+        for i, submission in enumerate(submissions[:30])
+    ])
+    boards = DetectiveBoard.objects.bulk_create([
+        DetectiveBoard(case=case, detective=detective, last_modified_by=detective)
+        for case in cases
+        if case.assigned_detective_id == detective.pk
+    ])
+
+    refresh_leaderboard()
+
+    return {
+        'admin': admin,
+        'detective': detective,
+        'dossier_case': dossier_case,
+        'evidence': Evidence.objects.filter(case=dossier_case).first(),
+        'suspect': suspects[0],
+        'complaint': complaints[0],
+        'trial': trials[0],
+        'board': boards[0],
+    }
+
+
+class QueryBudgetTest(TestCase):
+    """
+    Every endpoint must stay within its query budget, and within its
+    latency budget when PERF_LATENCY_BUDGETS is set.
+
+    Budgets include the token authentication lookup and the role checks the
+    view performs for the requesting user. Raise a budget only together
+    with the change that legitimately needs more queries.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.data = seed_dataset()
+        cls.tokens = {
+            name: Token.objects.create(user=cls.data[name]).key
+            for name in ('admin', 'detective')
+        }
+
+    def budgets(self):
+        """
+        (name, user, url, params, max queries, max milliseconds) per endpoint.
+
+        Query budgets are the counts measured when the harness was added,
+        so they also record the endpoints that still issue a query per
+        row (marked below); lower a budget whenever a change reduces it.
+        """
+        data = self.data
+        return [
+            ('users list', 'admin', '/api/auth/users/', {}, 5, 150),
+            ('user retrieve', 'admin', f'/api/auth/users/{data["detective"].pk}/', {}, 4, 100),
+            ('cases list', 'admin', '/api/cases/', {}, 4, 150),
+            ('case retrieve', 'admin', f'/api/cases/{data["dossier_case"].pk}/', {}, 10, 150),
+            ('case stats', 'admin', '/api/cases/stats/', {'breakdown': 'true'}, 3, 150),
+            ('complaints list', 'admin', '/api/complaints/', {}, 4, 150),
+            ('complaint retrieve', 'admin', f'/api/complaints/{data["complaint"].pk}/', {}, 10, 100),
+            ('evidence list', 'admin', '/api/evidence/', {}, 3, 150),
+            ('evidence list cursor', 'admin', '/api/evidence/', {'cursor': ''}, 2, 150),
+            ('evidence list detailed', 'admin', '/api/evidence/', {'detailed': 'true'}, 5, 200),
+            ('evidence retrieve', 'admin', f'/api/evidence/{data["evidence"].pk}/', {}, 3, 100),
+            ('evidence by_type', 'admin', '/api/evidence/by_type/', {'by_case': 'true'}, 2, 150),
+            ('suspects list', 'admin', '/api/investigations/suspects/', {}, 3, 150),
+            ('suspects list detailed', 'admin', '/api/investigations/suspects/', {'detailed': 'true'}, 5, 200),
+            ('suspect retrieve', 'admin', f'/api/investigations/suspects/{data["suspect"].pk}/', {}, 6, 100),
+            ('most wanted', 'admin', '/api/investigations/suspects/most_wanted/', {}, 3, 300),
+            ('most wanted page', 'admin', '/api/investigations/suspects/most_wanted/', {'page_size': 20}, 3, 150),
+            # Per row: nested suspect and case relations
+            ('interrogations list', 'admin', '/api/investigations/interrogations/', {}, 70, 300),
+            ('guilt scores list', 'admin', '/api/investigations/guilt-scores/', {}, 69, 300),
+            ('captain decisions list', 'admin', '/api/investigations/captain-decisions/', {}, 70, 300),
+            ('trials list', 'admin', '/api/trials/', {}, 4, 150),
+            ('trial dossier', 'admin', f'/api/trials/{data["trial"].pk}/', {}, 18, 300),
+            # Per row: nested case, suspect, submission and evidence relations
+            ('bail fines list', 'admin', '/api/payments/', {}, 89, 300),
+            ('reward submissions list', 'admin', '/api/rewards/submissions/', {}, 47, 300),
+            ('rewards list', 'admin', '/api/rewards/', {}, 23, 200),
+            ('detective boards list', 'detective', '/api/detective-board/', {}, 66, 300),
+            ('detective board retrieve', 'detective', f'/api/detective-board/{data["board"].pk}/', {}, 12, 150),
+            ('notifications list', 'detective', '/api/notifications/', {}, 3, 150),
+            # Measured with DummyCache, so the counter is recounted on every request
+            ('notification badge', 'detective', '/api/notifications/unread_count/', {}, 2, 50),
+        ]
+
+    def test_endpoints_stay_within_budget(self):
+        """Test each endpoint's query count (and, on request, latency) against its budget."""
+        # Warm up URL resolution and imports so the first budget is fair
+        APIClient().get('/api/cases/stats/')
+
+        for name, user, url, params, max_queries, max_ms in self.budgets():
+            with self.subTest(endpoint=name):
+                client = APIClient()
+                client.credentials(HTTP_AUTHORIZATION=f'Token {self.tokens[user]}')
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = client.get(url, params)
+                    elapsed_ms = (time.perf_counter() - started) * 1000
+
+                self.assertEqual(response.status_code, 200, f'{name}: {response.data}')
+                self.assertLessEqual(
+                    len(queries), max_queries,
+                    f'{name} issued {len(queries)} queries (budget {max_queries}):\n'
+                    + '\n'.join(query['sql'] for query in queries.captured_queries)
+                )
+                if CHECK_LATENCY:
+                    self.assertLessEqual(
+                        elapsed_ms, max_ms * LATENCY_SCALE,
+                        f'{name} took {elapsed_ms:.0f}ms (budget {max_ms * LATENCY_SCALE:.0f}ms)'
+                    )
@@ -0,0 +1,163 @@
+"""
+Tests for row-level visibility policies (core.visibility).
+"""
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from apps.accounts.models import User, Role
+from apps.cases.models import Case
+from apps.complaints.models import Complaint
+from apps.detective_board.models import DetectiveBoard
+from apps.rewards.models import RewardSubmission
+from core.visibility import visible_to
+
+
+def make_user(username, *role_names, **extra):
+    index = User.objects.count() + 1
+    user = User.objects.create_user(
+        username=username,
+        email=f'{username}@example.com',
+        password='testpass123',
+        phone_number=f'09{index:09d}',
+        national_id=f'{index:010d}',
+        **extra
+    )
+    for role_name in role_names:
+        Role.objects.get_or_create(name=role_name)
+        user.assign_role(role_name)
+    return user
+
+
+class VisibilityTest(TestCase):
+    """Tests the visibility matrix of every registered policy."""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = make_user('officer', 'Police Officer')
+        cls.detective = make_user('detective', 'Detective')
+        cls.other_detective = make_user('other_detective', 'Detective')
+        cls.sergeant = make_user('sergeant', 'Sergeant')
+        cls.intern = make_user('intern', 'Intern (Cadet)')
+        cls.citizen = make_user('citizen', 'Basic User')
+        cls.chief = make_user('chief', 'Police Chief')
+        cls.admin = make_user('admin', is_staff=True)
+        # Basic User is assigned last so both roles stay active
+        cls.officer_citizen = make_user('officer_citizen', 'Police Officer', 'Basic User')
+        
+        def case(title, status, **kwargs):
+            return Case.objects.create(
+                title=title, description='-', severity='Level 2', status=status,
+                created_by=kwargs.pop('created_by', cls.chief), **kwargs
+            )
+        
+        cls.open_case = case('Open', 'Open')
+        cls.own_pending = case('Own pending', 'Pending', created_by=cls.officer)
+        cls.assigned_pending = case('Assigned pending', 'Pending', assigned_detective=cls.detective)
+        cls.other_pending = case('Other pending', 'Pending')
+        
+        def complaint(title, status, submitted_by):
+            return Complaint.objects.create(
+                title=title, description='-', status=status, submitted_by=submitted_by
+            )
+        
+        cls.own_complaint = complaint('Own', 'Pending', cls.citizen)
+        cls.pending_complaint = complaint('Pending', 'Pending', cls.chief)
+        cls.reviewed_complaint = complaint('Reviewed', 'Under Review', cls.chief)
+        
+        def submission(status, submitted_by):
+            return RewardSubmission.objects.create(
+                submitted_by=submitted_by, case=cls.open_case, information='-', status=status
+            )
+        
+        cls.pending_submission = submission('Pending', cls.citizen)
+        cls.reviewed_submission = submission('Under Review', cls.chief)
+        cls.approved_submission = submission('Approved', cls.chief)
+        cls.rejected_submission = submission('Rejected', cls.officer_citizen)
+        
+        cls.own_board = DetectiveBoard.objects.create(case=cls.open_case, detective=cls.detective)
+        cls.other_board = DetectiveBoard.objects.create(case=cls.other_pending, detective=cls.other_detective)
+    
+    def assertVisible(self, model, user, expected):
+        visible = set(visible_to(model.objects.all(), user).values_list('pk', flat=True))
+        self.assertEqual(visible, {row.pk for row in expected}, f'{model.__name__} for {user}')
+    
+    def test_case_matrix(self):
+        """Test who sees which cases."""
+        every_case = [self.open_case, self.own_pending, self.assigned_pending, self.other_pending]
+        matrix = [
+            (AnonymousUser(), every_case),
+            (self.citizen, [self.open_case]),
+            (self.officer, [self.open_case, self.own_pending]),
+            (self.detective, [self.open_case, self.assigned_pending]),
+            (self.intern, []),
+            (self.chief, every_case),
+            (self.admin, every_case),
+        ]
+        for user, expected in matrix:
+            self.assertVisible(Case, user, expected)
+    
+    def test_complaint_matrix(self):
+        """Test who sees which complaints."""
+        every_complaint = [self.own_complaint, self.pending_complaint, self.reviewed_complaint]
+        matrix = [
+            (AnonymousUser(), []),
+            (self.citizen, [self.own_complaint]),
+            (self.officer, [self.reviewed_complaint]),
+            (self.intern, every_complaint),
+            (self.chief, [self.pending_complaint, self.reviewed_complaint]),
+            (self.admin, every_complaint),
+        ]
+        for user, expected in matrix:
+            self.assertVisible(Complaint, user, expected)
+    
+    def test_reward_submission_matrix(self):
+        """Test who sees which reward submissions."""
+        every_submission = [
+            self.pending_submission, self.reviewed_submission,
+            self.approved_submission, self.rejected_submission
+        ]
+        matrix = [
+            (self.citizen, [self.pending_submission]),
+            (self.officer, [self.pending_submission, self.reviewed_submission]),
+            (self.detective, [self.reviewed_submission, self.approved_submission]),
+            # Roles combine: their own submissions plus the officer's queue
+            (self.officer_citizen, [self.pending_submission, self.reviewed_submission, self.rejected_submission]),
+            (self.intern, []),
+            (self.sergeant, every_submission),
+            (self.admin, every_submission),
+        ]
+        for user, expected in matrix:
+            self.assertVisible(RewardSubmission, user, expected)
+    
+    def test_detective_board_matrix(self):
+        """Test who sees which detective boards."""
+        matrix = [
+            (self.detective, [self.own_board]),
+            (self.other_detective, [self.other_board]),
+            (self.officer, []),
+            (self.sergeant, [self.own_board, self.other_board]),
+        ]
+        for user, expected in matrix:
+            self.assertVisible(DetectiveBoard, user, expected)
+    
+    def test_compiling_needs_no_queries_once_roles_are_known(self):
+        """Test policies compile from the cached role set."""
+        self.officer_citizen.get_role_names()
+        with self.assertNumQueries(0):
+            for model in [Case, Complaint, RewardSubmission, DetectiveBoard]:
+                visible_to(model.objects.all(), self.officer_citizen)
+    
+    def test_list_views_need_no_distinct(self):
+        """Test list views apply policies without DISTINCT."""
+        client = APIClient()
+        for user, url in [(self.officer, '/api/cases/'), (self.officer, '/api/complaints/'),
+                          (self.officer_citizen, '/api/rewards/submissions/'),
+                          (self.detective, '/api/detective-board/')]:
+            client.force_authenticate(user=user)
+            with CaptureQueriesContext(connection) as queries:
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200, url)
+            for query in queries.captured_queries:
+                self.assertNotIn('DISTINCT', query['sql'])